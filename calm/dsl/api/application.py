@@ -71,6 +71,16 @@ class ApplicationAPI(ResourceAPI):
             download_url, method=REQUEST.METHOD.GET, verify=False
         )
 
+    def download_runlog_file(
+        self, app_id, runlog_id, file_path, progress_callback=None
+    ):
+        """streams runlog zip to file_path, returns (download stats, err)"""
+
+        download_url = self.DOWNLOAD_RUNLOG.format(app_id, runlog_id)
+        return self.download(
+            download_url, file_path, progress_callback=progress_callback
+        )
+
     def action_variables(self, app_id, action_name):
         action_var_url = self.ACTION_VARIABLE.format(app_id, action_name)
         return self.connection._call(
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+async_connection: Provides an asyncio HTTP client to make requests to calm
+
+Requests are made over the session pool of a synchronous `Connection` from a
+bounded thread pool, so retries, timeouts and auth handling stay the same as
+that of the wrapped connection.
+
+Example:
+
+connection = get_connection_obj(pc_ip, pc_port, auth=("<pc_username>", "<pc_passwd>"))
+connection.connect()
+async_connection = AsyncConnection(connection)
+res, err = await async_connection._call(endpoint, method=REQUEST.METHOD.GET)
+
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .connection import REQUEST
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+
+class AsyncConnection:
+    def __init__(self, connection, max_concurrency=None):
+        """Async client wrapping a synchronous connection.
+
+        Args:
+            connection (Connection): connected synchronous connection
+            max_concurrency (int): maximum number of requests in flight,
+                defaults to pool size of the connection so that requests
+                never wait for a free connection in the pool
+        Returns:
+        Raises:
+        """
+        self.connection = connection
+        self.max_concurrency = max_concurrency or connection._pool_maxsize
+        self._executor = None
+
+    @property
+    def base_url(self):
+        return self.connection.base_url
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix=self.__class__.__name__,
+            )
+        return self._executor
+
+    def connect(self):
+        """Connects the wrapped connection, if not connected already"""
+
+        if self.connection.session is None:
+            self.connection.connect()
+
+    def close(self):
+        """Shuts down the worker threads. Wrapped connection stays open"""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _call(self, endpoint, method=REQUEST.METHOD.POST, **kwargs):
+        """Private method for making http request to calm
+
+        Accepts same arguments as `Connection._call`
+        Returns:
+            (tuple (requests.Response, dict)): Response
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            functools.partial(self.connection._call, endpoint, method=method, **kwargs),
+        )
@@ -0,0 +1,174 @@
+import asyncio
+
+from .async_connection import AsyncConnection
+from .connection import REQUEST
+from .resource import ResourceAPI
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+
+class AsyncResourceAPI:
+    """
+    Async variant of a ResourceAPI. Urls are taken from the wrapped ResourceAPI,
+    while calls are made over an AsyncConnection. The `create`, `read`, `update`,
+    `delete`, `list` and `list_all` methods return awaitables resolving to the
+    same values as the methods of ResourceAPI.
+    """
+
+    def __init__(
+        self,
+        connection,
+        resource_type,
+        calm_api=False,
+        dm_api=False,
+        max_concurrency=None,
+    ):
+        resource_api = ResourceAPI(
+            connection, resource_type, calm_api=calm_api, dm_api=dm_api
+        )
+        self._init(resource_api, max_concurrency)
+
+    def _init(self, resource_api, max_concurrency=None):
+        self.resource_api = resource_api
+        self.connection = AsyncConnection(
+            resource_api.connection, max_concurrency=max_concurrency
+        )
+
+    @classmethod
+    def from_resource_api(cls, resource_api, max_concurrency=None):
+        """returns async variant of existing api object ex: client.application"""
+
+        async_api = cls.__new__(cls)
+        async_api._init(resource_api, max_concurrency)
+        return async_api
+
+    async def create(self, payload):
+        return await self.connection._call(
+            self.resource_api.PREFIX,
+            verify=False,
+            request_json=payload,
+            method=REQUEST.METHOD.POST,
+        )
+
+    async def read(self, id=None):
+        url = self.resource_api.ITEM.format(id) if id else self.resource_api.PREFIX
+        return await self.connection._call(url, verify=False, method=REQUEST.METHOD.GET)
+
+    async def update(self, uuid, payload):
+        return await self.connection._call(
+            self.resource_api.ITEM.format(uuid),
+            verify=False,
+            request_json=payload,
+            method=REQUEST.METHOD.PUT,
+        )
+
+    async def delete(self, uuid):
+        return await self.connection._call(
+            self.resource_api.ITEM.format(uuid),
+            verify=False,
+            method=REQUEST.METHOD.DELETE,
+        )
+
+    async def list(self, params={}, ignore_error=False):
+        return await self.connection._call(
+            self.resource_api.LIST,
+            verify=False,
+            request_json=params,
+            method=REQUEST.METHOD.POST,
+            ignore_error=ignore_error,
+        )
+
+    async def list_all(self, api_limit=250, base_params=None, ignore_error=False):
+        """returns the list of entities, all pages after first one are fetched concurrently
+
+        Args:
+            api_limit (int): page size, used if base_params has no length
+            base_params (dict): list payload
+            ignore_error (bool): return (entities, err) instead of raising
+        """
+
+        params = dict(base_params or {})
+        length = params.setdefault("length", api_limit)
+        params["offset"] = 0
+        if params.get("sort_attribute", None) is None:
+            params["sort_attribute"] = "_created_timestamp_usecs_"
+        if params.get("sort_order", None) is None:
+            params["sort_order"] = "ASCENDING"
+
+        async def fetch_page(offset):
+            page_params = dict(params, offset=offset)
+            return await self.list(page_params, ignore_error=ignore_error)
+
+        res, err = await fetch_page(0)
+        if err:
+            pages = [(None, err)]
+        else:
+            first_page = res.json()
+            total_matches = int(first_page["metadata"]["total_matches"])
+            pages = [(first_page, None)]
+            for res, err in await gather_calls(
+                fetch_page, range(length, total_matches, length)
+            ):
+                pages.append((None if err else res.json(), err))
+
+        final_list = []
+        for page, err in pages:
+            if err:
+                if ignore_error:
+                    return [], err
+                raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+            final_list.extend(page["entities"])
+
+        if ignore_error:
+            return final_list, None
+
+        return final_list
+
+
+async def gather_calls(api_method, args_list):
+    """
+    Calls async api method for every item of args_list concurrently.
+    Concurrency is bounded by the connection of api object.
+    Returns:
+        (list): results(response, err) in order of args_list
+    """
+
+    return list(await asyncio.gather(*(api_method(args) for args in args_list)))
+
+
+def run_bulk(api_method, args_list):
+    """Runs async api method for every item of args_list and returns results in order"""
+
+    return asyncio.run(gather_calls(api_method, args_list))
+
+
+def bulk_create(resource_api, payloads, max_concurrency=None):
+    """Creates entities concurrently. Returns list of (response, err)"""
+
+    async_api = AsyncResourceAPI.from_resource_api(resource_api, max_concurrency)
+    try:
+        return run_bulk(async_api.create, payloads)
+    finally:
+        async_api.connection.close()
+
+
+def bulk_read(resource_api, uuids, max_concurrency=None):
+    """Reads entities concurrently. Returns list of (response, err)"""
+
+    async_api = AsyncResourceAPI.from_resource_api(resource_api, max_concurrency)
+    try:
+        return run_bulk(async_api.read, uuids)
+    finally:
+        async_api.connection.close()
+
+
+def bulk_delete(resource_api, uuids, max_concurrency=None):
+    """Deletes entities concurrently. Returns list of (response, err)"""
+
+    async_api = AsyncResourceAPI.from_resource_api(resource_api, max_concurrency)
+    try:
+        return run_bulk(async_api.delete, uuids)
+    finally:
+        async_api.connection.close()
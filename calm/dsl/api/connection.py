@@ -13,18 +13,21 @@ client = get_connection(pc_ip, pc_port,
 
 import traceback
 import json
+import os
+import time
 import urllib3
 import sys
 
 from requests import Session as Session
 from requests_toolbelt import MultipartEncoder
 from requests.adapters import HTTPAdapter
-from requests.exceptions import ConnectTimeout
+from requests.exceptions import ConnectTimeout, RequestException
 from requests.packages.urllib3.util.retry import Retry
 
 from calm.dsl.log import get_logging_handle
 from calm.dsl.config import get_context
 from calm.dsl.constants import MULTICONNECT
+from .response_memo import get_response_memo
 
 urllib3.disable_warnings()
 LOG = get_logging_handle(__name__)
@@ -60,6 +63,16 @@ class REQUEST:
         POST = "post"
         PUT = "put"
 
+    class DOWNLOAD:
+        """
+        Streamed downloads
+        """
+
+        CHUNK_SIZE = 1024 * 1024
+        PART_FILE_SUFFIX = ".part"
+        # Validator (ETag/Last-Modified) of response written to part file
+        PART_META_FILE_SUFFIX = ".part.json"
+
 
 def build_url(host, port, endpoint="", scheme=REQUEST.SCHEME.HTTPS):
     """Build url.
@@ -262,6 +275,7 @@ class Connection:
         files=None,
         ignore_error=False,
         warning_msg="",
+        stream=False,
         **kwargs,
     ):
         """Private method for making http request to calm
@@ -273,6 +287,8 @@ class Connection:
             request_json (dict): request data
             request_params (dict): request params
             timeout (touple): (connection timeout, read timeout)
+            stream (bool): defer download of response body (GET/POST only),
+                           use Response.iter_content() to read it in chunks
         Returns:
             (tuple (requests.Response, dict)): Response
         """
@@ -295,13 +311,38 @@ class Connection:
                 method=method, endpoint=endpoint, body=request_json
             )
         )
+
+        memo = get_response_memo()
+        memo_key = None
+        if memo is not None:
+            is_read_only = method == REQUEST.METHOD.GET or (
+                method == REQUEST.METHOD.POST and endpoint.endswith("/list")
+            )
+            if is_read_only and files is None and not stream:
+                memo_key = memo.get_key(
+                    method,
+                    build_url(self.host, self.port, endpoint, scheme=self.scheme),
+                    request_json,
+                    request_params,
+                    headers,
+                )
+                res = memo.get(memo_key)
+                if res is not None:
+                    LOG.debug("Server Response served from memo")
+                    return res, None
+
+            else:
+                # Writes can change responses of read-only calls
+                memo.clear()
+
         res = None
         err = None
         try:
             res = None
             url = build_url(self.host, self.port, endpoint=endpoint, scheme=self.scheme)
             LOG.debug("URL is: {}".format(url))
-            base_headers = self.session.headers
+            # Headers of this request must not leak into the session
+            base_headers = dict(self.session.headers)
             if headers:
                 base_headers.update(headers)
 
@@ -315,6 +356,7 @@ class Connection:
                         verify=verify,
                         headers={"Content-Type": m.content_type},
                         timeout=timeout,
+                        stream=stream,
                     )
                 else:
                     res = self.session.post(
@@ -325,6 +367,7 @@ class Connection:
                         headers=base_headers,
                         cookies=cookies,
                         timeout=timeout,
+                        stream=stream,
                     )
             elif method == REQUEST.METHOD.PUT:
                 res = self.session.put(
@@ -344,6 +387,7 @@ class Connection:
                     headers=base_headers,
                     cookies=cookies,
                     timeout=timeout,
+                    stream=stream,
                 )
             elif method == REQUEST.METHOD.DELETE:
                 res = self.session.delete(
@@ -393,8 +437,186 @@ class Connection:
                 )
             )
 
+        if memo_key and err is None:
+            memo.set(memo_key, res)
+
         return res, err
 
+    def download(
+        self,
+        endpoint,
+        file_path,
+        method=REQUEST.METHOD.GET,
+        request_json=None,
+        files=None,
+        resume=True,
+        progress_callback=None,
+        **kwargs,
+    ):
+        """Streams response of request to a file, one chunk at a time.
+
+        Response is written to '<file_path>.part', which is moved to file_path
+        once complete. Validator of response (strong ETag or Last-Modified) is
+        saved along with the partial file. If an earlier download of same
+        endpoint left a partial file, only the remaining bytes are requested
+        (GET only) using a range request conditional on the validator (If-Range).
+        Full response is downloaded again if partial file has no validator or
+        server does not honour the range (ex: resource changed).
+
+        Args:
+            endpoint (str): calm server endpoint
+            file_path (str): location of downloaded file
+            method (str): calm server http method
+            request_json (dict): request data
+            files (list): multipart files for POST request
+            resume (bool): resume from partial file of earlier download
+            progress_callback (callable): called with (downloaded bytes,
+                                          total bytes or None) after every chunk
+        Returns:
+            (tuple (dict, dict)): download stats (path, size, resumed_from,
+                                  elapsed_time in seconds), error
+        """
+
+        part_path = file_path + REQUEST.DOWNLOAD.PART_FILE_SUFFIX
+        meta_path = file_path + REQUEST.DOWNLOAD.PART_META_FILE_SUFFIX
+        offset = 0
+        validator = None
+        if resume and method == REQUEST.METHOD.GET and os.path.isfile(part_path):
+            validator = _read_part_validator(meta_path, endpoint)
+            if validator:
+                offset = os.path.getsize(part_path)
+
+        start_time = time.monotonic()
+        res = None
+        if offset:
+            res, err = self._call(
+                endpoint,
+                method=method,
+                request_json=request_json,
+                headers={"Range": "bytes={}-".format(offset), "If-Range": validator},
+                stream=True,
+                ignore_error=True,
+                **kwargs,
+            )
+            if err:
+                LOG.debug("Unable to resume download: {}".format(err))
+                res = None
+
+        if res is None:
+            res, err = self._call(
+                endpoint,
+                method=method,
+                request_json=request_json,
+                files=files,
+                stream=True,
+                **kwargs,
+            )
+            if err:
+                return None, err
+
+        # 206 (Partial Content) is returned only if range was honoured
+        if res.status_code != 206:
+            offset = 0
+
+        if not offset:
+            # Only GET requests are resumed
+            if method == REQUEST.METHOD.GET:
+                validator = _get_response_validator(res)
+            else:
+                validator = None
+            _write_part_validator(meta_path, endpoint, validator)
+
+        total_size = res.headers.get("Content-Length")
+        total_size = int(total_size) + offset if total_size else None
+        downloaded = offset
+        try:
+            with open(part_path, "ab" if offset else "wb") as fd:
+                for chunk in res.iter_content(chunk_size=REQUEST.DOWNLOAD.CHUNK_SIZE):
+                    fd.write(chunk)
+                    downloaded += len(chunk)
+                    if progress_callback:
+                        progress_callback(downloaded, total_size)
+
+            # Connection closed by server before sending the complete response
+            if total_size is not None and downloaded < total_size:
+                raise OSError("Expected {} bytes of response".format(total_size))
+
+        except (RequestException, OSError) as exp:
+            LOG.debug("Got traceback\n{}".format(traceback.format_exc()))
+            if validator:
+                err_msg = "Download interrupted after {} bytes, run again to resume: {}"
+            else:
+                # Partial file can not be resumed without validator
+                _remove_files(part_path, meta_path)
+                err_msg = "Download interrupted after {} bytes: {}"
+
+            err = {"error": err_msg.format(downloaded, exp), "code": 500}
+            return None, err
+
+        finally:
+            res.close()
+
+        os.replace(part_path, file_path)
+        _remove_files(meta_path)
+        stats = {
+            "path": file_path,
+            "size": downloaded,
+            "resumed_from": offset,
+            "elapsed_time": time.monotonic() - start_time,
+        }
+        LOG.debug(
+            "Downloaded {} bytes ({} resumed) to {} in {:.2f}s".format(
+                downloaded, offset, file_path, stats["elapsed_time"]
+            )
+        )
+        return stats, None
+
+
+def _get_response_validator(res):
+    """returns validator of response usable in If-Range header, None if not present"""
+
+    etag = res.headers.get("ETag")
+    # Weak etags can not be used for range requests
+    if etag and not etag.startswith("W/"):
+        return etag
+
+    return res.headers.get("Last-Modified")
+
+
+def _read_part_validator(meta_path, endpoint):
+    """returns validator of partial file downloaded from endpoint, None if not found"""
+
+    try:
+        with open(meta_path) as fd:
+            meta = json.load(fd)
+
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(meta, dict) or meta.get("endpoint") != endpoint:
+        return None
+
+    return meta.get("validator")
+
+
+def _write_part_validator(meta_path, endpoint, validator):
+    """saves validator of partial file, removing the stale one if response has no validator"""
+
+    if not validator:
+        _remove_files(meta_path)
+        return
+
+    with open(meta_path, "w") as fd:
+        json.dump({"endpoint": endpoint, "validator": validator}, fd)
+
+
+def _remove_files(*file_paths):
+    for file_path in file_paths:
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
 
 class PcConnection(Connection):
     pass
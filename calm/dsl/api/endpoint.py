@@ -133,26 +133,12 @@ class EndpointAPI(ResourceAPI):
 
     def export_file(self, uuid, passphrase=None):
         current_path = os.path.dirname(os.path.realpath(__file__))
-        if passphrase:
-            res, err = self.connection._call(
-                self.EXPORT_FILE.format(uuid),
-                verify=False,
-                method=REQUEST.METHOD.POST,
-                request_json={"passphrase": passphrase},
-                files=[],
-            )
-        else:
-            res, err = self.connection._call(
-                self.EXPORT_FILE.format(uuid), verify=False, method=REQUEST.METHOD.GET
-            )
-
+        file_path = current_path + "/" + uuid + ".json"
+        _, err = self.download_export_file(uuid, file_path, passphrase=passphrase)
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
-        with open(current_path + "/" + uuid + ".json", "wb") as downloaded_file:
-            for chunk in res.iter_content(chunk_size=2048):
-                downloaded_file.write(chunk)
 
-        return current_path + "/" + uuid + ".json"
+        return file_path
 
     def import_file(self, file_path, name, project_uuid, passphrase=None):
 
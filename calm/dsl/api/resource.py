@@ -1,4 +1,7 @@
 import sys
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from .connection import REQUEST
 from calm.dsl.config import get_context
@@ -15,6 +18,9 @@ class ResourceAPI:
     CALM_ROOT = "api/calm/v3.0"
     DM_ROOT = "dm/v3"
 
+    # Default number of pages fetched concurrently while streaming entities
+    LIST_ALL_MAX_WORKERS = 4
+
     def __init__(self, connection, resource_type, calm_api=False, dm_api=False):
 
         context = get_context()
@@ -65,6 +71,32 @@ class ResourceAPI:
             self.ITEM.format(uuid), verify=False, method=REQUEST.METHOD.DELETE
         )
 
+    def download(self, url, file_path, **kwargs):
+        """streams response of url to file_path (see Connection.download)"""
+
+        return self.connection.download(url, file_path, verify=False, **kwargs)
+
+    def download_export_file(
+        self, uuid, file_path, passphrase=None, progress_callback=None
+    ):
+        """streams exported file of entity to file_path, for apis having EXPORT_FILE url"""
+
+        if passphrase:
+            return self.download(
+                self.EXPORT_FILE.format(uuid),
+                file_path,
+                method=REQUEST.METHOD.POST,
+                request_json={"passphrase": passphrase},
+                files=[],
+                progress_callback=progress_callback,
+            )
+
+        return self.download(
+            self.EXPORT_FILE.format(uuid),
+            file_path,
+            progress_callback=progress_callback,
+        )
+
     def list(self, params={}, ignore_error=False):
         return self.connection._call(
             self.LIST,
@@ -75,19 +107,11 @@ class ResourceAPI:
         )
 
     def get_name_uuid_map(self, params={}):
-        res_entities, err = self.list_all(base_params=params, ignore_error=True)
-
-        if not err:
-            response = res_entities
-        else:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-        total_matches = len(response)
-        if total_matches == 0:
-            return {}
         name_uuid_map = {}
 
-        for entity in response:
+        for entity in self.iter_all(
+            base_params=params, max_workers=self.LIST_ALL_MAX_WORKERS
+        ):
             entity_name = entity["status"]["name"]
             entity_uuid = entity["metadata"]["uuid"]
 
@@ -109,18 +133,10 @@ class ResourceAPI:
         return name_uuid_map
 
     def get_uuid_name_map(self, params={}):
-        res_entities, err = self.list_all(base_params=params, ignore_error=True)
-        if not err:
-            response = res_entities
-        else:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-        total_matches = len(response)
-        if total_matches == 0:
-            return {}
-
         uuid_name_map = {}
-        for entity in response:
+        for entity in self.iter_all(
+            base_params=params, max_workers=self.LIST_ALL_MAX_WORKERS
+        ):
             entity_name = entity["status"]["name"]
             entity_uuid = entity["metadata"]["uuid"]
 
@@ -128,40 +144,123 @@ class ResourceAPI:
 
         return uuid_name_map
 
-    # TODO: Fix return type of list_all helper
-    def list_all(self, api_limit=250, base_params=None, ignore_error=False):
-        """returns the list of entities"""
+    def _iter_list_pages(
+        self, api_limit=250, base_params=None, ignore_error=False, max_workers=1
+    ):
+        """
+        Yields (entities, err) for every page of list call in order of offset.
+        Once first page returns total_matches, upto `max_workers` pages are
+        fetched concurrently over the connection's session pool.
+        """
 
-        final_list = []
-        offset = 0
         if base_params is None:
             base_params = {}
         params = base_params.copy()
         length = params.get("length", api_limit)
         params["length"] = length
-        params["offset"] = offset
+        params["offset"] = 0
         if params.get("sort_attribute", None) is None:
             params["sort_attribute"] = "_created_timestamp_usecs_"
         if params.get("sort_order", None) is None:
             params["sort_order"] = "ASCENDING"
-        while True:
-            params["offset"] = offset
-            response, err = self.list(params, ignore_error=ignore_error)
-            if not err:
-                response = response.json()
-            else:
+
+        def fetch_page(offset):
+            page_params = params.copy()
+            page_params["offset"] = offset
+            response, err = self.list(page_params, ignore_error=ignore_error)
+            if err:
+                return None, err
+
+            return response.json(), None
+
+        response, err = fetch_page(0)
+        if err:
+            yield [], err
+            return
+
+        yield response["entities"], None
+
+        total_matches = int(response["metadata"]["total_matches"])
+        offsets = iter(range(length, total_matches, length))
+
+        if max_workers <= 1:
+            for offset in offsets:
+                response, err = fetch_page(offset)
+                if err:
+                    yield [], err
+                    return
+
+                yield response["entities"], None
+            return
+
+        # Keep only `max_workers` pages in flight so that memory stays bounded
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = deque(
+                executor.submit(fetch_page, offset)
+                for offset in itertools.islice(offsets, max_workers)
+            )
+            while futures:
+                response, err = futures.popleft().result()
+                if err:
+                    for future in futures:
+                        future.cancel()
+                    yield [], err
+                    return
+
+                for offset in itertools.islice(offsets, 1):
+                    futures.append(executor.submit(fetch_page, offset))
+                yield response["entities"], None
+
+    def iter_all(self, api_limit=250, base_params=None, max_workers=1):
+        """
+        Generator yielding entities page by page as they arrive (in order)
+        Args:
+            api_limit (int): page size, used if base_params has no length
+            base_params (dict): list payload
+            max_workers (int): number of pages fetched concurrently
+        Raises:
+            Exception: if any of the list calls fail
+        """
+
+        for entities, err in self._iter_list_pages(
+            api_limit=api_limit,
+            base_params=base_params,
+            ignore_error=True,
+            max_workers=max_workers,
+        ):
+            if err:
+                raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+            for entity in entities:
+                yield entity
+
+    # TODO: Fix return type of list_all helper
+    def list_all(
+        self, api_limit=250, base_params=None, ignore_error=False, max_workers=1
+    ):
+        """returns the list of entities
+
+        Args:
+            api_limit (int): page size, used if base_params has no length
+            base_params (dict): list payload
+            ignore_error (bool): return (entities, err) instead of raising
+            max_workers (int): number of pages fetched concurrently
+        """
+
+        final_list = []
+        for entities, err in self._iter_list_pages(
+            api_limit=api_limit,
+            base_params=base_params,
+            ignore_error=ignore_error,
+            max_workers=max_workers,
+        ):
+            if err:
                 if ignore_error:
                     return [], err
                 else:
                     raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
-            final_list.extend(response["entities"])
-
-            total_matches = response["metadata"]["total_matches"]
-            if int(total_matches) <= (api_limit + offset):
-                break
-
-            offset += length
+            final_list.extend(entities)
 
         if ignore_error:
             return final_list, None
@@ -0,0 +1,85 @@
+"""
+Memo of responses of read-only api calls (GET and list calls), active only
+within the `memoize_responses` block of the thread entering it, i.e. while
+compiling a dsl file. Within the block, a call repeated with same url and
+payload returns the response of the first call. Any other call (create,
+update, delete, action run) clears the memo, as it can change the responses.
+"""
+
+import json
+import threading
+from contextlib import contextmanager
+
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+_LOCAL = threading.local()
+
+
+class ResponseMemo:
+    """Responses of read-only calls keyed by request"""
+
+    def __init__(self):
+        self._responses = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(method, url, request_json=None, request_params=None, headers=None):
+        return (method, url) + tuple(
+            json.dumps(value, sort_keys=True, default=str)
+            for value in [request_json, request_params, headers]
+        )
+
+    def get(self, key):
+        res = self._responses.get(key, None)
+        if res is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return res
+
+    def set(self, key, res):
+        self._responses[key] = res
+
+    def clear(self):
+        self._responses.clear()
+
+
+def get_response_memo():
+    """returns memo of current thread, None if responses are not memoized"""
+
+    return getattr(_LOCAL, "memo", None)
+
+
+@contextmanager
+def memoize_responses():
+    """memoizes responses of read-only calls made by this thread within the block"""
+
+    memo = get_response_memo()
+    if memo is not None:
+        # Nested block shares the memo of outer block
+        yield memo
+        return
+
+    memo = ResponseMemo()
+    _LOCAL.memo = memo
+    try:
+        yield memo
+
+    finally:
+        _LOCAL.memo = None
+        LOG.debug(
+            "Api responses memoized: {} calls served from memo, {} sent".format(
+                memo.hits, memo.misses
+            )
+        )
+
+
+def invalidate_responses():
+    """clears memoized responses of current thread (writes by api client clear it too)"""
+
+    memo = get_response_memo()
+    if memo is not None:
+        memo.clear()
@@ -92,6 +92,7 @@ from .models.vm_disk_package import (
 
 from .models.client_attrs import (
     init_dsl_metadata_map,
+    reset_dsl_metadata_map,
     get_dsl_metadata_map,
     update_dsl_metadata_map,
 )
@@ -247,6 +248,7 @@ __all__ = [
     "AhvVmResourcesType",
     "AhvVmType",
     "init_dsl_metadata_map",
+    "reset_dsl_metadata_map",
     "get_dsl_metadata_map",
     "update_dsl_metadata_map",
     "Provider",
@@ -2,13 +2,8 @@ import copy
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
-DSL_METADATA_MAP = {
-    "Service": {},
-    "Package": {},
-    "Deployment": {},
-    "Profile": {},
-    "Substrate": {},
-}
+DSL_METADATA_ENTITY_TYPES = ["Service", "Package", "Deployment", "Profile", "Substrate"]
+DSL_METADATA_MAP = {entity_type: {} for entity_type in DSL_METADATA_ENTITY_TYPES}
 # TODO Check for credential
 
 
@@ -36,3 +31,8 @@ def get_dsl_metadata_map(context=[]):
 def init_dsl_metadata_map(metadata):
     global DSL_METADATA_MAP
     DSL_METADATA_MAP = metadata
+
+
+def reset_dsl_metadata_map():
+    global DSL_METADATA_MAP
+    DSL_METADATA_MAP = {entity_type: {} for entity_type in DSL_METADATA_ENTITY_TYPES}
@@ -7,6 +7,7 @@ from types import MappingProxyType
 import uuid
 import copy
 import keyword
+import weakref
 
 from ruamel.yaml import YAML, resolver, SafeRepresenter
 from calm.dsl.tools import StrictDraft7Validator
@@ -17,6 +18,13 @@ from .client_attrs import update_dsl_metadata_map, get_dsl_metadata_map
 
 LOG = get_logging_handle(__name__)
 
+# Attributes of entity classes resolved by `get_all_attrs`,
+# {cls: (mro indices of entity classes, their attribute versions, attribute items)}
+_ALL_ATTRS_MEMO = weakref.WeakKeyDictionary()
+
+# Number of times attributes of an entity class are changed after its creation
+_ATTRS_VERSIONS = weakref.WeakKeyDictionary()
+
 
 class EntityDict(OrderedDict):
     def pre_validate(cls, vdict, name, value, parent=None):
@@ -197,11 +205,12 @@ class EntityType(EntityTypeBase):
         openapi_type = getattr(mcls, "__openapi_type__")
         setattr(cls, "__kind__", openapi_type)
 
-        for k, v in cls.get_default_attrs().items():
+        default_attrs = getattr(mcls, "__default_attrs__", {}) or {}
+        for k, default in default_attrs.items():
             # Check if attr was set during class creation
-            # else - set default value
+            # else - set default value (copy of default is created only here)
             if not hasattr(cls, k):
-                setattr(cls, k, v)
+                setattr(cls, k, default())
 
         return cls
 
@@ -224,6 +233,19 @@ class EntityType(EntityTypeBase):
 
         # Set attribute
         super().__setattr__(name, value)
+        cls._update_attrs_version(name)
+
+    def __delattr__(cls, name):
+
+        super().__delattr__(name)
+        cls._update_attrs_version(name)
+
+    def _update_attrs_version(cls, name):
+        """invalidates attributes of class (and its subclasses) memoized by get_all_attrs"""
+
+        # Parent is set on every entity while compiling, and is not a user attr
+        if name != "__parent__":
+            _ATTRS_VERSIONS[cls] = _ATTRS_VERSIONS.get(cls, 0) + 1
 
     def __str__(cls):
         return cls.__name__
@@ -231,22 +253,29 @@ class EntityType(EntityTypeBase):
     def __repr__(cls):
         return cls.__name__
 
-    def get_user_attrs(cls):
+    def is_user_attr(cls, name, value):
+        """returns False for attrs internal to dsl (dunder attrs other than variables, actions)"""
+
+        if name == "__parent__":
+            return False
+
+        if not (name.startswith("__") and name.endswith("__")):
+            return True
+
         types = EntityTypeBase.get_entity_types()
         ActionType = types.get("Action", None)
         RunbookType = types.get("Runbook", None)
         VariableType = types.get("Variable", None)
         DescriptorType = types.get("Descriptor", None)
+        return isinstance(value, (VariableType, ActionType, RunbookType)) or isinstance(
+            type(value), DescriptorType
+        )
+
+    def get_user_attrs(cls):
         user_attrs = {}
         for name, value in cls.__dict__.items():
-            if (
-                name.startswith("__")
-                and name.endswith("__")
-                and not isinstance(value, (VariableType, ActionType, RunbookType))
-                and not isinstance(type(value), DescriptorType)
-            ) or name == "__parent__":
-                continue
-            user_attrs[name] = getattr(cls, name, value)
+            if cls.is_user_attr(name, value):
+                user_attrs[name] = getattr(cls, name, value)
 
         return user_attrs
 
@@ -318,18 +347,78 @@ class EntityType(EntityTypeBase):
         for k in del_keys:
             attrs.pop(k)
 
+    def _get_all_attr_items(cls):
+        """
+        returns user attrs of class and entity classes in its mro as (name, index
+        of class setting the attr in cls.__mro__) items, index is None if attr is
+        not set by any class (i.e. default of schema is used). Items are memoized
+        per class, till attributes of any of these classes are changed.
+        """
+
+        mro = cls.__mro__
+        memo = _ALL_ATTRS_MEMO.get(cls, None)
+        if memo:
+            indices, versions, items = memo
+            if versions == tuple(_ATTRS_VERSIONS.get(mro[ind], 0) for ind in indices):
+                return items
+
+        indices = [
+            ind
+            for ind in reversed(range(len(mro)))
+            if hasattr(mro[ind], "get_user_attrs")
+            and callable(getattr(mro[ind], "get_user_attrs"))
+        ]
+
+        # Attrs of derived classes override attrs of base classes, ordered as
+        # defaults of schema followed by other attrs of classes
+        namespace = dict.fromkeys(getattr(type(cls), "__default_attrs__", {}) or {})
+        for ind in indices:
+            for name in mro[ind].__dict__:
+                namespace[name] = ind
+
+        items = [
+            (name, ind)
+            for name, ind in namespace.items()
+            if ind is None or cls.is_user_attr(name, mro[ind].__dict__[name])
+        ]
+
+        # Memo does not refer to classes, so that it does not keep them alive
+        _ALL_ATTRS_MEMO[cls] = (
+            indices,
+            tuple(_ATTRS_VERSIONS.get(mro[ind], 0) for ind in indices),
+            items,
+        )
+        return items
+
     def get_all_attrs(cls):
+        """returns user attrs of class, including attrs inherited from entity classes in its mro"""
 
-        ncls_ns = cls.get_default_attrs()
-        for klass in reversed(cls.mro()):
-            if hasattr(klass, "get_user_attrs") and callable(
-                getattr(klass, "get_user_attrs")
-            ):
-                ncls_ns = {**ncls_ns, **klass.__dict__}
+        types = EntityTypeBase.get_entity_types()
+        VariableType = types.get("Variable", None)
+        DescriptorType = types.get("Descriptor", None)
+        default_attrs = getattr(type(cls), "__default_attrs__", {}) or {}
+        validators = getattr(type(cls), "__validator_dict__", {}) or {}
 
-        ncls = type(cls)(cls.__name__, cls.__bases__, ncls_ns)
+        attrs = {}
+        for name, ind in cls._get_all_attr_items():
+            if ind is None:
+                attrs[name] = default_attrs[name]()
+                continue
+
+            value = cls.__mro__[ind].__dict__[name]
 
-        return ncls.get_user_attrs()
+            # Variables and actions are named after the attr they are set to
+            if name not in validators and not name.startswith("__"):
+                if isinstance(value, VariableType):
+                    if value.name != name:
+                        setattr(value, "name", name)
+
+                elif isinstance(type(value), DescriptorType):
+                    setattr(value, "action_name", name)
+
+            attrs[name] = getattr(cls, name, value)
+
+        return attrs
 
     def get_not_required_if_none_attrs(cls):
         not_required_attrs = []
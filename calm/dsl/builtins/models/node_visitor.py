@@ -2,6 +2,7 @@ import ast
 import uuid
 
 from .task import meta
+from .parse_cache import compile_expr
 from .entity import EntityType
 from .task import CalmTask, RunbookTask, TaskType
 from .variable import CalmVariable, RunbookVariable, VariableType
@@ -78,9 +79,9 @@ class GetCallNodes(ast.NodeVisitor):
         sub_node = node.func
         while not isinstance(sub_node, ast.Name):
             sub_node = sub_node.value
-        py_object = eval(compile(ast.Expression(sub_node), "", "eval"), self._globals)
+        py_object = eval(compile_expr(sub_node), self._globals)
         if py_object == CalmTask or RunbookTask or isinstance(py_object, EntityType):
-            task = eval(compile(ast.Expression(node), "", "eval"), self._globals)
+            task = eval(compile_expr(node), self._globals)
             if task is not None and isinstance(task, TaskType):
                 if self.target is not None and not task.target_any_local_reference:
                     task.target_any_local_reference = self.target
@@ -94,7 +95,7 @@ class GetCallNodes(ast.NodeVisitor):
     def is_calm_or_runbook_variable(self, sub_node):
         while not isinstance(sub_node, ast.Name):
             sub_node = sub_node.value
-        py_object = eval(compile(ast.Expression(sub_node), "", "eval"), self._globals)
+        py_object = eval(compile_expr(sub_node), self._globals)
         return py_object == CalmVariable or RunbookVariable
 
     def visit_Assign(self, node):
@@ -106,9 +107,7 @@ class GetCallNodes(ast.NodeVisitor):
                     sub_node = element.func
 
                     if self.is_calm_or_runbook_variable(sub_node):
-                        variable = eval(
-                            compile(ast.Expression(element), "", "eval"), self._globals
-                        )
+                        variable = eval(compile_expr(element), self._globals)
                         if (
                             variable.type != "LOCAL"
                             or variable.value_type != "STRING"
@@ -128,9 +127,7 @@ class GetCallNodes(ast.NodeVisitor):
                 self.global_variables = []
                 for element in node.value.elts:
                     sub_node = element.func
-                    variable = eval(
-                        compile(ast.Expression(element), "", "eval"), self._globals
-                    )
+                    variable = eval(compile_expr(element), self._globals)
                     if (
                         isinstance(variable, dict)
                         and variable.get("kind", "") == "global_variable"
@@ -154,9 +151,7 @@ class GetCallNodes(ast.NodeVisitor):
             variable_name = node.targets[0].id
             if variable_name in self.variables.keys():
                 raise NameError("duplicate variable name {}".format(variable_name))
-            variable = eval(
-                compile(ast.Expression(node.value), "", "eval"), self._globals
-            )
+            variable = eval(compile_expr(node.value), self._globals)
             if isinstance(variable, VariableType):
                 variable.name = variable_name
                 self.variables[variable_name] = variable
@@ -180,7 +175,7 @@ class GetCallNodes(ast.NodeVisitor):
                 "Only a single context is supported in 'with' statements inside the action."
             )
         context = eval(
-            compile(ast.Expression(node.items[0].context_expr), "", "eval"),
+            compile_expr(node.items[0].context_expr),
             self._globals,
         )
 
@@ -253,9 +248,7 @@ class GetCallNodes(ast.NodeVisitor):
                             var
                         )
                     )
-                statementContext = eval(
-                    compile(ast.Expression(statement_context), "", "eval"), _globals
-                )
+                statementContext = eval(compile_expr(statement_context), _globals)
                 if (
                     hasattr(statementContext, "__calm_type__")
                     and statementContext.__calm_type__ == "branch"
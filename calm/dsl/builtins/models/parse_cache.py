@@ -0,0 +1,151 @@
+"""
+Cache of parsed source of functions decorated by @action/@runbook.
+
+Descriptors of actions and runbooks are evaluated every time the owner entity
+is compiled, and each evaluation needs the AST of the user function. Parsed
+source is cached against the code object of the function and the digest of its
+source lines, so a function is tokenized and parsed only once per process.
+Expression code compiled by the node visitors is cached on the AST nodes.
+Tasks and variables are not cached, as they are evaluated against the globals
+of the function every time and are modified by the owner entity afterwards.
+"""
+
+import ast
+import dis
+import hashlib
+import inspect
+import linecache
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+# node: parsed function definition,
+# has_with_stmt: False if there is no `with` statement(parallel/branch) in function
+ParsedSource = namedtuple("ParsedSource", ["node", "has_with_stmt"])
+
+_PARSE_CACHE = {}
+_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "parse_time": 0.0}
+
+
+def _get_source_key(user_func):
+    """returns cache key for source of function, None if source is not available"""
+
+    code = user_func.__code__
+    linecache.checkcache(code.co_filename)
+    lines = linecache.getlines(code.co_filename, user_func.__globals__)
+    if not lines:
+        return None
+
+    # First line of decorated function is the line of its first decorator.
+    # `dis.findlinestarts` is used as `co_lines` is available only in python 3.10+
+    last_line = max(
+        (line for _, line in dis.findlinestarts(code) if line),
+        default=code.co_firstlineno,
+    )
+    src = "".join(lines[code.co_firstlineno - 1 : last_line])
+    return (
+        code.co_filename,
+        code,
+        hashlib.sha256(src.encode("utf-8")).hexdigest(),
+    )
+
+
+def parse_func_source(user_func):
+    """returns ParsedSource for function by parsing its source"""
+
+    # Get the source code for the user function.
+    # Also replace tabs with 4 spaces.
+    src = inspect.getsource(user_func).replace("\t", "    ")
+
+    # Get the indent since this decorator is used within class definition
+    # For this we split the code on newline and count the number of spaces
+    # before the @runbook decorator.
+    # src = "    @runbook\n    def runbook1():\n    CalmTask.Exec.ssh("Hello World")"
+    # The indentation here would be 4.
+    padding = src.split("\n")[0].rstrip(" ").split(" ").count("")
+
+    # This recreates the source code without the indentation and the
+    # decorator.
+    new_src = "\n".join(line[padding:] for line in src.split("\n")[1:])
+
+    node = ast.parse(new_src)
+    has_with_stmt = any(isinstance(_node, ast.With) for _node in ast.walk(node))
+    return ParsedSource(node, has_with_stmt)
+
+
+def get_parsed_source(user_func):
+    """
+    returns ParsedSource for function from cache, parsing the source on a miss.
+    Returned AST is shared, so it should not be modified.
+    """
+
+    start_time = time.perf_counter()
+    key = _get_source_key(user_func)
+    parsed_source = _PARSE_CACHE.get(key) if key else None
+    is_hit = parsed_source is not None
+    if not is_hit:
+        parsed_source = parse_func_source(user_func)
+        if key:
+            with _LOCK:
+                _PARSE_CACHE[key] = parsed_source
+
+    with _LOCK:
+        _STATS["hits" if is_hit else "misses"] += 1
+        _STATS["parse_time"] += time.perf_counter() - start_time
+
+    return parsed_source
+
+
+def compile_expr(node):
+    """returns code object evaluating the expression node, cached on the node"""
+
+    code = getattr(node, "_calm_expr_code", None)
+    if code is None:
+        code = compile(ast.Expression(node), "", "eval")
+        node._calm_expr_code = code
+    return code
+
+
+def get_parse_stats():
+    """returns hits, misses and time(in seconds) spent in getting parsed source"""
+
+    with _LOCK:
+        return dict(_STATS)
+
+
+def reset_parse_stats():
+    with _LOCK:
+        _STATS.update({"hits": 0, "misses": 0, "parse_time": 0.0})
+
+
+def clear_parse_cache():
+    with _LOCK:
+        _PARSE_CACHE.clear()
+
+
+@contextmanager
+def report_parse_time(dsl_file):
+    """logs the share of source parsing in time taken by the enclosed compile"""
+
+    start_stats = get_parse_stats()
+    start_time = time.perf_counter()
+    yield
+
+    compile_time = time.perf_counter() - start_time
+    stats = get_parse_stats()
+    LOG.debug(
+        "Compiled '{}' in {:.3f}s, source parsing took {:.3f}s "
+        "({} functions parsed, {} from cache)".format(
+            dsl_file,
+            compile_time,
+            stats["parse_time"] - start_stats["parse_time"],
+            stats["misses"] - start_stats["misses"],
+            stats["hits"] - start_stats["hits"],
+        )
+    )
@@ -20,13 +20,14 @@ class RefType(EntityType):
 
         return cdict
 
-    def get_user_attrs(cls):
-        """returns user attrs for ref class"""
+    def is_user_attr(cls, name, value):
+        """returns False for attrs internal to dsl (and referenced entity of ref class)"""
 
-        attrs = super().get_user_attrs()
-        attrs.pop("__self__", None)  # Not a user attr for reference object
+        # Not a user attr for reference object
+        if name == "__self__":
+            return False
 
-        return attrs
+        return super().is_user_attr(name, value)
 
 
 class RefValidator(PropertyValidator, openapi_type="app_ref"):
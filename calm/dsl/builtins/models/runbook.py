@@ -12,6 +12,7 @@ from .ref import RefType
 from .descriptor import DescriptorType
 from .validator import PropertyValidator
 from .node_visitor import GetCallNodes
+from .parse_cache import get_parsed_source, compile_expr
 from calm.dsl.log import get_logging_handle
 from calm.dsl.store.version import Version
 from calm.dsl.constants import RESOURCE_TYPE, CLOUD_PROVIDER as PROVIDER
@@ -101,24 +102,10 @@ class runbook(metaclass=DescriptorType):
         if hasattr(cls, "get_task_target") and getattr(cls, "__has_dag_target__", True):
             self.task_target = cls.get_task_target() or self.task_target
 
-        # Get the source code for the user function.
-        # Also replace tabs with 4 spaces.
-        src = inspect.getsource(self.user_func).replace("\t", "    ")
-
-        # Get the indent since this decorator is used within class definition
-        # For this we split the code on newline and count the number of spaces
-        # before the @runbook decorator.
-        # src = "    @runbook\n    def runbook1():\n    CalmTask.Exec.ssh("Hello World")"
-        # The indentation here would be 4.
-        padding = src.split("\n")[0].rstrip(" ").split(" ").count("")
-
-        # This recreates the source code without the indentation and the
-        # decorator.
-        new_src = "\n".join(line[padding:] for line in src.split("\n")[1:])
-
         # Get all the child tasks by parsing the source code and visiting the
         # ast.Call nodes. ast.Assign nodes become variables.
-        node = ast.parse(new_src)
+        parsed_source = get_parsed_source(self.user_func)
+        node = parsed_source.node
         func_globals = self.user_func.__globals__.copy()
 
         # for runbooks updating func_globals with endpoints and credentials passed in kwargs
@@ -132,12 +119,14 @@ class runbook(metaclass=DescriptorType):
             if args.get("endpoints", []):
                 func_globals.update({"endpoints": args["endpoints"]})
 
-        try:
-            func_globals_copy = func_globals.copy()
-            self.check_if_branch_present(node, func_globals_copy)
-        except Exception as ex:
-            LOG.exception(ex)
-            sys.exit(-1)
+        # Branches are defined inside `with parallel()` statements only
+        if parsed_source.has_with_stmt:
+            try:
+                func_globals_copy = func_globals.copy()
+                self.check_if_branch_present(node, func_globals_copy)
+            except Exception as ex:
+                LOG.exception(ex)
+                sys.exit(-1)
 
         subclasses = EntityType.get_entity_types()
         is_runbook = (
@@ -325,11 +314,7 @@ class runbook(metaclass=DescriptorType):
 
                         if isinstance(item, ast.With):
                             context = eval(
-                                compile(
-                                    ast.Expression(item.items[0].context_expr),
-                                    "",
-                                    "eval",
-                                ),
+                                compile_expr(item.items[0].context_expr),
                                 func_globals_copy,
                             )
                             if (
@@ -343,12 +328,8 @@ class runbook(metaclass=DescriptorType):
                                     for statement in item.body:
                                         if isinstance(item, ast.With):
                                             statement_context = eval(
-                                                compile(
-                                                    ast.Expression(
-                                                        statement.items[0].context_expr
-                                                    ),
-                                                    "",
-                                                    "eval",
+                                                compile_expr(
+                                                    statement.items[0].context_expr
                                                 ),
                                                 func_globals_copy,
                                             )
@@ -1,6 +1,8 @@
 """ Schema should be according to OpenAPI 3 format with x-calm-dsl-type extension"""
 
+import os
 import json
+import marshal
 from copy import deepcopy
 from io import StringIO
 from distutils.version import LooseVersion as LV
@@ -12,20 +14,87 @@ from bidict import bidict
 
 from .validator import get_property_validators
 from calm.dsl.store import Version
+from calm.dsl.tools import resolve_json_refs
+from calm.dsl.tools.artifact_cache import (
+    get_artifact_key,
+    get_files_digest,
+    load_artifact,
+    save_artifact,
+)
 from calm.dsl.log import get_logging_handle
 
 
 LOG = get_logging_handle(__name__)
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "schemas")
+SCHEMA_ARTIFACT_NAME = "schemas"
 _SCHEMAS = None
 
 
+class _LazySchemaMap:
+    """Schema name to schema mapping, each schema is unmarshalled on first access"""
+
+    def __init__(self, compiled_schemas):
+        self._compiled_schemas = compiled_schemas
+        self._schemas = {}
+
+    def get(self, name, default=None):
+        if name not in self._schemas:
+            compiled_schema = self._compiled_schemas.get(name, None)
+            if compiled_schema is None:
+                return default
+            self._schemas[name] = marshal.loads(compiled_schema)
+
+        return self._schemas[name]
+
+    def keys(self):
+        return self._compiled_schemas.keys()
+
+
 def _get_all_schemas():
     global _SCHEMAS
-    if not _SCHEMAS:
-        _SCHEMAS = _load_all_schemas()
+    if _SCHEMAS is None:
+        _SCHEMAS = _LazySchemaMap(_get_compiled_schemas())
     return _SCHEMAS
 
 
+def _get_schema_artifact_key():
+    """returns key of compiled schema artifact for current schema files"""
+
+    schema_files = [
+        os.path.join(SCHEMA_DIR, file_name)
+        for file_name in os.listdir(SCHEMA_DIR)
+        if file_name.endswith(".yaml.jinja2")
+    ]
+    return get_artifact_key(get_files_digest(schema_files))
+
+
+def _get_compiled_schemas():
+    """returns compiled schemas from artifact cache, building them if required"""
+
+    artifact_key = _get_schema_artifact_key()
+    compiled_schemas = load_artifact(SCHEMA_ARTIFACT_NAME, artifact_key)
+    if compiled_schemas is None:
+        LOG.debug("Compiling schemas")
+        compiled_schemas = compile_schemas()
+        save_artifact(SCHEMA_ARTIFACT_NAME, artifact_key, compiled_schemas)
+
+    return compiled_schemas
+
+
+def compile_schemas():
+    """
+    Renders and resolves all schemas
+    Returns:
+        (dict): schema name to marshalled schema mapping
+    """
+
+    schemas = _load_all_schemas()
+    return {
+        name: marshal.dumps(resolve_json_refs(schema))
+        for name, schema in schemas.items()
+    }
+
+
 def _load_all_schemas(schema_file="main.yaml.jinja2"):
 
     loader = PackageLoader(__name__, "schemas")
@@ -1,38 +1,28 @@
+import importlib
+
 from .main import main
-from .bp_commands import *  # NoQA
-from .app_commands import *  # NoQA
-from .runbook_commands import *  # NoQA
-from .library_tasks_commands import *  # NoQA
-from .endpoint_commands import *  # NoQA
-from .config_commands import *  # NoQA
-from .account_commands import *  # NoQA
-from .provider_commands import *  # NoQA
-from .project_commands import *  # NoQA
-from .secret_commands import *  # NoQA
-from .cache_commands import *  # NoQA
-from .completion_commands import *  # NoQA
-from .init_command import *  # NoQA
 from calm.dsl.api import get_api_client
-from .marketplace_bp_commands import *  # NoQA
-from .marketplace_item_commands import *  # NoQA
-from .marketplace_runbook_commands import *  # NoQA
-from .app_icon_commands import *  # NoQA
-from .user_commands import *  # NoQA
-from .group_commands import *  # NoQA
-from .role_commands import *  # NoQA
-from .directory_service_commands import *  # NoQA
-from .acp_commands import *  # NoQA
-from .task_commands import *  # NoQA
-from .brownfield_commands import *  # NoQA
-from .environment_commands import *  # NoQA
-from .protection_policy_commands import *  # NoQA
-from .vm_recovery_point_commands import *  # NoQA
-from .scheduler_commands import *  # NoQA
-from .network_group_commands import *  # NoQA
-from .policy_commands import *  # NoQA
-from .approval_commands import *  # NoQA
-from .approval_request_commands import *  # NoQA
-from .tunnel_commands import *  # NoQA
-from .global_variable_commands import *  # NoQA
+from .command_index import COMMAND_MODULES, load_command_modules
 
 __all__ = ["main", "get_api_client"]
+
+
+def __getattr__(name):
+    """
+    Command modules are imported lazily by the cli, so attributes earlier
+    re-exported from them (ex: `from calm.dsl.cli import create_blueprint`)
+    are looked up in the command modules on first access.
+    """
+
+    if name.startswith("_"):
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    load_command_modules()
+
+    # Later modules shadowed earlier ones when they were star-imported
+    for module_name in reversed(COMMAND_MODULES):
+        module = importlib.import_module(module_name)
+        if hasattr(module, name):
+            return getattr(module, name)
+
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
@@ -15,10 +15,12 @@ from .main import (
     decompile,
 )
 from .utils import Display, FeatureFlagGroup
+from .constants import BULK
 from .apps import (
     get_apps,
     describe_app,
     run_actions,
+    run_actions_bulk,
     run_patches,
     watch_patch_or_action,
     watch_app,
@@ -192,11 +194,12 @@ def _describe_app(app_name, out):
 @click.argument("action_name")
 @click.option(
     "--app",
-    "app_name",
+    "app_names",
     "-a",
     default=None,
     required=True,
-    help="Watch action run in an app",
+    multiple=True,
+    help="App to run the action on, can be repeated to run the action on multiple apps",
 )
 @click.option(
     "--ignore_runtime_variables",
@@ -213,8 +216,21 @@ def _describe_app(app_name, out):
     help="Path to python file for runtime editables",
 )
 @click.option("--watch/--no-watch", "-w", default=False, help="Watch scrolling output")
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=BULK.MAX_WORKERS,
+    show_default=True,
+    help="Number of apps on which the action is triggered concurrently",
+)
 def _run_actions(
-    app_name, action_name, watch, ignore_runtime_variables, runtime_params_file
+    app_names,
+    action_name,
+    watch,
+    ignore_runtime_variables,
+    runtime_params_file,
+    concurrency,
 ):
     """App lcm actions.
     All runtime variables will be prompted by default. When passing the 'ignore_runtime_editable' flag, no variables will be prompted and all default values will be used.
@@ -228,10 +244,23 @@ def _run_actions(
                 "name": "<Variable Name>"
             }
         ]
+
+    When multiple apps are given, action is triggered on 'concurrency' apps at a time and a result table is printed. Runtime variables are not prompted in this case.
     """
 
+    if len(app_names) > 1:
+        run_actions_bulk(
+            app_names=app_names,
+            action_name=action_name,
+            watch=watch,
+            patch_editables=not ignore_runtime_variables,
+            runtime_params_file=runtime_params_file,
+            max_workers=concurrency,
+        )
+        return
+
     run_actions(
-        app_name=app_name,
+        app_name=app_names[0],
         action_name=action_name,
         watch=watch,
         patch_editables=not ignore_runtime_variables,
@@ -314,10 +343,30 @@ def _download_runlog(runlog_uuid, app_name, file_name):
     default=False,
     help="Delete all kind of apps including system apps.",
 )
-def _delete_app(app_names, soft, all_items):
-    """Deletes an application"""
+@click.option(
+    "--watch/--no-watch",
+    "-w",
+    default=False,
+    help="Wait for delete runlogs and print their results",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=BULK.MAX_WORKERS,
+    show_default=True,
+    help="Number of apps deleted concurrently",
+)
+def _delete_app(app_names, soft, all_items, watch, concurrency):
+    """Deletes applications"""
 
-    delete_app(app_names, soft, delete_system_app=all_items)
+    delete_app(
+        app_names,
+        soft,
+        delete_system_app=all_items,
+        watch=watch,
+        max_workers=concurrency,
+    )
 
 
 @main.group(cls=FeatureFlagGroup)
@@ -17,8 +17,22 @@ from calm.dsl.api import get_api_client
 from calm.dsl.config import get_context
 from calm.dsl.constants import PROVIDER, PROJECT
 
-from .utils import get_name_query, get_states_filter, highlight_text, Display
-from .constants import APPLICATION, RUNLOG, SYSTEM_ACTIONS
+from .utils import (
+    get_name_query,
+    get_states_filter,
+    highlight_text,
+    Display,
+    DownloadProgress,
+)
+from .constants import APPLICATION, BULK, RUNLOG, SYSTEM_ACTIONS
+from .runlog_watcher import watch_execution
+from .bulk_ops import (
+    SkipOperation,
+    get_entities_by_name,
+    run_bulk,
+    watch_bulk_results,
+    print_bulk_results,
+)
 from .bps import (
     launch_blueprint_simple,
     compile_blueprint,
@@ -890,9 +904,8 @@ def get_completion_func(screen):
     return is_action_complete
 
 
-def watch_patch_or_action(runlog_uuid, app_name, client, screen, poll_interval=10):
-    app = _get_app(client, app_name, screen=screen)
-    app_uuid = app["metadata"]["uuid"]
+def get_action_runlog_poll_func(client, app_uuid, runlog_uuid):
+    """returns func listing runlogs under the action runlog of app"""
 
     url = client.application.ITEM.format(app_uuid) + "/app_runlogs/list"
     payload = {"filter": "root_reference=={}".format(runlog_uuid)}
@@ -900,6 +913,14 @@ def watch_patch_or_action(runlog_uuid, app_name, client, screen, poll_interval=1
     def poll_func():
         return client.application.poll_action_run(url, payload)
 
+    return poll_func
+
+
+def watch_patch_or_action(runlog_uuid, app_name, client, screen, poll_interval=10):
+    app = _get_app(client, app_name, screen=screen)
+    app_uuid = app["metadata"]["uuid"]
+
+    poll_func = get_action_runlog_poll_func(client, app_uuid, runlog_uuid)
     poll_runnnable(poll_func, get_completion_func(screen), poll_interval)
 
 
@@ -1015,32 +1036,66 @@ def watch_app(app_name, screen, app=None, poll_interval=10):
     poll_runnnable(poll_func, is_complete, poll_interval=poll_interval)
 
 
-def delete_app(app_names, soft=False, delete_system_app=False):
+def delete_app(
+    app_names,
+    soft=False,
+    delete_system_app=False,
+    watch=False,
+    max_workers=BULK.MAX_WORKERS,
+):
+    """
+    Deletes apps, resolving their names in bulk and triggering upto max_workers
+    deletes concurrently. If watch is True, waits for the delete runlogs.
+    """
+
     client = get_api_client()
+    action_label = "Soft Delete" if soft else "Delete"
+
+    apps = get_entities_by_name(client.application, app_names)
+
+    def delete(result):
+        app = apps.get(result.name)
+        if not app:
+            raise Exception("No app found with name {} found".format(result.name))
 
-    for app_name in app_names:
-        app = _get_app(client, app_name)
+        result.uuid = app["metadata"]["uuid"]
         app_project = app["metadata"].get("project_reference", {})
 
         # Delete system apps only if --all-items/-a flag is passed.
         if (not delete_system_app) and app_project:
             if app_project.get("name", "") == PROJECT.INTERNAL:
-                LOG.warning(
+                raise SkipOperation(
                     "System Apps can't be deleted. To explicitly delete them pass --all-items/-a flag."
                 )
-                continue
 
-        app_id = app["metadata"]["uuid"]
-        action_label = "Soft Delete" if soft else "Delete"
-        LOG.info("Triggering {}".format(action_label))
-        res, err = client.application.delete(app_id, soft_delete=soft)
+        res, err = client.application.delete(result.uuid, soft_delete=soft)
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
-        LOG.info("{} action triggered".format(action_label))
         response = res.json()
-        runlog_id = response["status"]["runlog_uuid"]
-        LOG.info("Action runlog uuid: {}".format(runlog_id))
+        return response["status"]["runlog_uuid"]
+
+    LOG.info("Triggering {} for {} app(s)".format(action_label, len(set(app_names))))
+    results = run_bulk(app_names, delete, max_workers=max_workers)
+    _report_bulk_results(client, results, watch)
+
+
+def _report_bulk_results(client, results, watch):
+    """watches runlogs (if required) and prints results of bulk app operation"""
+
+    if watch:
+        watch_bulk_results(
+            results,
+            lambda result: get_action_runlog_poll_func(
+                client, result.uuid, result.runlog_uuid
+            ),
+        )
+
+    if watch or len(results) > 1:
+        print_bulk_results(results)
+
+    if any(result.is_failed for result in results):
+        sys.exit(-1)
 
 
 def get_action_var_val_from_launch_params(launch_vars, var_name):
@@ -1565,12 +1620,8 @@ def get_patch_runtime_args(
     return patch_args
 
 
-def get_action_runtime_args(
-    app_uuid, action_payload, patch_editables, runtime_params_file
-):
-    """Returns action arguments or variable data"""
-
-    action_name = action_payload["name"]
+def get_action_runtime_vars(action_payload):
+    """Returns {name: variable} for runtime editable variables of action"""
 
     runtime_vars = {}
     runbook_vars = action_payload["runbook"].get("variable_list", None) or []
@@ -1579,6 +1630,17 @@ def get_action_runtime_args(
         if editable_dict.get("value", False):
             runtime_vars[_var["name"]] = _var
 
+    return runtime_vars
+
+
+def get_action_runtime_args(
+    app_uuid, action_payload, patch_editables, runtime_params_file
+):
+    """Returns action arguments or variable data"""
+
+    action_name = action_payload["name"]
+    runtime_vars = get_action_runtime_vars(action_payload)
+
     client = get_api_client()
     res, err = client.application.action_variables(
         app_id=app_uuid, action_name=action_name
@@ -1867,42 +1929,26 @@ def get_recovery_point_group_arg(config, config_task_id, recovery_groups, config
     }
 
 
-def run_actions(
-    app_name, action_name, watch, patch_editables=False, runtime_params_file=None
-):
-    client = get_api_client()
-    if action_name.lower() == SYSTEM_ACTIONS.CREATE:
-        click.echo(
-            "The Create Action is triggered automatically when you deploy a blueprint. It cannot be run separately."
-        )
-        return
-    if action_name.lower() == SYSTEM_ACTIONS.DELETE:
-        # Because Delete requries a differernt API workflow
-        delete_app([app_name])
-        return
-    if action_name.lower() == SYSTEM_ACTIONS.SOFT_DELETE:
-        delete_app(
-            [app_name], soft=True
-        )  # Because Soft Delete also requries the differernt API workflow
-        return
-
-    app = _get_app(client, app_name)
-    app_spec = app["spec"]
-    app_id = app["metadata"]["uuid"]
+def get_app_action(app, action_name):
+    """returns action of app matching the action name, None if not found"""
 
     calm_action_name = "action_" + action_name.lower()
-    action_payload = next(
+    return next(
         (
             action
-            for action in app_spec["resources"]["action_list"]
+            for action in app["spec"]["resources"]["action_list"]
             if action["name"] == calm_action_name or action["name"] == action_name
         ),
         None,
     )
-    if not action_payload:
-        LOG.error("No action found matching name {}".format(action_name))
-        sys.exit(-1)
 
+
+def trigger_app_action(
+    client, app, action_payload, patch_editables=False, runtime_params_file=None
+):
+    """runs action on app (given by app get call data), returns action runlog uuid"""
+
+    app_id = app["metadata"]["uuid"]
     action_id = action_payload["uuid"]
 
     action_args = get_action_runtime_args(
@@ -1958,7 +2004,37 @@ def run_actions(
         raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
     response = res.json()
-    runlog_uuid = response["status"]["runlog_uuid"]
+    return response["status"]["runlog_uuid"]
+
+
+def run_actions(
+    app_name, action_name, watch, patch_editables=False, runtime_params_file=None
+):
+    client = get_api_client()
+    if action_name.lower() == SYSTEM_ACTIONS.CREATE:
+        click.echo(
+            "The Create Action is triggered automatically when you deploy a blueprint. It cannot be run separately."
+        )
+        return
+    if action_name.lower() == SYSTEM_ACTIONS.DELETE:
+        # Because Delete requries a differernt API workflow
+        delete_app([app_name])
+        return
+    if action_name.lower() == SYSTEM_ACTIONS.SOFT_DELETE:
+        delete_app(
+            [app_name], soft=True
+        )  # Because Soft Delete also requries the differernt API workflow
+        return
+
+    app = _get_app(client, app_name)
+    action_payload = get_app_action(app, action_name)
+    if not action_payload:
+        LOG.error("No action found matching name {}".format(action_name))
+        sys.exit(-1)
+
+    runlog_uuid = trigger_app_action(
+        client, app, action_payload, patch_editables, runtime_params_file
+    )
     click.echo(
         "Action is triggered. Got Action Runlog uuid: {}".format(
             highlight_text(runlog_uuid)
@@ -1997,22 +2073,85 @@ def run_actions(
         )
 
 
-def poll_runnnable(poll_func, completion_func, poll_interval=10):
-    # Poll every 10 seconds on the app status, for 5 mins
-    maxWait = 5 * 60
-    count = 0
-    while count < maxWait:
-        # call status api
-        res, err = poll_func()
+def run_actions_bulk(
+    app_names,
+    action_name,
+    watch=False,
+    patch_editables=False,
+    runtime_params_file=None,
+    max_workers=BULK.MAX_WORKERS,
+):
+    """
+    Runs action on multiple apps, resolving their names in bulk and triggering
+    upto max_workers actions concurrently. Values of runtime variables can only
+    be supplied by runtime_params_file, as prompts can't be shown concurrently.
+    If watch is True, waits for the action runlogs.
+    """
+
+    if action_name.lower() == SYSTEM_ACTIONS.CREATE:
+        click.echo(
+            "The Create Action is triggered automatically when you deploy a blueprint. It cannot be run separately."
+        )
+        return
+    if action_name.lower() in [SYSTEM_ACTIONS.DELETE, SYSTEM_ACTIONS.SOFT_DELETE]:
+        delete_app(
+            app_names,
+            soft=action_name.lower() == SYSTEM_ACTIONS.SOFT_DELETE,
+            watch=watch,
+            max_workers=max_workers,
+        )
+        return
+
+    client = get_api_client()
+    apps = get_entities_by_name(client.application, app_names)
+
+    def run_action(result):
+        if result.name not in apps:
+            raise Exception("No app found with name {} found".format(result.name))
+
+        result.uuid = apps[result.name]["metadata"]["uuid"]
+        res, err = client.application.read(result.uuid)
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
-        response = res.json()
-        (completed, msg) = completion_func(response)
-        if completed:
-            # click.echo(msg)
-            break
-        count += poll_interval
-        time.sleep(poll_interval)
+
+        app = res.json()
+        action_payload = get_app_action(app, action_name)
+        if not action_payload:
+            raise Exception("No action found matching name {}".format(action_name))
+
+        if any(
+            task["type"] == "CALL_CONFIG"
+            for task in action_payload["runbook"]["task_definition_list"]
+        ):
+            raise Exception(
+                "Snapshot/Restore actions need inputs for every app, run them per app"
+            )
+
+        if (
+            patch_editables
+            and not runtime_params_file
+            and get_action_runtime_vars(action_payload)
+        ):
+            raise Exception(
+                "Action has runtime variables, supply their values using runtime params "
+                "file or ignore them"
+            )
+
+        return trigger_app_action(
+            client, app, action_payload, patch_editables, runtime_params_file
+        )
+
+    LOG.info(
+        "Running action '{}' on {} app(s)".format(action_name, len(set(app_names)))
+    )
+    results = run_bulk(app_names, run_action, max_workers=max_workers)
+    _report_bulk_results(client, results, watch)
+
+
+def poll_runnnable(poll_func, completion_func, poll_interval=10):
+    # Poll on the app status for 5 mins, backing off upto poll_interval seconds
+    maxWait = 5 * 60
+    watch_execution(poll_func, completion_func, maxWait, poll_interval)
 
 
 def download_runlog(runlog_id, app_name, file_name):
@@ -2025,11 +2164,17 @@ def download_runlog(runlog_id, app_name, file_name):
     if not file_name:
         file_name = "runlog_{}.zip".format(runlog_id)
 
-    res, err = client.application.download_runlog(app_id, runlog_id)
+    # Runlog bundles can be large, stream them to disk
+    progress = DownloadProgress("Downloading runlogs")
+    stats, err = client.application.download_runlog_file(
+        app_id, runlog_id, file_name, progress_callback=progress
+    )
     if not err:
-        with open(file_name, "wb") as fw:
-            fw.write(res.content)
-        click.echo("Runlogs saved as {}".format(highlight_text(file_name)))
+        click.echo(
+            "Runlogs saved as {} ({})".format(
+                highlight_text(file_name), progress.finish(stats)
+            )
+        )
     else:
         LOG.error("[{}] - {}".format(err["code"], err["error"]))
 
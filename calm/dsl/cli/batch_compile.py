@@ -0,0 +1,338 @@
+"""
+Compilation (or validation) of many dsl files in one run.
+
+Files are compiled on a pool of worker processes. Workers are started with the
+`spawn` method, so that they do not share the state of parent process (open
+cache db connections, module level state of dsl). Every worker is warmed up
+once (dsl models and schemas loaded, provider validators built) and then
+compiles many files. As compiling a file updates module level state of dsl
+(dsl metadata map, metadata payload, decompile context globals, modules
+imported by the file), this state is reset before every file. Only modules
+loaded from outside python, installed packages and dsl (i.e. local modules of a
+dsl file) are unloaded, local modules of a dsl file are imported from its
+directory.
+
+Result of every file is written as a json line, followed by an aggregate
+timing report of the run.
+"""
+
+import glob
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import click
+from prettytable import PrettyTable
+from ruamel import yaml
+
+from calm.dsl.log import get_logging_handle
+from calm.dsl.tools import is_shared_module
+from .constants import BATCH_COMPILE
+from .utils import highlight_text
+
+LOG = get_logging_handle(__name__)
+
+# Provider type used for a provider spec, based on type given in the spec
+SPEC_PROVIDER_TYPES = {
+    "PROVISION_AWS_VM": "AWS_VM",
+    "PROVISION_AZURE_VM": "AZURE_VM",
+    "PROVISION_GCP_VM": "GCP_VM",
+    "PROVISION_VMWARE_VM": "VMWARE_VM",
+}
+DEFAULT_SPEC_PROVIDER_TYPE = "AHV_VM"
+
+# State of worker process, set by `_init_worker`
+_WORKER_STATE = {}
+
+
+def get_spec_provider_type(spec):
+    """returns provider type to be used for a provider spec"""
+
+    return SPEC_PROVIDER_TYPES.get(spec.get("type", None), DEFAULT_SPEC_PROVIDER_TYPE)
+
+
+def get_batch_files(paths, kind):
+    """
+    Returns dsl files for given paths (in order, without duplicates)
+    Args:
+        paths (list): files, directories or glob patterns
+        kind (str): kind of files (BATCH_COMPILE.KINDS)
+    Returns:
+        (list): absolute paths of files
+    """
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = []
+            for pattern in BATCH_COMPILE.FILE_PATTERNS[kind]:
+                matches.extend(
+                    glob.glob(os.path.join(path, "**", pattern), recursive=True)
+                )
+            matches.sort()
+
+        elif os.path.isfile(path):
+            matches = [path]
+
+        else:
+            matches = sorted(glob.glob(path, recursive=True))
+            matches = [match for match in matches if os.path.isfile(match)]
+            if not matches:
+                LOG.warning("No file found for '{}'".format(path))
+
+        files.extend(os.path.abspath(match) for match in matches)
+
+    return list(dict.fromkeys(files))
+
+
+def _init_worker(kind, config_file, provider_type):
+    """initializes the dsl state in worker process"""
+
+    from calm.dsl.config import get_context
+
+    if config_file:
+        get_context().update_config_file_context(config_file=config_file)
+
+    if kind == BATCH_COMPILE.KINDS.PROVIDER_SPEC:
+        from calm.dsl.providers import get_provider
+
+        if provider_type:
+            get_provider(provider_type).get_validator()
+
+    else:
+        from calm.dsl.builtins.models.schema import _get_all_schemas
+        from calm.dsl.builtins.models.utils import set_compile_secrets_flag
+        from calm.dsl.config.env_config import EnvConfig
+
+        schemas = _get_all_schemas()
+        for name in schemas.keys():
+            schemas.get(name)
+
+        # Module compiling the files (along with the modules it imports)
+        compile_module = "bps" if kind == BATCH_COMPILE.KINDS.BLUEPRINT else "runbooks"
+        importlib.import_module("." + compile_module, __package__)
+
+        # Workers do not run the callback of `compile` group, which makes sure
+        # that secrets are not printed while compiling
+        set_compile_secrets_flag(EnvConfig.is_compile_secret())
+
+    _WORKER_STATE["modules"] = set(sys.modules)
+    _WORKER_STATE["sys_path"] = list(sys.path)
+
+
+def _reset_worker_state():
+    """resets module level state of dsl changed by compiling a file"""
+
+    from calm.dsl.builtins import reset_dsl_metadata_map
+    from calm.dsl.builtins.models.metadata_payload import reset_metadata_obj
+    from calm.dsl.decompile.main import init_decompile_context
+
+    reset_dsl_metadata_map()
+    reset_metadata_obj()
+    init_decompile_context()
+
+    # Modules imported by previous dsl file (i.e. local modules of same name)
+    for module_name in set(sys.modules) - _WORKER_STATE["modules"]:
+        if not is_shared_module(sys.modules[module_name]):
+            sys.modules.pop(module_name, None)
+    sys.path[:] = _WORKER_STATE["sys_path"]
+
+
+def _compile_file(kind, file, use_compile_cache, provider_type):
+    """returns payload of dsl file (None if entity is not found in file)"""
+
+    if kind == BATCH_COMPILE.KINDS.BLUEPRINT:
+        from .bps import compile_blueprint, hide_credential_secrets
+
+        payload = compile_blueprint(file, use_compile_cache=use_compile_cache)
+        if payload is not None:
+            hide_credential_secrets(payload)
+        return payload
+
+    elif kind == BATCH_COMPILE.KINDS.RUNBOOK:
+        from .runbooks import compile_runbook
+
+        return compile_runbook(file)
+
+    from calm.dsl.providers import get_provider
+
+    with open(file) as fd:
+        spec = yaml.safe_load(fd.read())
+
+    provider_type = provider_type or get_spec_provider_type(spec)
+    get_provider(provider_type).validate_spec(spec)
+    return {"provider_type": provider_type}
+
+
+def _run_task(kind, file, use_compile_cache, provider_type):
+    """compiles a file in worker process and returns its result"""
+
+    _reset_worker_state()
+
+    # Local modules of dsl file are imported from its directory
+    sys.path.insert(0, os.path.dirname(file))
+
+    result = {"file": file, "kind": kind}
+    start_time = time.time()
+    try:
+        payload = _compile_file(kind, file, use_compile_cache, provider_type)
+        if payload is None:
+            result["state"] = BATCH_COMPILE.STATES.NOT_FOUND
+        else:
+            result["state"] = BATCH_COMPILE.STATES.SUCCESS
+            result["payload"] = payload
+
+    except Exception as exp:
+        result["state"] = BATCH_COMPILE.STATES.FAILED
+        result["error"] = getattr(exp, "message", None) or str(exp)
+
+    # Loading an invalid dsl file exits, after logging the actual error
+    except SystemExit as exp:
+        result["state"] = BATCH_COMPILE.STATES.FAILED
+        result["error"] = str(
+            exp.code if isinstance(exp.code, str) else exp.__context__ or exp.code
+        )
+
+    result["time"] = round(time.time() - start_time, 3)
+    result["pid"] = os.getpid()
+    return result
+
+
+def compile_files(
+    kind,
+    files,
+    max_workers=BATCH_COMPILE.MAX_WORKERS,
+    use_compile_cache=True,
+    provider_type=None,
+    config_file=None,
+):
+    """
+    Compiles files on worker processes and yields result of every file as it completes
+    Args:
+        kind (str): kind of files (BATCH_COMPILE.KINDS)
+        files (list): dsl files
+        max_workers (int): number of worker processes
+        use_compile_cache (bool): use compile cache for blueprints
+        provider_type (str): provider type for provider specs (detected from spec if not given)
+        config_file (str): dsl config file to be used by workers
+    """
+
+    max_workers = max(1, min(max_workers, len(files)))
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(kind, config_file, provider_type),
+    )
+    with executor:
+        futures = [
+            executor.submit(_run_task, kind, file, use_compile_cache, provider_type)
+            for file in files
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def print_timing_report(results, wall_time, workers):
+    """prints aggregate report of a batch run"""
+
+    def format_time(value):
+        return "{:.2f}".format(value)
+
+    times = sorted(result["time"] for result in results)
+    table = PrettyTable()
+    table.field_names = ["STATE", "FILES"]
+    for state in [
+        BATCH_COMPILE.STATES.SUCCESS,
+        BATCH_COMPILE.STATES.NOT_FOUND,
+        BATCH_COMPILE.STATES.FAILED,
+    ]:
+        count = len([result for result in results if result["state"] == state])
+        table.add_row([highlight_text(state), highlight_text(count)])
+    click.echo(table, err=True)
+
+    if times:
+        click.echo(
+            "Compile time (s): total {}, min {}, median {}, max {}".format(
+                highlight_text(format_time(sum(times))),
+                highlight_text(format_time(times[0])),
+                highlight_text(format_time(times[len(times) // 2])),
+                highlight_text(format_time(times[-1])),
+            ),
+            err=True,
+        )
+
+        slowest = sorted(results, key=lambda result: result["time"], reverse=True)
+        click.echo("Slowest files:", err=True)
+        for result in slowest[: BATCH_COMPILE.SLOWEST_FILES_COUNT]:
+            click.echo(
+                "\t{} ({}s)".format(result["file"], format_time(result["time"])),
+                err=True,
+            )
+
+    click.echo(
+        "Compiled {} files in {}s on {} worker processes".format(
+            highlight_text(len(results)),
+            highlight_text(format_time(wall_time)),
+            highlight_text(workers),
+        ),
+        err=True,
+    )
+
+
+def batch_compile_command(
+    kind,
+    paths,
+    out_file=None,
+    max_workers=BATCH_COMPILE.MAX_WORKERS,
+    use_compile_cache=True,
+    provider_type=None,
+):
+    """
+    Compiles all dsl files of given paths, writing results as json lines to
+    out_file (stdout if not given) and the timing report to stderr
+    """
+
+    files = get_batch_files(paths, kind)
+    if not files:
+        LOG.error("No files found to compile")
+        sys.exit(-1)
+
+    LOG.info("Compiling {} files".format(len(files)))
+
+    # Config file passed to cli is used by workers too
+    config_file = None
+    click_ctx = click.get_current_context(silent=True)
+    if click_ctx:
+        config_file = click_ctx.find_root().params.get("config_file")
+
+    out_fd = open(out_file, "w") if out_file else sys.stdout
+    results = []
+    start_time = time.time()
+    try:
+        for result in compile_files(
+            kind,
+            files,
+            max_workers=max_workers,
+            use_compile_cache=use_compile_cache,
+            provider_type=provider_type,
+            config_file=config_file,
+        ):
+            out_fd.write(json.dumps(result) + "\n")
+            out_fd.flush()
+            results.append(result)
+
+    finally:
+        if out_file:
+            out_fd.close()
+
+    print_timing_report(
+        results, time.time() - start_time, max(1, min(max_workers, len(files)))
+    )
+
+    if any(result["state"] == BATCH_COMPILE.STATES.FAILED for result in results):
+        sys.exit(-1)
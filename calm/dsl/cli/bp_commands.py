@@ -24,6 +24,8 @@ from .bps import (
 )
 from .apps import watch_app
 from .utils import FeatureDslOption
+from .constants import BULK, BATCH_COMPILE
+from .batch_compile import batch_compile_command
 
 LOG = get_logging_handle(__name__)
 
@@ -112,9 +114,61 @@ def _format_blueprint_command(bp_file):
     default="json",
     help="output format",
 )
-def _compile_blueprint_command(bp_file, brownfield_deployment_file, out):
+@click.option(
+    "--no-compile-cache",
+    "no_compile_cache",
+    is_flag=True,
+    default=False,
+    help="Compiles the blueprint without using the compile cache",
+)
+def _compile_blueprint_command(
+    bp_file, brownfield_deployment_file, out, no_compile_cache
+):
     """Compiles a DSL (Python) blueprint into JSON or YAML"""
-    compile_blueprint_command(bp_file, brownfield_deployment_file, out)
+    compile_blueprint_command(
+        bp_file,
+        brownfield_deployment_file,
+        out,
+        use_compile_cache=not no_compile_cache,
+    )
+
+
+@compile.command("bps")
+@click.argument("paths", nargs=-1, required=True)
+@click.option(
+    "--out-file",
+    "-o",
+    "out_file",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="File to which results are written as json lines (stdout by default)",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    "max_workers",
+    type=int,
+    default=BATCH_COMPILE.MAX_WORKERS,
+    show_default=True,
+    help="Number of worker processes",
+)
+@click.option(
+    "--no-compile-cache",
+    "no_compile_cache",
+    is_flag=True,
+    default=False,
+    help="Compiles the blueprints without using the compile cache",
+)
+def _compile_blueprints_command(paths, out_file, max_workers, no_compile_cache):
+    """Compiles DSL (Python) blueprints of given files, directories or glob patterns in parallel"""
+
+    batch_compile_command(
+        BATCH_COMPILE.KINDS.BLUEPRINT,
+        paths,
+        out_file=out_file,
+        max_workers=max_workers,
+        use_compile_cache=not no_compile_cache,
+    )
 
 
 @decompile.command("bp", experimental=True)
@@ -162,10 +216,21 @@ def _compile_blueprint_command(bp_file, brownfield_deployment_file, out):
     default=False,
     help="Disable formatting the decompiled blueprint using black",
 )
-def _decompile_bp(name, bp_file, with_secrets, prefix, bp_dir, passphrase, no_format):
+@click.option(
+    "--dry-run",
+    "dry_run",
+    is_flag=True,
+    default=False,
+    help="Only report files (count and size) and render time, without writing them",
+)
+def _decompile_bp(
+    name, bp_file, with_secrets, prefix, bp_dir, passphrase, no_format, dry_run
+):
     """Decompiles blueprint present on server or json file"""
 
-    decompile_bp(name, bp_file, with_secrets, prefix, bp_dir, passphrase, no_format)
+    decompile_bp(
+        name, bp_file, with_secrets, prefix, bp_dir, passphrase, no_format, dry_run
+    )
 
 
 @create.command("bp")
@@ -415,7 +480,15 @@ def launch_blueprint_command(
 
 @delete.command("bp")
 @click.argument("blueprint_names", nargs=-1)
-def _delete_blueprint(blueprint_names):
-    """Deletes a blueprint"""
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=BULK.MAX_WORKERS,
+    show_default=True,
+    help="Number of blueprints deleted concurrently",
+)
+def _delete_blueprint(blueprint_names, concurrency):
+    """Deletes blueprints"""
 
-    delete_blueprint(blueprint_names)
+    delete_blueprint(blueprint_names, max_workers=concurrency)
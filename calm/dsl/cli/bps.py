@@ -27,11 +27,19 @@ from calm.dsl.builtins import (
     init_dsl_metadata_map,
 )
 from calm.dsl.builtins.models.metadata_payload import get_metadata_payload
+from calm.dsl.builtins.models.parse_cache import report_parse_time
+from calm.dsl.api.response_memo import memoize_responses
 from calm.dsl.config import get_context
 from calm.dsl.api import get_api_client
 from calm.dsl.store import Cache
 from calm.dsl.decompile.decompile_render import create_bp_dir
-from calm.dsl.decompile.file_handler import get_bp_dir
+from calm.dsl.decompile.file_handler import (
+    get_bp_dir,
+    init_file_tree,
+    reset_file_tree,
+    get_file_tree_stats,
+    flush_file_tree,
+)
 from calm.dsl.decompile.bp_file_helper import decrypt_decompiled_secrets_file
 from calm.dsl.decompile.main import init_decompile_context
 from calm.dsl.api.util import vm_power_action_target_map
@@ -42,8 +50,11 @@ from .utils import (
     highlight_text,
     import_var_from_file,
 )
-from .secrets import find_secret, create_secret
-from .constants import BLUEPRINT
+from .secrets import find_secrets, create_secret
+from .constants import BLUEPRINT, BULK, RUNLOG
+from .runlog_watcher import watch_execution
+from .bulk_ops import get_entities_by_name, run_bulk, print_bulk_results
+from .compile_cache import compile_with_cache
 from .environments import get_project_environment
 from .global_variable import fetch_dynamic_global_variable_values
 from calm.dsl.tools import get_module_from_file
@@ -296,7 +307,26 @@ def get_brownfield_deployment_classes(brownfield_deployment_file=None):
     return bf_deployments
 
 
-def compile_blueprint(bp_file, brownfield_deployment_file=None):
+def compile_blueprint(
+    bp_file, brownfield_deployment_file=None, use_compile_cache=False
+):
+    """
+    returns payload of blueprint file. If use_compile_cache is True, payload is
+    loaded from compile cache when the file(and files used by it) are unchanged.
+    """
+
+    # Entities looked up by blueprint are read only once while compiling it
+    def compile_func():
+        with report_parse_time(bp_file), memoize_responses():
+            return _compile_blueprint(bp_file, brownfield_deployment_file)
+
+    if use_compile_cache:
+        return compile_with_cache(compile_func, bp_file, brownfield_deployment_file)
+
+    return compile_func()
+
+
+def _compile_blueprint(bp_file, brownfield_deployment_file=None):
 
     # Constructing metadata payload
     # Note: This should be constructed before loading bp module. As metadata will be used while getting bp_payload
@@ -374,14 +404,21 @@ def create_blueprint(
     bp_payload.pop("status", None)
 
     credential_list = bp_payload["spec"]["resources"]["credential_definition_list"]
+    secret_values = find_secrets(
+        [
+            cred["secret"]["secret"]
+            for cred in credential_list
+            if cred["secret"].get("secret", None)
+        ]
+    )
     for cred in credential_list:
         if cred["secret"].get("secret", None):
             secret = cred["secret"].pop("secret")
 
-            try:
-                value = find_secret(secret)
+            if secret in secret_values:
+                value = secret_values[secret]
 
-            except ValueError:
+            else:
                 click.echo(
                     "\nNo secret corresponding to '{}' found !!!\n".format(secret)
                 )
@@ -393,6 +430,7 @@ def create_blueprint(
                 )
                 if choice[0] == "y":
                     create_secret(secret, value)
+                    secret_values[secret] = value
 
             cred["secret"]["value"] = value
 
@@ -497,7 +535,12 @@ def create_blueprint_from_dsl(
 
 
 def create_blueprint_from_dsl_with_encrypted_secrets(
-    client, bp_file, passphrase, name=None, description=None, force_create=False
+    client,
+    bp_file,
+    passphrase,
+    name=None,
+    description=None,
+    force_create=False,
 ):
     """
     creates blueprint from the bp python file supplied using import_file API.
@@ -550,6 +593,7 @@ def decompile_bp(
     bp_dir=None,
     passphrase=None,
     no_format=False,
+    dry_run=False,
 ):
     """helper to decompile blueprint"""
 
@@ -568,6 +612,7 @@ def decompile_bp(
                 bp_dir=bp_dir,
                 passphrase=passphrase,
                 no_format=no_format,
+                dry_run=dry_run,
             )
         else:
             decompile_bp_from_server(
@@ -576,6 +621,7 @@ def decompile_bp(
                 prefix=prefix,
                 bp_dir=bp_dir,
                 no_format=no_format,
+                dry_run=dry_run,
             )
 
     elif bp_file:
@@ -585,6 +631,7 @@ def decompile_bp(
             prefix=prefix,
             bp_dir=bp_dir,
             no_format=no_format,
+            dry_run=dry_run,
         )
 
     else:
@@ -595,7 +642,7 @@ def decompile_bp(
 
 
 def decompile_bp_from_server(
-    name, with_secrets=False, prefix="", bp_dir=None, no_format=False
+    name, with_secrets=False, prefix="", bp_dir=None, no_format=False, dry_run=False
 ):
     """decompiles the blueprint by fetching it from server"""
 
@@ -631,6 +678,7 @@ def decompile_bp_from_server(
         prefix=prefix,
         bp_dir=bp_dir,
         no_format=no_format,
+        dry_run=dry_run,
         **kwargs,
     )
 
@@ -642,6 +690,7 @@ def decompile_bp_from_server_with_secrets(
     bp_dir=None,
     passphrase=None,
     no_format=False,
+    dry_run=False,
 ):
     """decompiles the blueprint by fetching it from server"""
 
@@ -678,12 +727,13 @@ def decompile_bp_from_server_with_secrets(
         bp_dir=bp_dir,
         contains_encrypted_secrets=True,
         no_format=no_format,
+        dry_run=dry_run,
         **kwargs,
     )
 
 
 def decompile_bp_from_file(
-    filename, with_secrets=False, prefix="", bp_dir=None, no_format=False
+    filename, with_secrets=False, prefix="", bp_dir=None, no_format=False, dry_run=False
 ):
     """decompile blueprint from local blueprint file"""
 
@@ -705,6 +755,7 @@ def decompile_bp_from_file(
         prefix=prefix,
         bp_dir=bp_dir,
         no_format=no_format,
+        dry_run=dry_run,
         **kwargs,
     )
 
@@ -716,11 +767,76 @@ def _decompile_bp(
     bp_dir=None,
     contains_encrypted_secrets=False,
     no_format=False,
+    dry_run=False,
     **kwargs,
 ):
-    """decompiles the blueprint from payload"""
+    """
+    decompiles the blueprint from payload. Files of blueprint directory are kept
+    in memory till whole blueprint is rendered, and then written in one pass
+    (not written at all for dry run).
+    """
 
     init_decompile_context()
+    init_file_tree()
+    try:
+        start_time = time.time()
+        _render_bp_dir(
+            bp_payload,
+            with_secrets=with_secrets,
+            prefix=prefix,
+            bp_dir=bp_dir,
+            contains_encrypted_secrets=contains_encrypted_secrets,
+            no_format=no_format,
+            **kwargs,
+        )
+        render_time = time.time() - start_time
+        file_tree_stats = get_file_tree_stats()
+
+        if dry_run:
+            print_decompile_report(file_tree_stats, render_time)
+            return
+
+        write_time = flush_file_tree()
+        LOG.debug(
+            "Wrote {} files in {:.2f}s".format(file_tree_stats["files"], write_time)
+        )
+
+    finally:
+        reset_file_tree()
+
+    click.echo(
+        "\nSuccessfully decompiled. Directory location: {}. Blueprint location: {}".format(
+            get_bp_dir(), os.path.join(get_bp_dir(), "blueprint.py")
+        )
+    )
+
+
+def print_decompile_report(file_tree_stats, render_time):
+    """prints files that would be created by decompiling a blueprint"""
+
+    table = PrettyTable()
+    table.field_names = ["DIRECTORY", "FILES", "SIZE (BYTES)", "RENDER TIME (S)"]
+    table.add_row(
+        [
+            highlight_text(get_bp_dir()),
+            highlight_text(file_tree_stats["files"]),
+            highlight_text(file_tree_stats["size"]),
+            highlight_text("{:.2f}".format(render_time)),
+        ]
+    )
+    click.echo(table)
+
+
+def _render_bp_dir(
+    bp_payload,
+    with_secrets=False,
+    prefix="",
+    bp_dir=None,
+    contains_encrypted_secrets=False,
+    no_format=False,
+    **kwargs,
+):
+    """renders files of blueprint directory from payload"""
 
     # reference_runbook_to_substrate_map will be used to update vm power action to it's substrate
     reference_runbook_to_substrate_map = kwargs.get(
@@ -777,21 +893,10 @@ def _decompile_bp(
         no_format=no_format,
         global_variable_list=global_variable_list,
     )
-    click.echo(
-        "\nSuccessfully decompiled. Directory location: {}. Blueprint location: {}".format(
-            get_bp_dir(), os.path.join(get_bp_dir(), "blueprint.py")
-        )
-    )
-
 
-def compile_blueprint_command(bp_file, brownfield_deployment_file, out):
 
-    bp_payload = compile_blueprint(
-        bp_file, brownfield_deployment_file=brownfield_deployment_file
-    )
-    if bp_payload is None:
-        LOG.error("User blueprint not found in {}".format(bp_file))
-        return
+def hide_credential_secrets(bp_payload):
+    """removes secrets of credentials from payload, returns True if any secret was removed"""
 
     credential_list = bp_payload["spec"]["resources"]["credential_definition_list"]
     is_secret_avl = False
@@ -802,7 +907,23 @@ def compile_blueprint_command(bp_file, brownfield_deployment_file, out):
             # At compile time, value will be empty
             cred["secret"]["value"] = ""
 
-    if is_secret_avl:
+    return is_secret_avl
+
+
+def compile_blueprint_command(
+    bp_file, brownfield_deployment_file, out, use_compile_cache=False
+):
+
+    bp_payload = compile_blueprint(
+        bp_file,
+        brownfield_deployment_file=brownfield_deployment_file,
+        use_compile_cache=use_compile_cache,
+    )
+    if bp_payload is None:
+        LOG.error("User blueprint not found in {}".format(bp_file))
+        return
+
+    if hide_credential_secrets(bp_payload):
         LOG.warning("Secrets are not shown in payload !!!")
 
     if out == "json":
@@ -2109,15 +2230,15 @@ def launch_blueprint_simple(
 
 
 def poll_launch_status(client, blueprint_uuid, launch_req_id):
-    # Poll every 10 seconds on the app status, for 5 mins
+    # Poll on the launch status for 5 mins, backing off upto 10 seconds
     # Return True for sucess and False for failure, as watch option depends on success or failure of application create option
     maxWait = 5 * 60
-    count = 0
-    while count < maxWait:
-        # call status api
+
+    def poll_func():
         LOG.info("Polling status of Launch")
-        res, err = client.blueprint.poll_launch(blueprint_uuid, launch_req_id)
-        response = res.json()
+        return client.blueprint.poll_launch(blueprint_uuid, launch_req_id)
+
+    def is_launch_complete(response):
         app_state = response["status"]["state"]
         pprint(response)
         if app_state == "success":
@@ -2135,32 +2256,48 @@ def poll_launch_status(client, blueprint_uuid, launch_req_id):
                     pc_ip, pc_port, app_uuid
                 )
             )
-            return True
-            break
+            return (True, app_state)
         elif app_state == "failure":
             LOG.debug("API response: {}".format(response))
             LOG.error("Failed to launch blueprint. Check API response above.")
-            return False
-            break
-        elif err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+            return (True, app_state)
         LOG.info(app_state)
-        count += 10
-        time.sleep(10)
-    return False
+        return (False, app_state)
 
+    completed, app_state = watch_execution(
+        poll_func, is_launch_complete, maxWait, RUNLOG.POLL.MAX_INTERVAL
+    )
+    return completed and app_state == "success"
 
-def delete_blueprint(blueprint_names):
+
+def delete_blueprint(blueprint_names, max_workers=BULK.MAX_WORKERS):
+    """
+    Deletes blueprints, resolving their names in bulk and deleting upto
+    max_workers blueprints concurrently
+    """
 
     client = get_api_client()
+    blueprints = get_entities_by_name(
+        client.blueprint, blueprint_names, base_filter=";state!=DELETED"
+    )
+
+    def delete(result):
+        if result.name not in blueprints:
+            raise Exception("No blueprint found with name {} found".format(result.name))
 
-    for blueprint_name in blueprint_names:
-        bp_uuid = get_blueprint_uuid(blueprint_name)
-        _, err = client.blueprint.delete(bp_uuid)
+        result.uuid = blueprints[result.name]["metadata"]["uuid"]
+        _, err = client.blueprint.delete(result.uuid)
         if err:
-            LOG.error("[{}] - {}".format(err["code"], err["error"]))
-            sys.exit(-1)
-        LOG.info("Blueprint {} deleted".format(blueprint_name))
+            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+        LOG.info("Blueprint {} deleted".format(result.name))
+
+    results = run_bulk(blueprint_names, delete, max_workers=max_workers)
+    if len(results) > 1:
+        print_bulk_results(results)
+
+    if any(result.is_failed for result in results):
+        sys.exit(-1)
 
 
 def create_patched_blueprint(
@@ -0,0 +1,223 @@
+"""
+Bulk lifecycle operations (delete, soft-delete, actions) over many entities.
+
+Names of entities are resolved by a few filtered list calls instead of one list
+call per name. Operations are then triggered on a bounded worker pool, and the
+resulting runlogs can be watched together from one thread (see runlog_watcher).
+Every entity gets a `BulkResult`, so that a failure for one entity does not stop
+the operation on others.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from prettytable import PrettyTable
+
+from calm.dsl.log import get_logging_handle
+from .constants import BULK, RUNLOG
+from .runlog_watcher import RunlogWatch, RunlogWatcher
+from .utils import highlight_text
+
+LOG = get_logging_handle(__name__)
+
+
+class SkipOperation(Exception):
+    """Raised by an operation to skip the entity without failing the bulk run"""
+
+
+class BulkResult:
+    """Outcome of operation on a single entity"""
+
+    def __init__(self, name):
+        self.name = name
+        self.uuid = None
+        self.runlog_uuid = None
+        self.state = None
+        self.message = ""
+
+        # Time (in seconds) taken to trigger the operation and to complete its runlog
+        self.trigger_time = None
+        self.run_time = None
+
+    @property
+    def is_failed(self):
+        return self.state in [BULK.STATES.FAILED, BULK.STATES.TIMEOUT] or (
+            self.state in RUNLOG.FAILURE_STATES
+        )
+
+
+def get_entity_name(entity):
+    return entity["metadata"].get("name") or entity["status"].get("name")
+
+
+def get_entities_by_name(resource, names, base_filter=""):
+    """
+    Returns {name: entity} for supplied names, using one list call (paginated)
+    per BULK.NAMES_PER_LIST_CALL names. Only exact name matches are returned.
+    Args:
+        resource (ResourceAPI): api object of the entity
+        names (list): names of entities
+        base_filter (str): filter to be and-ed with names filter i.e. ';state!=DELETED'
+    """
+
+    names = list(dict.fromkeys(names))
+    entities = {}
+    for ind in range(0, len(names), BULK.NAMES_PER_LIST_CALL):
+        chunk = names[ind : ind + BULK.NAMES_PER_LIST_CALL]
+        name_filter = "({})".format(",".join("name=={}".format(n) for n in chunk))
+        params = {"filter": name_filter + base_filter}
+
+        for entity in resource.iter_all(
+            base_params=params, max_workers=resource.LIST_ALL_MAX_WORKERS
+        ):
+            # Name filter is not an exact match, keep first exact match
+            name = get_entity_name(entity)
+            if name in chunk and name not in entities:
+                entities[name] = entity
+
+    return entities
+
+
+def run_bulk(names, operation, max_workers=BULK.MAX_WORKERS):
+    """
+    Calls operation(result) for every name on a pool of max_workers threads.
+    Operation fills uuid and returns runlog uuid (if any) of the triggered operation.
+    Returns:
+        (list): BulkResult objects in order of names
+    """
+
+    results = [BulkResult(name) for name in dict.fromkeys(names)]
+
+    def run(result):
+        start_time = time.monotonic()
+        try:
+            result.runlog_uuid = operation(result)
+            result.state = (
+                BULK.STATES.TRIGGERED if result.runlog_uuid else RUNLOG.STATUS.SUCCESS
+            )
+
+        except SkipOperation as exp:
+            result.state = BULK.STATES.SKIPPED
+            result.message = str(exp)
+
+        # Operations exit on some failures (i.e. invalid runtime params file)
+        except (Exception, SystemExit) as exp:
+            result.state = BULK.STATES.FAILED
+            result.message = str(exp)
+            LOG.debug("Operation failed for '{}'".format(result.name), exc_info=True)
+
+        result.trigger_time = time.monotonic() - start_time
+        if result.is_failed:
+            LOG.error("{}: {}".format(result.name, result.message))
+        elif result.state == BULK.STATES.SKIPPED:
+            LOG.warning("{}: {}".format(result.name, result.message))
+        elif result.runlog_uuid:
+            LOG.info(
+                "{}: triggered, runlog uuid: {}".format(result.name, result.runlog_uuid)
+            )
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(results) or 1)),
+        thread_name_prefix="BulkOperation",
+    ) as executor:
+        list(executor.map(run, results))
+
+    return results
+
+
+def get_runlog_tree_state(response):
+    """
+    Completion func for list of runlogs under a root runlog
+    Returns:
+        (tuple (bool, str)): completion status and state of runlog tree
+    """
+
+    entities = response.get("entities", None) or []
+    if not entities:
+        return False, ""
+
+    states = [runlog["status"]["state"] for runlog in entities]
+    if any(state not in RUNLOG.TERMINAL_STATES for state in states):
+        return False, ""
+
+    failed_state = next(
+        (state for state in states if state in RUNLOG.FAILURE_STATES), None
+    )
+    return True, failed_state or RUNLOG.STATUS.SUCCESS
+
+
+def watch_bulk_results(results, get_poll_func, max_wait=BULK.MAX_WATCH_TIME):
+    """
+    Watches runlogs of triggered operations together till all of them complete.
+    get_poll_func(result) returns poll func listing the runlogs under root runlog.
+    """
+
+    start_time = time.monotonic()
+    watches = []
+    for result in results:
+        if result.state != BULK.STATES.TRIGGERED:
+            continue
+
+        # Record completion time of each runlog as soon as it is known
+        def completion_func(response, result=result):
+            completed, state = get_runlog_tree_state(response)
+            if completed and result.run_time is None:
+                result.run_time = time.monotonic() - start_time
+                result.state = state
+            return completed, state
+
+        watches.append(RunlogWatch(get_poll_func(result), completion_func, max_wait))
+
+    if not watches:
+        return results
+
+    LOG.info("Watching {} runlogs".format(len(watches)))
+    try:
+        RunlogWatcher(watches).run()
+    except Exception as exp:
+        LOG.error("Watching runlogs failed: {}".format(exp))
+
+    for result in results:
+        if result.state == BULK.STATES.TRIGGERED:
+            result.state = BULK.STATES.TIMEOUT
+            result.message = "Runlog not completed"
+
+    return results
+
+
+def print_bulk_results(results):
+    """prints a table of result and latencies of operation for every entity"""
+
+    def format_time(value):
+        return "{:.2f}".format(value) if value is not None else "-"
+
+    table = PrettyTable()
+    table.field_names = [
+        "NAME",
+        "STATE",
+        "TRIGGER TIME (s)",
+        "RUN TIME (s)",
+        "RUNLOG UUID",
+        "MESSAGE",
+    ]
+    for result in results:
+        table.add_row(
+            [
+                highlight_text(result.name),
+                highlight_text(result.state),
+                format_time(result.trigger_time),
+                format_time(result.run_time),
+                result.runlog_uuid or "-",
+                result.message,
+            ]
+        )
+
+    click.echo(table)
+
+    failed_count = len([result for result in results if result.is_failed])
+    click.echo(
+        "{} of {} operations failed".format(
+            highlight_text(failed_count), highlight_text(len(results))
+        )
+    )
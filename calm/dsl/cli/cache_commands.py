@@ -6,6 +6,11 @@ from calm.dsl.constants import CACHE
 
 from .main import show, update, clear
 from .utils import highlight_text
+from .compile_cache import (
+    get_compile_cache_stats,
+    get_compile_cache_size,
+    clear_compile_cache,
+)
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
@@ -45,6 +50,39 @@ def show_cache_command(entity):
         Cache.show_table(entity)
     else:
         Cache.show_data()
+        click.echo("\nSYNC STATUS")
+        Cache.show_sync_data()
+
+
+@show.command("compile-cache")
+def show_compile_cache_command():
+    """Display hit and miss counts of the blueprint compile cache"""
+
+    stats = get_compile_cache_stats()
+    hits = stats.get("hits", 0)
+    misses = stats.get("misses", 0)
+    entries, size = get_compile_cache_size()
+
+    click.echo("Hits: {}".format(highlight_text(hits)))
+    click.echo("Misses: {}".format(highlight_text(misses)))
+    if hits + misses:
+        click.echo(
+            "Hit ratio: {}".format(
+                highlight_text("{:.1f}%".format(100.0 * hits / (hits + misses)))
+            )
+        )
+    click.echo("Entries: {}".format(highlight_text(entries)))
+    click.echo("Size: {}".format(highlight_text("{:.1f} KB".format(size / 1024))))
+
+
+@clear.command("compile-cache")
+def clear_compile_cache_command():
+    """Clear the payloads and stats of the blueprint compile cache"""
+
+    clear_compile_cache()
+    LOG.info(
+        highlight_text("Compile cache cleared at {}".format(datetime.datetime.now()))
+    )
 
 
 @clear.command("cache")
@@ -63,9 +101,35 @@ def clear_cache():
     help="Cache entity, if not given will update whole cache",
     type=click.Choice(get_cache_table_types()),
 )
-def update_cache(entity):
+@click.option(
+    "--stale",
+    "stale",
+    is_flag=True,
+    default=False,
+    help="Update only tables which are stale (older than their TTL) or never synced",
+)
+@click.option(
+    "--background",
+    "background",
+    is_flag=True,
+    default=False,
+    help="Update stale tables in a detached background process",
+)
+def update_cache(entity, stale, background):
     """Update the data for dynamic entities stored in the cache"""
 
+    if background:
+        # Config file passed to cli is used by background process too
+        config_file = click.get_current_context().find_root().params.get("config_file")
+        pid = Cache.sync_stale_tables_in_background(config_file=config_file)
+        LOG.info("Updating stale tables of cache in background (pid={})".format(pid))
+        return
+
+    if stale:
+        Cache.sync_stale_tables()
+        Cache.show_sync_data()
+        return
+
     if entity:
         Cache.sync_table(entity)
         Cache.show_table(entity)
@@ -1,6 +1,7 @@
 import click
 
 from calm.dsl.config import get_context
+from calm.dsl.config.constants import ENV_CONFIG
 from calm.dsl.log import CustomLogging
 
 
@@ -80,3 +81,27 @@ def show_trace_option(logging_mod=None, **kwargs):
         return click.option(*names, callback=_set_show_trace, **kwargs)(f)
 
     return decorator
+
+
+def log_format_option(logging_mod=None, **kwargs):
+    """A decorator that add --log_format/-lf option to decorated command"""
+
+    if not isinstance(logging_mod, CustomLogging):
+        raise TypeError("Logging object should be instance of CustomLogging.")
+
+    names = ["--log_format", "-lf"]
+    kwargs.setdefault("type", click.Choice(logging_mod.get_log_formats()))
+    kwargs.setdefault("default", CustomLogging.TEXT_FORMAT)
+    kwargs.setdefault("envvar", ENV_CONFIG.LOG.FORMAT)
+    kwargs.setdefault("show_default", True)
+    kwargs.setdefault("expose_value", False)
+    kwargs.setdefault("help", "Format of logs, json emits a json object per log line")
+    kwargs.setdefault("is_eager", True)
+
+    def decorator(f):
+        def _set_log_format(ctx, param, value):
+            CustomLogging.set_log_format(value)
+
+        return click.option(*names, callback=_set_log_format, **kwargs)(f)
+
+    return decorator
@@ -0,0 +1,126 @@
+"""
+Index of subcommands registered by cli command modules.
+
+Command modules add subcommands to the groups defined in `main.py` through
+decorators, so a subcommand exists only after its module is imported. The index
+maps every (group path, subcommand name) to the module registering it, letting
+groups import a command module only when one of its subcommands is used.
+The index is built once by importing all command modules and is then stored in
+the artifact cache, keyed by the content of the cli modules.
+"""
+
+import os
+import importlib
+
+import click
+
+from calm.dsl.tools.artifact_cache import (
+    get_artifact_key,
+    get_files_digest,
+    load_artifact,
+    save_artifact,
+)
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+CLI_DIR = os.path.dirname(__file__)
+COMMAND_INDEX_ARTIFACT_NAME = "cli_command_index"
+
+# Modules registering subcommands, in order of registration
+COMMAND_MODULES = [
+    "calm.dsl.cli.bp_commands",
+    "calm.dsl.cli.app_commands",
+    "calm.dsl.cli.runbook_commands",
+    "calm.dsl.cli.library_tasks_commands",
+    "calm.dsl.cli.endpoint_commands",
+    "calm.dsl.cli.config_commands",
+    "calm.dsl.cli.account_commands",
+    "calm.dsl.cli.provider_commands",
+    "calm.dsl.cli.project_commands",
+    "calm.dsl.cli.secret_commands",
+    "calm.dsl.cli.cache_commands",
+    "calm.dsl.cli.completion_commands",
+    "calm.dsl.cli.init_command",
+    "calm.dsl.cli.marketplace_bp_commands",
+    "calm.dsl.cli.marketplace_item_commands",
+    "calm.dsl.cli.marketplace_runbook_commands",
+    "calm.dsl.cli.app_icon_commands",
+    "calm.dsl.cli.user_commands",
+    "calm.dsl.cli.group_commands",
+    "calm.dsl.cli.role_commands",
+    "calm.dsl.cli.directory_service_commands",
+    "calm.dsl.cli.acp_commands",
+    "calm.dsl.cli.task_commands",
+    "calm.dsl.cli.brownfield_commands",
+    "calm.dsl.cli.environment_commands",
+    "calm.dsl.cli.protection_policy_commands",
+    "calm.dsl.cli.vm_recovery_point_commands",
+    "calm.dsl.cli.scheduler_commands",
+    "calm.dsl.cli.network_group_commands",
+    "calm.dsl.cli.policy_commands",
+    "calm.dsl.cli.approval_commands",
+    "calm.dsl.cli.approval_request_commands",
+    "calm.dsl.cli.tunnel_commands",
+    "calm.dsl.cli.global_variable_commands",
+    "calm.dsl.cli.daemon_commands",
+]
+
+_COMMAND_INDEX = None
+
+
+def load_command_modules():
+    """imports all the command modules"""
+
+    for module_name in COMMAND_MODULES:
+        importlib.import_module(module_name)
+
+
+def build_command_index(root_group):
+    """
+    Imports all command modules and walks the command tree of root group
+    Returns:
+        (dict): group path to {subcommand name: command details} mapping
+    """
+
+    load_command_modules()
+
+    index = {}
+    groups = [((), root_group)]
+    while groups:
+        group_path, group = groups.pop(0)
+        group_index = index.setdefault(" ".join(group_path), {})
+        for cmd_name, cmd in group.commands.items():
+            group_index[cmd_name] = {
+                "module": getattr(cmd.callback, "__module__", None),
+                "help": cmd.help,
+                "short_help": cmd.short_help,
+                "hidden": cmd.hidden,
+                "deprecated": cmd.deprecated,
+            }
+            if isinstance(cmd, click.Group):
+                groups.append((group_path + (cmd_name,), cmd))
+
+    return index
+
+
+def get_command_index(root_group):
+    """returns command index from artifact cache, building it if required"""
+
+    global _COMMAND_INDEX
+    if _COMMAND_INDEX is not None:
+        return _COMMAND_INDEX
+
+    cli_files = [
+        os.path.join(CLI_DIR, file_name)
+        for file_name in os.listdir(CLI_DIR)
+        if file_name.endswith(".py")
+    ]
+    artifact_key = get_artifact_key(get_files_digest(cli_files))
+    _COMMAND_INDEX = load_artifact(COMMAND_INDEX_ARTIFACT_NAME, artifact_key)
+    if _COMMAND_INDEX is None:
+        LOG.debug("Building cli command index")
+        _COMMAND_INDEX = build_command_index(root_group)
+        save_artifact(COMMAND_INDEX_ARTIFACT_NAME, artifact_key, _COMMAND_INDEX)
+
+    return _COMMAND_INDEX
@@ -0,0 +1,377 @@
+"""
+Content-addressed cache of compiled DSL payloads (used by `calm compile bp(s)`).
+
+A payload is stored against a key derived from the path of the dsl file, the
+dsl version, the context (server, project, policy configs) and the version of
+local cache DB. Along with the payload, every local file read while compiling
+(the dsl file, local modules imported by it, scripts read by it) is stored with
+the digest of its content. A stored payload is used only if none of these files
+changed, else the dsl file is compiled again.
+
+Limitations:
+- Entities looked up on server while compiling (ex: project, accounts) are not
+  part of the key, so a payload can refer to entities deleted or recreated on
+  server since it was compiled. Stored payloads are used for COMPILE_CACHE_TTL
+  only and are invalidated by `calm update cache`.
+- Payloads compiled with secrets are never stored.
+"""
+
+import builtins
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import site
+import sys
+import threading
+import time
+
+from calm.dsl.config import get_context
+from calm.dsl.config.constants import CONFIG
+from calm.dsl.tools.artifact_cache import (
+    ARTIFACT_CACHE_DIR,
+    get_artifact_key,
+    load_artifact,
+    save_artifact,
+)
+from calm.dsl.tools.utils import make_file_dir
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+DSL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPILE_CACHE_DIR_NAME = "compile"
+COMPILE_CACHE_STATS_FILE_NAME = "compile_cache_stats"
+
+# Time (in seconds) for which a stored payload is used
+COMPILE_CACHE_TTL = 60 * 60
+
+# Payloads (without secrets) are readable only by the user
+COMPILE_CACHE_FILE_MODE = 0o600
+
+# Every lookup appends a character to stats file. Appends of concurrent
+# processes (ex: batch compile workers) do not overwrite each other.
+COMPILE_CACHE_STATS_CHARS = {"hits": "h", "misses": "m"}
+
+_RECORDING = threading.local()
+
+# Open functions are patched while any thread is recording
+_OPEN_PATCH_LOCK = threading.Lock()
+_OPEN_PATCH = {"count": 0, "originals": None}
+
+
+def _record_open(file, mode):
+    """records file opened for reading by the thread, if it is recording"""
+
+    files = getattr(_RECORDING, "files", None)
+    if files is None:
+        return
+
+    try:
+        if isinstance(file, int) or (mode and set(mode) & set("wax+")):
+            return
+        files.add(os.path.abspath(os.fsdecode(file)))
+
+    except Exception:
+        # Recording must never break the file being opened
+        pass
+
+
+def _get_recording_open(open_func):
+    @functools.wraps(open_func)
+    def recording_open(file, mode="r", *args, **kwargs):
+        _record_open(file, mode)
+        return open_func(file, mode, *args, **kwargs)
+
+    return recording_open
+
+
+@contextlib.contextmanager
+def record_opened_files():
+    """
+    records files opened for reading by the calling thread, while the context
+    is active. Yields the set of recorded files.
+    """
+
+    with _OPEN_PATCH_LOCK:
+        if not _OPEN_PATCH["count"]:
+            _OPEN_PATCH["originals"] = (builtins.open, io.open)
+            builtins.open = _get_recording_open(builtins.open)
+            io.open = _get_recording_open(io.open)
+        _OPEN_PATCH["count"] += 1
+
+    files = set()
+    _RECORDING.files = files
+    try:
+        yield files
+
+    finally:
+        _RECORDING.files = None
+        with _OPEN_PATCH_LOCK:
+            _OPEN_PATCH["count"] -= 1
+            if not _OPEN_PATCH["count"]:
+                builtins.open, io.open = _OPEN_PATCH["originals"]
+
+
+def _get_excluded_dirs():
+    """returns directories whose files are not dependencies of dsl files"""
+
+    dirs = {
+        sys.prefix,
+        sys.base_prefix,
+        sys.exec_prefix,
+        sys.base_exec_prefix,
+        DSL_DIR,
+        ARTIFACT_CACHE_DIR,
+        "/dev",
+        "/proc",
+        "/sys",
+    }
+    try:
+        dirs.add(site.getusersitepackages())
+    except Exception:
+        pass
+
+    return [os.path.join(os.path.abspath(_dir), "") for _dir in dirs if _dir]
+
+
+def _get_source_path(path):
+    """returns source file of cached bytecode files, else the path itself"""
+
+    if path.endswith(".pyc"):
+        try:
+            return importlib.util.source_from_cache(path)
+        except ValueError:
+            pass
+
+    return path
+
+
+def get_file_digest(path):
+    """returns sha256 digest of file content, None if file is not readable"""
+
+    try:
+        with open(path, "rb") as fd:
+            return hashlib.sha256(fd.read()).hexdigest()
+
+    except OSError:
+        return None
+
+
+def get_dependency_digests(paths):
+    """returns {file path: content digest} for local files among supplied paths"""
+
+    excluded_dirs = tuple(_get_excluded_dirs())
+
+    # Local cache DB is part of compile key
+    db_location = os.path.abspath(get_context().get_init_config()["DB"]["location"])
+    excluded_files = {db_location, db_location + "-wal", db_location + "-shm"}
+
+    digests = {}
+    for path in paths:
+        path = _get_source_path(path)
+        if path in digests or path in excluded_files or path.startswith(excluded_dirs):
+            continue
+
+        if os.path.isfile(path):
+            digests[path] = get_file_digest(path)
+
+    return digests
+
+
+def get_module_files():
+    """returns files of modules imported till now"""
+
+    files = set()
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, "__file__", None)
+        if module_file:
+            files.add(os.path.abspath(module_file))
+
+    return files
+
+
+def get_cache_db_version():
+    """returns value that changes whenever local cache DB is modified"""
+
+    ContextObj = get_context()
+    db_location = ContextObj.get_init_config()["DB"]["location"]
+
+    version = [db_location]
+    if os.path.exists(db_location):
+        stat = os.stat(db_location)
+        version.extend([stat.st_mtime_ns, stat.st_size])
+
+    # WAL file is created by every connection, only its size tells about changes
+    # not yet copied to the db file
+    wal_location = db_location + "-wal"
+    if os.path.exists(wal_location):
+        version.append(os.path.getsize(wal_location))
+
+    return version
+
+
+def get_compile_key(dsl_file, *extra_files):
+    """returns key for compiled payload of dsl file in current context"""
+
+    ContextObj = get_context()
+    server_config = ContextObj.get_server_config()
+    context_data = {
+        "server": [
+            server_config.get(CONFIG.SERVER.HOST),
+            server_config.get(CONFIG.SERVER.PORT),
+        ],
+        "project": ContextObj.get_project_config(),
+        "ncm_server": ContextObj.get_ncm_server_config(),
+        "policy": ContextObj.get_policy_config(),
+        "approval_policy": ContextObj.get_approval_policy_config(),
+        "stratos": ContextObj.get_stratos_config(),
+        "cloud_providers": ContextObj.get_cp_config(),
+    }
+
+    files = [os.path.abspath(_file) if _file else "" for _file in extra_files]
+    return get_artifact_key(
+        os.path.abspath(dsl_file),
+        *files,
+        json.dumps(context_data, sort_keys=True, default=str),
+        json.dumps(get_cache_db_version()),
+    )
+
+
+def _get_entry_name(key):
+    return os.path.join(COMPILE_CACHE_DIR_NAME, key)
+
+
+def _get_stats_file():
+    return os.path.join(ARTIFACT_CACHE_DIR, COMPILE_CACHE_STATS_FILE_NAME)
+
+
+def _update_stats(name):
+    """records a lookup (hits/misses) of compile cache"""
+
+    stats_file = _get_stats_file()
+    try:
+        make_file_dir(stats_file)
+        fd = os.open(stats_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o666)
+        try:
+            os.write(fd, COMPILE_CACHE_STATS_CHARS[name].encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    except OSError as exp:
+        LOG.debug("Unable to update compile cache stats: {}".format(exp))
+
+
+def load_payload(key):
+    """returns stored payload for key if it is not expired and its dependencies are unchanged"""
+
+    entry = load_artifact(_get_entry_name(key), key)
+    if not entry:
+        return None
+
+    if time.time() - entry.get("compile_time", 0) > COMPILE_CACHE_TTL:
+        LOG.debug("Compile cache entry expired")
+        return None
+
+    for path, digest in entry["dependencies"].items():
+        if get_file_digest(path) != digest:
+            LOG.debug("Compile cache entry outdated, '{}' changed".format(path))
+            return None
+
+    return entry["payload"]
+
+
+def save_payload(key, payload, dependencies):
+    """stores payload for key along with digests of its dependencies"""
+
+    save_artifact(
+        _get_entry_name(key),
+        key,
+        {"dependencies": dependencies, "payload": payload, "compile_time": time.time()},
+        mode=COMPILE_CACHE_FILE_MODE,
+    )
+
+
+def compile_with_cache(compile_func, dsl_file, *extra_files):
+    """
+    Returns payload of dsl file from compile cache, calling compile_func()
+    to compile it on a miss. Files compiled by compile_func and the extra files
+    (i.e. brownfield deployment file) are part of the key. Cache is not used if
+    secrets are compiled.
+    """
+
+    from calm.dsl.builtins.models.utils import is_compile_secrets
+
+    if is_compile_secrets():
+        LOG.debug("Compile cache is not used as secrets are compiled")
+        return compile_func()
+
+    key = get_compile_key(dsl_file, *extra_files)
+    payload = load_payload(key)
+    if payload is not None:
+        LOG.debug("Compile cache hit for '{}'".format(dsl_file))
+        _update_stats("hits")
+        return payload
+
+    LOG.debug("Compile cache miss for '{}'".format(dsl_file))
+    _update_stats("misses")
+    with record_opened_files() as opened_files:
+        payload = compile_func()
+
+    if payload is None:
+        return payload
+
+    files = opened_files | get_module_files()
+    files.add(os.path.abspath(dsl_file))
+    files.update(os.path.abspath(_file) for _file in extra_files if _file)
+
+    save_payload(key, payload, get_dependency_digests(files))
+    return payload
+
+
+def get_compile_cache_stats():
+    """returns hit and miss counts of compile cache"""
+
+    try:
+        with open(_get_stats_file()) as fd:
+            lookups = fd.read()
+
+    except OSError:
+        return {}
+
+    stats = {}
+    for name, char in COMPILE_CACHE_STATS_CHARS.items():
+        count = lookups.count(char)
+        if count:
+            stats[name] = count
+
+    return stats
+
+
+def get_compile_cache_dir():
+    return os.path.join(ARTIFACT_CACHE_DIR, COMPILE_CACHE_DIR_NAME)
+
+
+def get_compile_cache_size():
+    """returns count and total size(in bytes) of stored payloads"""
+
+    cache_dir = get_compile_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return 0, 0
+
+    entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)]
+    return len(entries), sum(os.path.getsize(entry) for entry in entries)
+
+
+def clear_compile_cache():
+    """removes stored payloads and stats"""
+
+    shutil.rmtree(get_compile_cache_dir(), ignore_errors=True)
+    try:
+        os.remove(_get_stats_file())
+    except FileNotFoundError:
+        pass
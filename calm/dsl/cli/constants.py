@@ -41,6 +41,61 @@ class RUNLOG:
         STATUS.SYS_ABORTED,
     ]
 
+    class POLL:
+        """Intervals (in seconds) between polls while watching executions"""
+
+        MIN_INTERVAL = 1
+        MAX_INTERVAL = 10
+        BACKOFF_FACTOR = 2
+
+    # Outputs of task runlogs fetched concurrently while watching an execution
+    OUTPUT_FETCH_WORKERS = 10
+
+
+class BULK:
+    """Bulk operations over many entities"""
+
+    # Operations triggered concurrently (connection pool holds 20 sessions)
+    MAX_WORKERS = 10
+
+    # Names resolved by a single filtered list call
+    NAMES_PER_LIST_CALL = 50
+
+    # Maximum time (in seconds) for which runlogs of bulk operations are watched
+    MAX_WATCH_TIME = 60 * 60
+
+    class STATES:
+        TRIGGERED = "TRIGGERED"
+        SKIPPED = "SKIPPED"
+        FAILED = "FAILED"
+        TIMEOUT = "TIMEOUT"
+
+
+class BATCH_COMPILE:
+    """Compilation (validation) of many dsl files on worker processes"""
+
+    MAX_WORKERS = 4
+
+    # Number of slowest files shown in timing report
+    SLOWEST_FILES_COUNT = 5
+
+    class KINDS:
+        BLUEPRINT = "bp"
+        RUNBOOK = "runbook"
+        PROVIDER_SPEC = "provider_spec"
+
+    # Files picked from directories passed for each kind
+    FILE_PATTERNS = {
+        KINDS.BLUEPRINT: ["*.py"],
+        KINDS.RUNBOOK: ["*.py"],
+        KINDS.PROVIDER_SPEC: ["*.yaml", "*.yml"],
+    }
+
+    class STATES:
+        SUCCESS = "SUCCESS"
+        NOT_FOUND = "NOT_FOUND"
+        FAILED = "FAILED"
+
 
 class JOBS:
     class STATES:
@@ -222,6 +277,55 @@ class MARKETPLACE_ITEM:
 
     WARN_MSG = "Projects associated with MPI should have accounts attached in blueprint for deployment"
 
+    # App groups fetched by a single groups call
+    GROUP_PAGE_SIZE = 64
+
+    # Seconds for which marketplace listings are reused within a command
+    LISTING_CACHE_TTL = 30
+
+    class GROUP_ATTRIBUTES:
+        """Member attributes requested by groups call on marketplace items"""
+
+        ALL = [
+            "name",
+            "type",
+            "author",
+            "version",
+            "categories",
+            "owner_reference",
+            "owner_username",
+            "project_names",
+            "project_uuids",
+            "app_state",
+            "description",
+            "spec_version",
+            "app_attribute_list",
+            "app_group_uuid",
+            "icon_list",
+            "change_log",
+            "app_source",
+        ]
+
+        # Attributes shown by list views
+        LIST = [
+            "name",
+            "type",
+            "author",
+            "version",
+            "categories",
+            "owner_username",
+            "project_names",
+            "app_state",
+            "description",
+            "app_group_uuid",
+            "app_source",
+        ]
+
+        NAME_VERSION = ["name", "version", "app_state"]
+
+        # Publishing a new version inherits projects and icon of latest version
+        LATEST_VERSION = NAME_VERSION + ["project_names", "icon_list"]
+
 
 class TASKS:
     class TASK_TYPES:
@@ -0,0 +1,130 @@
+import os
+import subprocess
+import sys
+import time
+
+import arrow
+import click
+from prettytable import PrettyTable
+
+from calm.dsl.constants import DAEMON
+from calm.dsl.daemon.client import get_daemon_status, stop_daemon
+from calm.dsl.daemon.protocol import get_socket_file
+from calm.dsl.log import get_logging_handle
+
+from .main import get
+from .app_commands import start, stop
+from .utils import highlight_text
+
+LOG = get_logging_handle(__name__)
+
+
+def socket_option(f):
+    return click.option(
+        "--socket",
+        "-s",
+        "socket_file",
+        default=None,
+        help="Path of daemon socket, defaults to {} or ${}".format(
+            DAEMON.SOCKET_FILE, DAEMON.SOCKET_ENV
+        ),
+    )(f)
+
+
+@start.command("daemon")
+@socket_option
+@click.option(
+    "--foreground",
+    "-f",
+    is_flag=True,
+    default=False,
+    help="Run daemon in current process",
+)
+def start_daemon(socket_file, foreground):
+    """Starts dsl daemon, that serves commands of `calmc` client without startup cost of cli"""
+
+    socket_file = socket_file or get_socket_file()
+    status = get_daemon_status(socket_file)
+    if status:
+        LOG.info("DSL daemon already running (pid {})".format(status["pid"]))
+        return
+
+    # Config file passed to cli is used by daemon too
+    config_file = click.get_current_context().find_root().params.get("config_file")
+
+    if foreground:
+        from calm.dsl.daemon.server import DslDaemon
+
+        DslDaemon(socket_file=socket_file, config_file=config_file).serve()
+        return
+
+    command = [sys.executable, "-c", "from calm.dsl.cli import main; main()"]
+    if config_file:
+        command.extend(["--config", config_file])
+    command.extend(["start", "daemon", "--foreground", "--socket", socket_file])
+
+    log_file = os.path.splitext(socket_file)[0] + ".log"
+    with open(log_file, "a") as log_fd:
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=log_fd,
+            stderr=log_fd,
+            start_new_session=True,
+        )
+
+    LOG.info("Starting dsl daemon (pid {})".format(process.pid))
+    end_time = time.time() + DAEMON.START_TIMEOUT
+    while time.time() < end_time:
+        if process.poll() is not None:
+            LOG.error("DSL daemon exited, check logs at {}".format(log_file))
+            sys.exit(-1)
+
+        if get_daemon_status(socket_file):
+            LOG.info("DSL daemon listening on {}".format(socket_file))
+            return
+
+        time.sleep(0.1)
+
+    LOG.error("DSL daemon not started, check logs at {}".format(log_file))
+    sys.exit(-1)
+
+
+@stop.command("daemon")
+@socket_option
+def _stop_daemon(socket_file):
+    """Stops dsl daemon"""
+
+    status = stop_daemon(socket_file)
+    if not status:
+        LOG.info("DSL daemon not running")
+        return
+
+    LOG.info(
+        "DSL daemon (pid {}) stopped after serving {} commands".format(
+            status["pid"], status["commands"]
+        )
+    )
+
+
+@get.command("daemon")
+@socket_option
+def get_daemon(socket_file):
+    """Get status of dsl daemon"""
+
+    status = get_daemon_status(socket_file)
+    if not status:
+        LOG.info("DSL daemon not running")
+        return
+
+    table = PrettyTable()
+    table.field_names = ["PID", "SOCKET", "STARTED", "COMMANDS SERVED"]
+    table.add_row(
+        [
+            highlight_text(status["pid"]),
+            highlight_text(status["socket"]),
+            highlight_text(arrow.get(status["start_time"]).humanize()),
+            highlight_text(status["commands"]),
+        ]
+    )
+    click.echo(table)
@@ -3,28 +3,31 @@ import click
 import json
 import copy
 import os
+import sys
 
 import click_completion
 import click_completion.core
-from click_repl import repl
 from prettytable import PrettyTable
 
 # TODO - move providers to separate file
-from calm.dsl.providers import get_provider, get_provider_types
 from calm.dsl.api import get_api_client, get_resource_api, reset_api_client_handle
 from calm.dsl.log import get_logging_handle
 from calm.dsl.config import get_context, get_config_handle
 from calm.dsl.config.env_config import EnvConfig
 from calm.dsl.store import Cache
 from calm.dsl.constants import DSL_CONFIG
-from calm.dsl.builtins.models.utils import set_compile_secrets_flag
 
 from .version_validator import validate_version
-from .click_options import simple_verbosity_option, show_trace_option
-from .utils import FeatureFlagGroup, highlight_text
+from .click_options import (
+    simple_verbosity_option,
+    show_trace_option,
+    log_format_option,
+)
+from .utils import FeatureFlagGroup, LazyChoice, highlight_text
+from .constants import TEST_SCRIPTS, BATCH_COMPILE
+from .batch_compile import get_spec_provider_type, batch_compile_command
 from calm.dsl.store import Version
 from calm.dsl.config.init_config import get_init_config_handle
-from calm.dsl.cli.run_script import *
 from calm.dsl.api.util import is_ncm_enabled
 
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
@@ -33,9 +36,18 @@ click_completion.init()
 LOG = get_logging_handle(__name__)
 
 
+def get_provider_types():
+    """returns provider types, importing provider plugins only when required"""
+
+    from calm.dsl.providers import get_provider_types
+
+    return get_provider_types()
+
+
 @click.group(cls=FeatureFlagGroup, context_settings=CONTEXT_SETTINGS)
 @simple_verbosity_option(LOG)
 @show_trace_option(LOG)
+@log_format_option(LOG)
 @click.option(
     "--config",
     "-c",
@@ -124,7 +136,10 @@ def main(ctx, config_file, sync):
         pass
 
     # This is added to ensure non compile commands has secrets in the dictionary.
-    set_compile_secrets_flag(True)
+    # Flag is True by default, so it needs to be reset only if builtins are already loaded
+    builtins_utils = sys.modules.get("calm.dsl.builtins.models.utils", None)
+    if builtins_utils:
+        builtins_utils.set_compile_secrets_flag(True)
 
     ContextObj = get_context()
     project_config = ContextObj.get_project_config()
@@ -156,7 +171,7 @@ def validate():
     "--type",
     "-t",
     "provider_type",
-    type=click.Choice(get_provider_types()),
+    type=LazyChoice(get_provider_types),
     default=None,
     help="Provider type",
 )
@@ -168,16 +183,7 @@ def validate_provider_spec(spec_file, provider_type):
 
     if provider_type == None:
         spec_type = spec.get("type", None)
-        recommended_type = "AHV_VM"
-
-        if spec_type == "PROVISION_AWS_VM":
-            recommended_type = "AWS_VM"
-        elif spec_type == "PROVISION_AZURE_VM":
-            recommended_type = "AZURE_VM"
-        elif spec_type == "PROVISION_GCP_VM":
-            recommended_type = "GCP_VM"
-        elif spec_type == "PROVISION_VMWARE_VM":
-            recommended_type = "VMWARE_VM"
+        recommended_type = get_spec_provider_type(spec)
 
         if spec_type == None:
             LOG.warning(
@@ -194,6 +200,8 @@ def validate_provider_spec(spec_file, provider_type):
         provider_type = recommended_type
 
     try:
+        from calm.dsl.providers import get_provider
+
         Provider = get_provider(provider_type)
         Provider.validate_spec(spec)
 
@@ -203,6 +211,45 @@ def validate_provider_spec(spec_file, provider_type):
         raise Exception(ee.message)
 
 
+@validate.command("provider_specs")
+@click.argument("paths", nargs=-1, required=True)
+@click.option(
+    "--out-file",
+    "-o",
+    "out_file",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="File to which results are written as json lines (stdout by default)",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    "max_workers",
+    type=int,
+    default=BATCH_COMPILE.MAX_WORKERS,
+    show_default=True,
+    help="Number of worker processes",
+)
+@click.option(
+    "--type",
+    "-t",
+    "provider_type",
+    type=LazyChoice(get_provider_types),
+    default=None,
+    help="Provider type (detected from every spec if not given)",
+)
+def validate_provider_specs(paths, out_file, max_workers, provider_type):
+    """validates provider specs of given files, directories or glob patterns in parallel"""
+
+    batch_compile_command(
+        BATCH_COMPILE.KINDS.PROVIDER_SPEC,
+        paths,
+        out_file=out_file,
+        max_workers=max_workers,
+        provider_type=provider_type,
+    )
+
+
 @main.group(cls=FeatureFlagGroup)
 def get():
     """Get various things like blueprints, apps: `get apps`, `get bps`, `get endpoints` and `get runbooks` are the primary ones."""
@@ -390,6 +437,8 @@ def format():
 def compile():
     """Compile blueprint to json / yaml"""
 
+    from calm.dsl.builtins.models.utils import set_compile_secrets_flag
+
     # Setting this to make sure during compile secrets are not printed
     set_compile_secrets_flag(EnvConfig.is_compile_secret())
 
@@ -506,13 +555,15 @@ def reset():
     "--type",
     "provider_type",
     "-t",
-    type=click.Choice(get_provider_types()),
+    type=LazyChoice(get_provider_types),
     default="AHV_VM",
     help="Provider type",
 )
 def create_provider_spec(provider_type):
     """Creates a provider_spec"""
 
+    from calm.dsl.providers import get_provider
+
     Provider = get_provider(provider_type)
     Provider.create_spec()
 
@@ -564,6 +615,9 @@ def calmrepl():
       :exit, :q, :quit  exits the repl
 
       :?, :h, :help     displays general help information"""
+
+    from click_repl import repl
+
     repl(click.get_current_context())
 
 
@@ -579,31 +633,31 @@ def calm_import():
     pass
 
 
-@get.group("library")
+@get.group("library", cls=FeatureFlagGroup)
 def library_get():
     """Get Library entities"""
     pass
 
 
-@create.group("library")
+@create.group("library", cls=FeatureFlagGroup)
 def library_create():
     """Create Library entities"""
     pass
 
 
-@calm_import.group("library")
+@calm_import.group("library", cls=FeatureFlagGroup)
 def library_import():
     """Import Library entities"""
     pass
 
 
-@describe.group("library")
+@describe.group("library", cls=FeatureFlagGroup)
 def library_describe():
     """Describe Library entities"""
     pass
 
 
-@delete.group("library")
+@delete.group("library", cls=FeatureFlagGroup)
 def library_delete():
     """Delete Library entities"""
     pass
@@ -626,7 +680,7 @@ def verify():
     "--type",
     "-t",
     "script_type",
-    type=click.Choice(test_scripts_type()),
+    type=click.Choice(TEST_SCRIPTS.TYPE),
     default="escript",
     help="Type of script that need to be tested.",
 )
@@ -667,6 +721,13 @@ def run_script(script_type, script_file, project_name, endpoint_file, tunnel_nam
         )
         sys.exit("Tunnel option is only applicable for escript scripts.")
 
+    from .run_script import (
+        test_escript,
+        test_shell_script,
+        test_powershell_script,
+        test_python_script,
+    )
+
     if script_type == "escript":
         test_escript(script_file, project_name, tunnel_name=tunnel_name)
 
@@ -680,7 +741,7 @@ def run_script(script_type, script_file, project_name, endpoint_file, tunnel_nam
         test_python_script(script_file, endpoint_file, project_name)
 
     else:
-        LOG.error("Invalid script type {}. Use one of {}".format(test_scripts_type()))
+        LOG.error("Invalid script type {}. Use one of {}".format(TEST_SCRIPTS.TYPE))
         sys.exit(-1)
 
 
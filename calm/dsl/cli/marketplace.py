@@ -5,6 +5,8 @@ import json
 import os
 import time
 
+from copy import deepcopy
+
 from prettytable import PrettyTable
 from distutils.version import LooseVersion as LV
 
@@ -92,7 +94,29 @@ def trunc_string(data=None, max_length=50):
     return data
 
 
-def get_mpis_group_call(
+# Marketplace listings fetched by this command, {key: (fetch time, data)}.
+# Cleared whenever this command creates, updates or deletes a marketplace item.
+_MPI_LISTING_CACHE = {}
+
+
+def _get_cached_listing(key):
+    entry = _MPI_LISTING_CACHE.get(key)
+    if entry and time.monotonic() - entry[0] < MARKETPLACE_ITEM.LISTING_CACHE_TTL:
+        # Callers modify returned data
+        return deepcopy(entry[1])
+
+    return None
+
+
+def _set_cached_listing(key, data):
+    _MPI_LISTING_CACHE[key] = (time.monotonic(), deepcopy(data))
+
+
+def clear_mpi_listing_cache():
+    _MPI_LISTING_CACHE.clear()
+
+
+def get_mpis_group_payload(
     name=None,
     app_family="All",
     app_states=[],
@@ -101,13 +125,13 @@ def get_mpis_group_call(
     app_group_uuid=None,
     type=None,
     filter_by="",
+    attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.ALL,
 ):
     """
-    To call groups() api for marketplace items
+    Returns payload of groups() api for marketplace items
     if group_member_count is 0, it will not apply the group_count filter
     """
 
-    client = get_api_client()
     filter = "marketplace_item_type_list==APP"
 
     if app_states:
@@ -136,41 +160,97 @@ def get_mpis_group_call(
         "group_member_sort_attribute": "version",
         "group_member_sort_order": "DESCENDING",
         "grouping_attribute": "app_group_uuid",
-        "group_count": 64,
+        "group_count": MARKETPLACE_ITEM.GROUP_PAGE_SIZE,
         "group_offset": 0,
         "filter_criteria": filter,
         "entity_type": "marketplace_item",
         "group_member_attributes": [
-            {"attribute": "name"},
-            {"attribute": "type"},
-            {"attribute": "author"},
-            {"attribute": "version"},
-            {"attribute": "categories"},
-            {"attribute": "owner_reference"},
-            {"attribute": "owner_username"},
-            {"attribute": "project_names"},
-            {"attribute": "project_uuids"},
-            {"attribute": "app_state"},
-            {"attribute": "description"},
-            {"attribute": "spec_version"},
-            {"attribute": "app_attribute_list"},
-            {"attribute": "app_group_uuid"},
-            {"attribute": "icon_list"},
-            {"attribute": "change_log"},
-            {"attribute": "app_source"},
+            {"attribute": attribute} for attribute in attributes
         ],
     }
 
     if group_member_count:
         payload["group_member_count"] = group_member_count
 
-    res, err = client.groups.create(payload=payload)
+    return payload
 
-    if err:
-        LOG.error("[{}] - {}".format(err["code"], err["error"]))
-        sys.exit(-1)
 
-    res = res.json()
+def iter_mpis_group_pages(payload):
+    """yields response of groups() api for every page of app groups"""
+
+    client = get_api_client()
+    page_payload = dict(payload)
+    page_size = page_payload["group_count"]
+    while True:
+        res, err = client.groups.create(payload=page_payload)
+        if err:
+            LOG.error("[{}] - {}".format(err["code"], err["error"]))
+            sys.exit(-1)
+
+        res = res.json()
+        yield res
+
+        group_count = len(res.get("group_results", None) or [])
+        page_payload["group_offset"] += group_count
+        total_count = res.get("filtered_group_count", None)
+        if group_count < page_size or (
+            total_count is not None and page_payload["group_offset"] >= total_count
+        ):
+            break
+
+
+def iter_mpis_groups(**kwargs):
+    """yields app groups of marketplace items, fetching them page by page"""
+
+    for res in iter_mpis_group_pages(get_mpis_group_payload(**kwargs)):
+        for group in res.get("group_results", None) or []:
+            yield group
+
+
+def get_mpis_group_call(
+    name=None,
+    app_family="All",
+    app_states=[],
+    group_member_count=0,
+    app_source=None,
+    app_group_uuid=None,
+    type=None,
+    filter_by="",
+    attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.ALL,
+):
+    """
+    To call groups() api for marketplace items, returns response of first page
+    having app groups of all pages. Responses are reused within LISTING_CACHE_TTL.
+    if group_member_count is 0, it will not apply the group_count filter
+    """
+
+    payload = get_mpis_group_payload(
+        name=name,
+        app_family=app_family,
+        app_states=app_states,
+        group_member_count=group_member_count,
+        app_source=app_source,
+        app_group_uuid=app_group_uuid,
+        type=type,
+        filter_by=filter_by,
+        attributes=attributes,
+    )
+    cache_key = json.dumps(payload, sort_keys=True)
+    res = _get_cached_listing(cache_key)
+    if res is not None:
+        LOG.debug(
+            "Using cached marketplace groups for {}".format(payload["filter_criteria"])
+        )
+        return res
+
+    res = None
+    for page in iter_mpis_group_pages(payload):
+        if res is None:
+            res = page
+        else:
+            res["group_results"].extend(page.get("group_results", None) or [])
+
+    _set_cached_listing(cache_key, res)
     return res
 
 
@@ -183,7 +263,7 @@ def get_marketplace_store_items(
     if not display_all:
         group_member_count = 1
 
-    res = get_mpis_group_call(
+    group_kwargs = dict(
         name=name,
         app_family=app_family,
         app_states=[MARKETPLACE_ITEM.STATES.PUBLISHED],
@@ -191,15 +271,20 @@ def get_marketplace_store_items(
         filter_by=filter_by,
         type=type,
     )
-    group_results = res["group_results"]
 
     if quiet:
-        for group in group_results:
+        for group in iter_mpis_groups(
+            attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.NAME_VERSION, **group_kwargs
+        ):
             entity_results = group["entity_results"]
             entity_data = entity_results[0]["data"]
             click.echo(highlight_text(get_group_data_value(entity_data, "name")))
         return
 
+    group_results = iter_mpis_groups(
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.LIST, **group_kwargs
+    )
+
     table = PrettyTable()
     field_names = ["NAME", "TYPE", "DESCRIPTION", "AUTHOR", "APP_SOURCE"]
     if display_all:
@@ -252,22 +337,27 @@ def get_marketplace_items(
 ):
     """List all the marketlace items listed in the manager"""
 
-    res = get_mpis_group_call(
+    group_kwargs = dict(
         name=name,
         app_family=app_family,
         app_states=app_states,
         filter_by=filter_by,
         type=type,
     )
-    group_results = res["group_results"]
 
     if quiet:
-        for group in group_results:
+        for group in iter_mpis_groups(
+            attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.NAME_VERSION, **group_kwargs
+        ):
             entity_results = group["entity_results"]
             entity_data = entity_results[0]["data"]
             click.echo(highlight_text(get_group_data_value(entity_data, "name")))
         return
 
+    group_results = iter_mpis_groups(
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.LIST, **group_kwargs
+    )
+
     table = PrettyTable()
     field_names = [
         "NAME",
@@ -335,6 +425,7 @@ def get_mpi_latest_version(name, app_source=None, app_states=[], type=None):
         group_member_count=1,
         app_source=app_source,
         type=type,
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.NAME_VERSION,
     )
     group_results = res["group_results"]
 
@@ -356,6 +447,7 @@ def get_mpi_all_versions(name, app_source=None, app_states=[], type=None):
         group_member_count=20,
         app_source=app_source,
         type=type,
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.NAME_VERSION,
     )
     group_results = res["group_results"]
 
@@ -389,6 +481,12 @@ def get_mpi_by_name_n_version(name, version, app_states=[], app_source=None, typ
     if type and LV(CALM_VERSION) >= LV("3.2.0"):
         filter += ";type=={}".format(type)
 
+    cache_key = "mpi:" + filter
+    res = _get_cached_listing(cache_key)
+    if res is not None:
+        LOG.debug("Using cached marketplace item for {}".format(filter))
+        return res
+
     payload = {"length": 250, "filter": filter}
 
     LOG.debug("Calling list api on marketplace_items")
@@ -414,6 +512,7 @@ def get_mpi_by_name_n_version(name, version, app_states=[], app_source=None, typ
         sys.exit(-1)
 
     res = res.json()
+    _set_cached_listing(cache_key, res)
     return res
 
 
@@ -961,6 +1060,7 @@ def publish_bp_to_marketplace_manager(
         LOG.warning(MARKETPLACE_ITEM.WARN_MSG)
 
     res, err = client.market_place.create(bp_template)
+    clear_mpi_listing_cache()
     LOG.debug("Api response: {}".format(res.json()))
     if err:
         LOG.error("[{}] - {}".format(err["code"], err["error"]))
@@ -996,6 +1096,7 @@ def publish_bp_as_new_marketplace_bp(
         group_member_count=1,
         app_source=MARKETPLACE_ITEM.SOURCES.LOCAL,
         type=MARKETPLACE_ITEM.TYPES.BLUEPRINT,
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.NAME_VERSION,
     )
     group_count = res["filtered_group_count"]
 
@@ -1068,6 +1169,7 @@ def publish_bp_as_existing_marketplace_bp(
         group_member_count=1,
         app_source=MARKETPLACE_ITEM.SOURCES.LOCAL,
         type=MARKETPLACE_ITEM.TYPES.BLUEPRINT,
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.NAME_VERSION,
     )
     group_results = res["group_results"]
     if not group_results:
@@ -1093,6 +1195,7 @@ def publish_bp_as_existing_marketplace_bp(
             MARKETPLACE_ITEM.STATES.PUBLISHED,
             MARKETPLACE_ITEM.STATES.PENDING,
         ],
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.LATEST_VERSION,
     )
 
     group_results = res["group_results"]
@@ -1266,6 +1369,7 @@ def approve_marketplace_item(
         LOG.warning(MARKETPLACE_ITEM.WARN_MSG)
 
     res, err = client.market_place.update(uuid=item_uuid, payload=item_data)
+    clear_mpi_listing_cache()
     if err:
         LOG.error("[{}] - {}".format(err["code"], err["error"]))
         sys.exit(-1)
@@ -1381,6 +1485,7 @@ def publish_marketplace_item(
     item_data["spec"]["resources"].pop("global_variable_list", None)
 
     res, err = client.market_place.update(uuid=item_uuid, payload=item_data)
+    clear_mpi_listing_cache()
     if err:
         LOG.error("[{}] - {}".format(err["code"], err["error"]))
         sys.exit(-1)
@@ -1475,6 +1580,7 @@ def update_marketplace_item(
         LOG.warning(MARKETPLACE_ITEM.WARN_MSG)
 
     res, err = client.market_place.update(uuid=item_uuid, payload=item_data)
+    clear_mpi_listing_cache()
     if err:
         LOG.error("[{}] - {}".format(err["code"], err["error"]))
         sys.exit(-1)
@@ -1525,6 +1631,7 @@ def delete_marketplace_item(
     item_uuid = mpi_data["metadata"]["uuid"]
 
     res, err = client.market_place.delete(item_uuid)
+    clear_mpi_listing_cache()
     LOG.debug("Api response: {}".format(res.json()))
     if err:
         LOG.error("[{}] - {}".format(err["code"], err["error"]))
@@ -1576,6 +1683,7 @@ def reject_marketplace_item(name, version, type=None):
     item_data["spec"]["resources"].pop("global_variable_list", None)
 
     res, err = client.market_place.update(uuid=item_uuid, payload=item_data)
+    clear_mpi_listing_cache()
     if err:
         LOG.error("[{}] - {}".format(err["code"], err["error"]))
         sys.exit(-1)
@@ -1682,6 +1790,7 @@ def unpublish_marketplace_item(
         item_data["spec"]["resources"].pop("global_variable_list", None)
 
         res, err = client.market_place.update(uuid=item_uuid, payload=item_data)
+        clear_mpi_listing_cache()
         if err:
             LOG.error("[{}] - {}".format(err["code"], err["error"]))
             sys.exit(-1)
@@ -1837,6 +1946,7 @@ def publish_runbook_to_marketplace_manager(
             )
 
     res, err = client.market_place.create(mpi_spec)
+    clear_mpi_listing_cache()
     LOG.debug("Api response: {}".format(res.json()))
     if err:
         LOG.error("[{}] - {}".format(err["code"], err["error"]))
@@ -1871,6 +1981,7 @@ def publish_runbook_as_new_marketplace_item(
         name=marketplace_item_name,
         group_member_count=1,
         app_source=MARKETPLACE_ITEM.SOURCES.LOCAL,
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.NAME_VERSION,
     )
     group_count = res["filtered_group_count"]
 
@@ -1942,6 +2053,7 @@ def publish_runbook_as_existing_marketplace_item(
         name=marketplace_item_name,
         group_member_count=1,
         app_source=MARKETPLACE_ITEM.SOURCES.LOCAL,
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.NAME_VERSION,
     )
     group_results = res["group_results"]
     if not group_results:
@@ -1969,6 +2081,7 @@ def publish_runbook_as_existing_marketplace_item(
             MARKETPLACE_ITEM.STATES.PUBLISHED,
             MARKETPLACE_ITEM.STATES.PENDING,
         ],
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.LATEST_VERSION,
     )
 
     group_results = res["group_results"]
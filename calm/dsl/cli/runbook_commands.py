@@ -37,6 +37,8 @@ from .runbooks import (
 )
 
 from .runbook_utils import validate_execution_name
+from .batch_compile import batch_compile_command
+from .constants import BATCH_COMPILE
 
 LOG = get_logging_handle(__name__)
 
@@ -196,6 +198,33 @@ def _compile_runbook_command(runbook_file, out):
     compile_runbook_command(runbook_file, out)
 
 
+@compile.command("runbooks", feature_min_version="3.0.0", experimental=True)
+@click.argument("paths", nargs=-1, required=True)
+@click.option(
+    "--out-file",
+    "-o",
+    "out_file",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="File to which results are written as json lines (stdout by default)",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    "max_workers",
+    type=int,
+    default=BATCH_COMPILE.MAX_WORKERS,
+    show_default=True,
+    help="Number of worker processes",
+)
+def _compile_runbooks_command(paths, out_file, max_workers):
+    """Compiles DSL (Python) runbooks of given files, directories or glob patterns in parallel"""
+
+    batch_compile_command(
+        BATCH_COMPILE.KINDS.RUNBOOK, paths, out_file=out_file, max_workers=max_workers
+    )
+
+
 @decompile.command("runbook", experimental=True)
 @click.argument("name", required=False)
 @click.option(
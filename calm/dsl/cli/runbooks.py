@@ -22,6 +22,8 @@ from calm.dsl.decompile.file_handler import get_runbook_dir
 from calm.dsl.decompile.main import init_decompile_context
 from calm.dsl.runbooks import runbook, create_runbook_payload, RunbookType
 from calm.dsl.builtins.models.metadata_payload import get_metadata_payload
+from calm.dsl.builtins.models.parse_cache import report_parse_time
+from calm.dsl.api.response_memo import memoize_responses
 from calm.dsl.config import get_context
 from calm.dsl.api import get_api_client
 from calm.dsl.log import get_logging_handle
@@ -41,6 +43,7 @@ from .utils import (
 )
 from .constants import RUNBOOK, RUNLOG
 from .runlog import get_completion_func, get_runlog_status
+from .runlog_watcher import watch_execution
 from .endpoints import get_endpoint
 from .global_variable import fetch_dynamic_global_variable_values
 
@@ -150,6 +153,13 @@ def get_runbook_class_from_module(user_runbook_module):
 
 def compile_runbook(runbook_file):
 
+    # Entities looked up by runbook are read only once while compiling it
+    with report_parse_time(runbook_file), memoize_responses():
+        return _compile_runbook(runbook_file)
+
+
+def _compile_runbook(runbook_file):
+
     # Note: Metadata should be constructed before loading runbook module. As metadata
     # will be used while verifying vm reference in endpoint used withing runbook.
     metadata_payload = get_metadata_payload(runbook_file)
@@ -1170,23 +1180,13 @@ def abort_runbook_execution(runlog_uuid, poll_fn=None, abort_fn=None, link=None)
 
 
 def poll_action(poll_func, completion_func, poll_interval=10, **kwargs):
-    # Poll every 10 seconds on the runlog status, for 10 mins
+    # Poll on the runlog status for 10 mins, backing off upto poll_interval seconds
     maxWait = 10 * 60
-    count = 0
-    while count < maxWait:
-        # call status api
-        res, err = poll_func()
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-        response = res.json()
-        (completed, msg) = completion_func(response, **kwargs)
-        if completed:
-            # click.echo(msg)
-            if msg:
-                return False
-            break
-        count += poll_interval
-        time.sleep(poll_interval)
+    completed, msg = watch_execution(
+        poll_func, completion_func, maxWait, poll_interval, **kwargs
+    )
+    if completed and msg:
+        return False
     return True
 
 
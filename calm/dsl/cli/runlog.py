@@ -24,6 +24,7 @@ from anytree import NodeMixin, RenderTree
 import datetime
 
 from .constants import RUNLOG, SINGLE_INPUT
+from .runlog_watcher import RunlogOutputCache
 from calm.dsl.api import get_api_client
 
 
@@ -342,6 +343,18 @@ def displayRunLog(screen, obj, pre, fill, line):
 
 
 def get_completion_func(screen, rerun_on_failure=True, output_function=None):
+
+    # Outputs of completed tasks are fetched once per watch
+    output_cache = RunlogOutputCache()
+
+    # Nodes of runlog tree (uuid: node), updated on every poll
+    runlog_tree = {"root": None, "nodes": {}}
+
+    def reset_runlog_tree():
+        output_cache.clear()
+        runlog_tree["root"] = None
+        runlog_tree["nodes"] = {}
+
     def is_action_complete(
         response,
         task_type_map=[],
@@ -371,27 +384,40 @@ def get_completion_func(screen, rerun_on_failure=True, output_function=None):
                 entities, key=lambda x: int(x["metadata"]["creation_time"])
             )
 
-            # Create nodes of runlog tree and a map based on uuid
-            root = None
-            nodes = {}
-            runlog_map = {}
-            for runlog in sorted_entities:
-                # Create root node
-                # TODO - Get details of root node
-                if not root:
-                    root_uuid = runlog["status"]["root_reference"]["uuid"]
-                    root_runlog = {
+            output_fn = output_function or client.runbook.runlog_output
+
+            def fetch_output(task_runlog_uuid):
+                res, err = output_fn(runlog_uuid, task_runlog_uuid)
+                if err:
+                    raise Exception("\n[{}] - {}".format(err["code"], err["error"]))
+                runlog_output = res.json()
+                output_list = runlog_output["status"]["output_list"]
+                if len(output_list) > 0:
+                    return output_list[0]["output"]
+                return None
+
+            # Create (or update) nodes of runlog tree and a map based on uuid
+            # TODO - Get details of root node
+            root_uuid = sorted_entities[0]["status"]["root_reference"]["uuid"]
+            root = runlog_tree["root"]
+            if root is None or root.runlog["metadata"]["uuid"] != root_uuid:
+                root = RunlogNode(
+                    {
                         "metadata": {"uuid": root_uuid},
                         "status": {"type": "action_runlog", "state": ""},
                     }
-                    runlog_map[str(root_uuid)] = root_runlog
-                    root = RunlogNode(root_runlog)
-                    nodes[str(root_uuid)] = root
+                )
+                runlog_tree["root"] = root
+                runlog_tree["nodes"] = {str(root_uuid): root}
 
+            prev_nodes = runlog_tree["nodes"]
+            nodes = {str(root_uuid): root}
+            runlog_map = {str(root_uuid): root.runlog}
+            output_runlogs = []
+            for runlog in sorted_entities:
                 uuid = runlog["metadata"]["uuid"]
                 runlog_map[str(uuid)] = runlog
                 reasons = runlog["status"].get("reason_list", [])
-                outputs = []
                 machine_name = runlog["status"].get("machine_name", None)
                 machine = parse_machine_name(runlog_uuid, machine_name)
                 if machine and len(machine) == 1:
@@ -415,25 +441,30 @@ def get_completion_func(screen, rerun_on_failure=True, output_function=None):
                         and task_type_map[task_id]
                         not in ["INPUT", "CONFIRM", "WHILE_LOOP"]
                     ):
-                        output_fn = output_function or client.runbook.runlog_output
-                        res, err = output_fn(runlog_uuid, uuid)
-                        if err:
-                            raise Exception(
-                                "\n[{}] - {}".format(err["code"], err["error"])
-                            )
-                        runlog_output = res.json()
-                        output_list = runlog_output["status"]["output_list"]
-                        if len(output_list) > 0:
-                            outputs.append(output_list[0]["output"])
-
-                nodes[str(uuid)] = RunlogNode(
-                    runlog,
-                    parent=root,
-                    outputs=outputs,
-                    machine=machine,
-                    reasons=reasons,
+                        output_runlogs.append(runlog)
+
+                node = prev_nodes.get(str(uuid), None)
+                if node is None:
+                    node = RunlogNode(runlog, parent=root)
+                node.runlog = runlog
+                node.machine = machine
+                node.reasons = reasons or []
+                nodes[str(uuid)] = node
+
+            # Outputs of tasks not yet in terminal state are fetched concurrently
+            outputs = output_cache.get_outputs(output_runlogs, fetch_output)
+            for runlog in output_runlogs:
+                output = outputs[runlog["metadata"]["uuid"]]
+                nodes[str(runlog["metadata"]["uuid"])].outputs = (
+                    [output] if output is not None else []
                 )
 
+            # Detach nodes of runlogs not present anymore
+            for uuid, node in prev_nodes.items():
+                if uuid not in nodes:
+                    node.parent = None
+            runlog_tree["nodes"] = nodes
+
             # Attach parent to nodes
             for runlog in sorted_entities:
                 uuid = runlog["metadata"]["uuid"]
@@ -591,6 +622,7 @@ def get_completion_func(screen, rerun_on_failure=True, output_function=None):
                             screen.play([Scene([RerunFrame(state, screen)], -1)])
                             if rerun.get("rerun", False):
                                 client.runbook.rerun(runlog_uuid)
+                                reset_runlog_tree()
                                 msg = "Triggered rerun for the Runbook Runlog"
                                 displayRunLogTree(
                                     screen, root, completed_tasks, total_tasks, msg=msg
@@ -0,0 +1,195 @@
+"""
+Watcher for executions (app actions, runbook runs, blueprint launches).
+
+Every watched execution is polled by a status call until its completion
+function reports completion or its wait time is over. Poll interval starts at
+RUNLOG.POLL.MIN_INTERVAL and backs off upto the max interval of the watch while
+the status response does not change, so short executions are reported as soon
+as they finish and long ones are not polled more often than required.
+Multiple executions can be watched from one process using `RunlogWatcher`.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from calm.dsl.log import get_logging_handle
+from .constants import RUNLOG
+
+LOG = get_logging_handle(__name__)
+
+
+def get_response_fingerprint(response):
+    """returns value that changes whenever the status response changes"""
+
+    entities = response.get("entities", None) if isinstance(response, dict) else None
+    if isinstance(entities, list):
+        return tuple(
+            (
+                entity.get("metadata", {}).get("uuid"),
+                entity.get("status", {}).get("state"),
+                entity.get("metadata", {}).get("last_update_time"),
+            )
+            for entity in entities
+        )
+
+    return json.dumps(response, sort_keys=True)
+
+
+class RunlogWatch:
+    """Polls one execution until it completes or max_wait(in seconds) is over"""
+
+    def __init__(
+        self,
+        poll_func,
+        completion_func,
+        max_wait,
+        max_poll_interval=RUNLOG.POLL.MAX_INTERVAL,
+        **completion_kwargs,
+    ):
+        self.poll_func = poll_func
+        self.completion_func = completion_func
+        self.completion_kwargs = completion_kwargs
+        self.max_poll_interval = max_poll_interval
+        self.poll_interval = min(RUNLOG.POLL.MIN_INTERVAL, max_poll_interval)
+
+        self.deadline = time.monotonic() + max_wait
+        self.next_poll_time = time.monotonic()
+        self.fingerprint = None
+
+        self.completed = False
+        self.msg = ""
+
+    @property
+    def is_done(self):
+        return self.completed or self.next_poll_time > self.deadline
+
+    def poll(self):
+        """polls the status once and schedules the next poll"""
+
+        res, err = self.poll_func()
+        if err:
+            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+        response = res.json()
+        (self.completed, self.msg) = self.completion_func(
+            response, **self.completion_kwargs
+        )
+
+        # Poll again soon after a change, back off while nothing changes
+        fingerprint = get_response_fingerprint(response)
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.poll_interval = min(RUNLOG.POLL.MIN_INTERVAL, self.max_poll_interval)
+        else:
+            self.poll_interval = min(
+                self.poll_interval * RUNLOG.POLL.BACKOFF_FACTOR,
+                self.max_poll_interval,
+            )
+
+        self.next_poll_time = time.monotonic() + self.poll_interval
+        return self.completed
+
+
+class RunlogWatcher:
+    """Polls multiple executions from one thread, each as per its own schedule"""
+
+    def __init__(self, watches=None):
+        self.watches = list(watches or [])
+
+    def add_watch(self, watch):
+        self.watches.append(watch)
+        return watch
+
+    def run(self):
+        """polls the watches until all of them are done"""
+
+        pending_watches = [watch for watch in self.watches if not watch.is_done]
+        while pending_watches:
+            watch = min(pending_watches, key=lambda w: w.next_poll_time)
+            wait_time = watch.next_poll_time - time.monotonic()
+            if wait_time > 0:
+                time.sleep(wait_time)
+
+            watch.poll()
+            pending_watches = [w for w in pending_watches if not w.is_done]
+
+        return self.watches
+
+
+def watch_execution(poll_func, completion_func, max_wait, max_poll_interval, **kwargs):
+    """
+    Polls single execution until completion or max_wait is over
+    Returns:
+        (tuple (bool, str)): completion status and message of last poll
+    """
+
+    watch = RunlogWatch(
+        poll_func, completion_func, max_wait, max_poll_interval, **kwargs
+    )
+    RunlogWatcher([watch]).run()
+    return watch.completed, watch.msg
+
+
+class RunlogOutputCache:
+    """
+    Output of task runlogs fetched while watching an execution. Output of a
+    runlog in terminal state does not change, so it is fetched only once.
+    """
+
+    def __init__(self):
+        self._outputs = {}
+
+    def get_output(self, runlog, fetch_func):
+        """returns output of runlog, fetch_func(runlog_uuid) is called on miss"""
+
+        runlog_uuid = runlog["metadata"]["uuid"]
+        if runlog_uuid in self._outputs:
+            return self._outputs[runlog_uuid]
+
+        output = fetch_func(runlog_uuid)
+        if runlog["status"].get("state") in RUNLOG.TERMINAL_STATES:
+            self._outputs[runlog_uuid] = output
+
+        return output
+
+    def get_outputs(self, runlogs, fetch_func, max_workers=RUNLOG.OUTPUT_FETCH_WORKERS):
+        """
+        Returns outputs of runlogs (uuid: output). Outputs not cached are fetched
+        concurrently, so requests of a poll scale with runlogs not in terminal state.
+        """
+
+        outputs = {}
+        missing_runlogs = []
+        for runlog in runlogs:
+            runlog_uuid = runlog["metadata"]["uuid"]
+            if runlog_uuid in self._outputs:
+                outputs[runlog_uuid] = self._outputs[runlog_uuid]
+            else:
+                missing_runlogs.append(runlog)
+
+        if len(missing_runlogs) > 1 and max_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(missing_runlogs))
+            ) as executor:
+                fetched_outputs = list(
+                    executor.map(
+                        lambda runlog: fetch_func(runlog["metadata"]["uuid"]),
+                        missing_runlogs,
+                    )
+                )
+        else:
+            fetched_outputs = [
+                fetch_func(runlog["metadata"]["uuid"]) for runlog in missing_runlogs
+            ]
+
+        for runlog, output in zip(missing_runlogs, fetched_outputs):
+            runlog_uuid = runlog["metadata"]["uuid"]
+            outputs[runlog_uuid] = output
+            if runlog["status"].get("state") in RUNLOG.TERMINAL_STATES:
+                self._outputs[runlog_uuid] = output
+
+        return outputs
+
+    def clear(self):
+        self._outputs.clear()
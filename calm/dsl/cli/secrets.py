@@ -89,6 +89,12 @@ def find_secret(name, pass_phrase=""):
     return secret_val
 
 
+def find_secrets(names, pass_phrase=""):
+    """Gives you the values stored correponding to secrets present in db"""
+
+    return Secret.find_many(names, pass_phrase)
+
+
 def get_secrets_names():
     """To find the names stored in db"""
 
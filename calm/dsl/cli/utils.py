@@ -1,7 +1,9 @@
+import io
 import uuid
 import click
 import sys
-import os
+import importlib
+import time
 from functools import reduce
 from asciimatics.screen import Screen
 from click_didyoumean import DYMMixin
@@ -75,11 +77,26 @@ def import_var_from_file(file, var, default_value=None):
 class Display:
     @classmethod
     def wrapper(cls, func, watch=False):
-        if watch and os.isatty(sys.stdout.fileno()):
+        if watch and cls.is_terminal(sys.stdout):
             Screen.wrapper(func, height=1000)
         else:
             func(display)
 
+    @staticmethod
+    def is_terminal(stream):
+        """checks if screen can be drawn on the terminal of given stream"""
+
+        if not stream.isatty():
+            return False
+
+        # Streams forwarded to a client (ex: by dsl daemon) have no file descriptor
+        try:
+            stream.fileno()
+        except (io.UnsupportedOperation, OSError):
+            return False
+
+        return True
+
     def clear(self):
         pass
 
@@ -96,6 +113,68 @@ class Display:
 display = Display()
 
 
+def format_size(num_bytes):
+    """returns size in human readable units i.e. '12.3 MB'"""
+
+    size = float(num_bytes)
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            break
+        size /= 1024
+
+    return "{:.1f} {}".format(size, unit)
+
+
+class DownloadProgress:
+    """
+    Progress callback for streamed downloads, shows downloaded size and rate on
+    stderr (if it is a terminal) at most once per `interval` seconds
+    """
+
+    def __init__(self, label, interval=0.5):
+        self.label = label
+        self.interval = interval
+        self.start_time = time.monotonic()
+        self.last_report_time = 0
+        self.enabled = sys.stderr.isatty()
+
+    def __call__(self, downloaded, total):
+        now = time.monotonic()
+        if not self.enabled or now - self.last_report_time < self.interval:
+            return
+
+        self.last_report_time = now
+        rate = downloaded / max(now - self.start_time, 1e-6)
+        progress = format_size(downloaded)
+        if total:
+            progress += " / {} ({:.0f}%)".format(
+                format_size(total), downloaded * 100 / total
+            )
+        click.echo(
+            "\r{}: {} at {}/s".format(self.label, progress, format_size(rate)),
+            nl=False,
+            err=True,
+        )
+
+    def finish(self, stats):
+        """clears progress line and returns summary of completed download"""
+
+        if self.enabled and self.last_report_time:
+            click.echo("\r\033[K", nl=False, err=True)
+
+        elapsed_time = max(stats["elapsed_time"], 1e-6)
+        downloaded = stats["size"] - stats["resumed_from"]
+        summary = "{} in {:.2f}s, {}/s".format(
+            format_size(stats["size"]),
+            elapsed_time,
+            format_size(downloaded / elapsed_time),
+        )
+        if stats["resumed_from"]:
+            summary += ", resumed from {}".format(format_size(stats["resumed_from"]))
+
+        return summary
+
+
 class FeatureFlagMixin:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -125,6 +204,9 @@ class FeatureFlagMixin:
 
         cmd_name = ctx.protected_args[0]
 
+        # Load the subcommand (if not loaded yet), so that its feature flags are registered
+        self.get_command(ctx, cmd_name)
+
         feature_min_version = self.feature_version_map.get(cmd_name, "")
         if feature_min_version:
             calm_version = Version.get_version("Calm")
@@ -147,13 +229,104 @@ class FeatureFlagMixin:
             return super().invoke(ctx)
 
 
-class FeatureFlagGroup(FeatureFlagMixin, DYMMixin, click.Group):
+class LazyCommandMixin:
+    """Imports the module registering a subcommand only when the subcommand is used.
+    Subcommands not loaded yet are looked up in the cli command index"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.parent_group = None
+
+    def add_command(self, cmd, name=None):
+        super().add_command(cmd, name)
+        if isinstance(cmd, LazyCommandMixin):
+            cmd.parent_group = self
+
+    def get_lazy_commands(self):
+        """returns details of all subcommands (loaded or not) of this group"""
+
+        # Not a top-level import, as command index imports command modules depending on this module
+        from .command_index import get_command_index
+
+        group_path = []
+        group = self
+        while group.parent_group is not None:
+            group_path.insert(0, group.name)
+            group = group.parent_group
+
+        command_index = get_command_index(group)
+        return command_index.get(" ".join(group_path), {})
+
+    def get_command(self, ctx, cmd_name):
+        cmd = super().get_command(ctx, cmd_name)
+        if cmd is None:
+            cmd_details = self.get_lazy_commands().get(cmd_name, {})
+            if cmd_details.get("module"):
+                importlib.import_module(cmd_details["module"])
+                cmd = super().get_command(ctx, cmd_name)
+
+        return cmd
+
+    def list_commands(self, ctx):
+        cmd_names = set(super().list_commands(ctx))
+        cmd_names.update(self.get_lazy_commands().keys())
+        return sorted(cmd_names)
+
+    def format_commands(self, ctx, formatter):
+        """Same as `click.Group.format_commands()` except help of subcommands
+        not loaded yet is read from command index instead of importing them"""
+
+        lazy_commands = self.get_lazy_commands()
+        commands = []
+        for subcommand in self.list_commands(ctx):
+            cmd = self.commands.get(subcommand)
+            if cmd is None and subcommand in lazy_commands:
+                cmd_details = lazy_commands[subcommand]
+                cmd = click.Command(
+                    subcommand,
+                    help=cmd_details["help"],
+                    short_help=cmd_details["short_help"],
+                    hidden=cmd_details["hidden"],
+                    deprecated=cmd_details["deprecated"],
+                )
+
+            if cmd is None or cmd.hidden:
+                continue
+
+            commands.append((subcommand, cmd))
+
+        if commands:
+            limit = formatter.width - 6 - max(len(cmd[0]) for cmd in commands)
+            rows = [
+                (subcommand, cmd.get_short_help_str(limit))
+                for subcommand, cmd in commands
+            ]
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+class FeatureFlagGroup(FeatureFlagMixin, LazyCommandMixin, DYMMixin, click.Group):
     """click Group that have *did-you-mean* functionality and adds *feature_min_version* paramter to each subcommand
-    which can be used to set minimum calm version for command"""
+    which can be used to set minimum calm version for command. Subcommands are loaded lazily"""
 
     pass
 
 
+class LazyChoice(click.Choice):
+    """click Choice whose choices are computed by `get_choices` only when required"""
+
+    def __init__(self, get_choices, case_sensitive=True):
+        self.get_choices = get_choices
+        self.case_sensitive = case_sensitive
+        self._choices = None
+
+    @property
+    def choices(self):
+        if self._choices is None:
+            self._choices = list(self.get_choices())
+        return self._choices
+
+
 class FeatureDslOption(click.ParamType):
 
     name = "feature-dsl-option"
@@ -62,6 +62,7 @@ class ENV_CONFIG:
 
     class LOG(IterableConstants):
         LEVEL = "CALM_DSL_LOG_LEVEL"
+        FORMAT = "CALM_DSL_LOG_FORMAT"
 
     class SERVER(IterableConstants):
         HOST = "CALM_DSL_PC_IP"
@@ -78,3 +79,4 @@ class ENV_CONFIG:
         DB_LOCATION = "CALM_DSL_DB_LOCATION"
 
     COMPILE_SECRETS = "COMPILE_SECRETS"
+    CACHE_TTL = "CALM_DSL_CACHE_TTL"
@@ -17,6 +17,7 @@ class EnvConfig:
     local_dir_location = os.environ.get(ENV_CONFIG.INIT_CONFIG.LOCAL_DIR_LOCATION) or ""
     db_location = os.environ.get(ENV_CONFIG.INIT_CONFIG.DB_LOCATION)
     is_compile_secrets = os.environ.get(ENV_CONFIG.COMPILE_SECRETS) or "false"
+    cache_ttl = os.environ.get(ENV_CONFIG.CACHE_TTL) or ""
 
     connection_timeout = os.environ.get(ENV_CONFIG.CONNECTION.CONNECTION_TIMEOUT) or ""
     read_timeout = os.environ.get(ENV_CONFIG.CONNECTION.READ_TIMEOUT) or ""
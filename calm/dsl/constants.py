@@ -2,6 +2,8 @@
     Calm-DSL constants
 """
 
+import os
+
 
 class CACHE:
     """Cache constants"""
@@ -9,6 +11,29 @@ class CACHE:
     NDB = "ndb"
     KEY_SEPARATOR = "_"
 
+    # Maximum number of tables fetched concurrently during cache sync
+    SYNC_MAX_WORKERS = 8
+
+    # Maximum number of bound variables per insert statement during cache sync
+    # (default SQLITE_MAX_VARIABLE_NUMBER of older sqlite builds)
+    SYNC_MAX_INSERT_VARIABLES = 999
+
+    # Pragmas applied to every connection of local DB
+    DB_PRAGMAS = {"journal_mode": "wal", "synchronous": "normal"}
+
+    # Time (in seconds) after which synced data of a cache table is stale.
+    # Overridden for all tables by 'CALM_DSL_CACHE_TTL', 0 disables refresh of stale tables
+    SYNC_TTL = 24 * 60 * 60
+
+    class SYNC_STATE:
+        FRESH = "FRESH"
+        STALE = "STALE"
+        NOT_SYNCED = "NOT SYNCED"
+
+    # Time (in seconds) for which an entity fetched on a cache miss (found on
+    # server or not) is not fetched again
+    FAULT_IN_MISS_TTL = 60
+
     class ENTITY:
         AHV_CLUSTER = "ahv_cluster"
         AHV_VPC = "ahv_vpc"
@@ -657,3 +682,50 @@ class TUNNEL:
 
     # Mapping backend states to UI states
     BACKEND_TO_UI_STATE_MAPPING = {v: k for k, v in UI_TO_BACKEND_STATE_MAPPING.items()}
+
+
+class SECRET_STORE:
+    """Local secret store constants"""
+
+    # Maximum number of derived keys kept in memory and their lifetime(in seconds)
+    KEY_CACHE_MAX_SIZE = 1024
+    KEY_CACHE_TTL = 600
+
+    # Maximum number of secrets decrypted concurrently
+    DECRYPT_MAX_WORKERS = 8
+
+
+class DAEMON:
+    """Constants of resident dsl daemon serving cli commands"""
+
+    # Socket of daemon, overridden by 'CALM_DSL_DAEMON_SOCKET'
+    SOCKET_FILE = os.path.join(os.path.expanduser("~"), ".calm", "dsl_daemon.sock")
+    SOCKET_ENV = "CALM_DSL_DAEMON_SOCKET"
+
+    # Prefix of environment variables that must match between client and daemon
+    ENV_PREFIX = "CALM_DSL_"
+
+    # Time (in seconds) to wait for a started daemon to accept commands
+    START_TIMEOUT = 60
+
+    # Commands run by the client itself, i.e. managing the daemon or the dsl config
+    LOCAL_COMMANDS = [
+        ["start", "daemon"],
+        ["stop", "daemon"],
+        ["get", "daemon"],
+        ["init"],
+    ]
+
+    class REQUEST:
+        RUN = "run"
+        STATUS = "status"
+        STOP = "stop"
+
+    class FRAME:
+        """Types of frames sent by daemon to client"""
+
+        STDOUT = b"o"
+        STDERR = b"e"
+        EXIT = b"x"
+        DATA = b"d"
+        RUN_LOCALLY = b"l"
@@ -1,12 +1,76 @@
+from collections import OrderedDict
 from Crypto.Cipher import AES
+import hashlib
 import scrypt
 import os
+import threading
+import time
+
+from calm.dsl.constants import SECRET_STORE
+
+
+class DerivedKeyCache:
+    """
+    In-process cache of keys derived using scrypt, bounded by size and ttl.
+    Keys are looked up by (kdf_salt, digest of password, kdf params), so that
+    passwords are not held in memory by the cache.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_cache_key(kdf_salt, password, *kdf_params):
+        if isinstance(password, str):
+            password = password.encode()
+
+        password_digest = hashlib.sha256(password).digest()
+        return (bytes(kdf_salt), password_digest) + kdf_params
+
+    def get(self, cache_key):
+        """returns cached key, None if key is not present or is expired"""
+
+        with self._lock:
+            entry = self._keys.get(cache_key)
+            if entry is None:
+                return None
+
+            secret_key, expiry_time = entry
+            if expiry_time < time.monotonic():
+                del self._keys[cache_key]
+                return None
+
+            self._keys.move_to_end(cache_key)
+            return secret_key
+
+    def set(self, cache_key, secret_key):
+        with self._lock:
+            self._keys[cache_key] = (secret_key, time.monotonic() + self.ttl)
+            self._keys.move_to_end(cache_key)
+
+            # Evict least recently used keys
+            while len(self._keys) > self.max_size:
+                self._keys.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+    def __len__(self):
+        return len(self._keys)
 
 
 # Crypto class for encryption/decryption
 
 
 class Crypto:
+    key_cache = DerivedKeyCache(
+        SECRET_STORE.KEY_CACHE_MAX_SIZE, SECRET_STORE.KEY_CACHE_TTL
+    )
+
     @staticmethod
     def encrypt_AES_GCM(msg, password, kdf_salt=None, nonce=None):
         """Used for encryption of msg"""
@@ -43,7 +107,14 @@ class Crypto:
     def generate_key(kdf_salt, password, iterations=16384, r=8, p=1, buflen=32):
         """Generates the key that is used for encryption/decryption"""
 
-        secret_key = scrypt.hash(
-            password, kdf_salt, N=iterations, r=r, p=p, buflen=buflen
+        cache_key = Crypto.key_cache.get_cache_key(
+            kdf_salt, password, iterations, r, p, buflen
         )
+        secret_key = Crypto.key_cache.get(cache_key)
+        if secret_key is None:
+            secret_key = scrypt.hash(
+                password, kdf_salt, N=iterations, r=r, p=p, buflen=buflen
+            )
+            Crypto.key_cache.set(cache_key, secret_key)
+
         return secret_key
@@ -0,0 +1,4 @@
+"""
+Resident dsl daemon, serving cli commands over a unix socket (see server.py),
+and its thin client `calmc` (see client.py).
+"""
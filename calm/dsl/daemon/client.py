@@ -0,0 +1,105 @@
+"""
+Thin client of dsl daemon (`calmc`), a drop-in replacement of `calm`.
+
+Arguments of the command are forwarded to the daemon, which runs the command
+and streams back its output. Only standard library is imported by the client,
+so a command served by daemon does not pay the startup cost of dsl. If the
+daemon is not running (or is started with a different dsl environment), the
+command is run by the client itself.
+"""
+
+import os
+import sys
+
+from calm.dsl.constants import DAEMON
+from . import protocol
+
+
+def run_locally(args):
+    from calm.dsl.cli import main
+
+    main(args=args, prog_name="calm")
+
+
+def send_request(request, socket_file=None):
+    """sends a status/stop request to daemon, returns its response (None if daemon is not running)"""
+
+    sock = protocol.connect(socket_file)
+    if sock is None:
+        return None
+
+    with sock:
+        protocol.send_json(sock, request)
+        return protocol.recv_json(sock)
+
+
+def get_daemon_status(socket_file=None):
+    """returns status of daemon, None if daemon is not running"""
+
+    return send_request({"type": DAEMON.REQUEST.STATUS}, socket_file)
+
+
+def stop_daemon(socket_file=None):
+    """stops the daemon, returns its last status (None if daemon is not running)"""
+
+    return send_request({"type": DAEMON.REQUEST.STOP}, socket_file)
+
+
+def run_command(args, socket_file=None, stdout=None, stderr=None):
+    """
+    Runs the cli command on daemon, writing its output to stdout, stderr
+    Returns:
+        (int): exit code of command, None if command is not run by daemon
+    """
+
+    stdout = stdout or sys.stdout.buffer
+    stderr = stderr or sys.stderr.buffer
+
+    sock = protocol.connect(socket_file)
+    if sock is None:
+        return None
+
+    with sock:
+        protocol.send_json(
+            sock,
+            {
+                "type": DAEMON.REQUEST.RUN,
+                "args": list(args),
+                "cwd": os.getcwd(),
+                "env": protocol.get_env(),
+                "stdout_tty": sys.stdout.isatty(),
+                "stderr_tty": sys.stderr.isatty(),
+            },
+        )
+
+        while True:
+            frame_type, payload = protocol.recv_frame(sock)
+            if frame_type == DAEMON.FRAME.STDOUT:
+                stdout.write(payload)
+                stdout.flush()
+
+            elif frame_type == DAEMON.FRAME.STDERR:
+                stderr.write(payload)
+                stderr.flush()
+
+            elif frame_type == DAEMON.FRAME.EXIT:
+                return int(payload)
+
+            elif frame_type == DAEMON.FRAME.RUN_LOCALLY:
+                return None
+
+
+def main():
+    args = sys.argv[1:]
+    try:
+        exit_code = run_command(args)
+    except ConnectionError:
+        # Daemon stopped while serving the command
+        exit_code = 1
+        sys.stderr.write("Connection to dsl daemon lost\n")
+
+    if exit_code is None:
+        run_locally(args)
+        return
+
+    sys.exit(exit_code)
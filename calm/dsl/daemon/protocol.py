@@ -0,0 +1,79 @@
+"""
+Wire format between dsl daemon and its clients.
+
+Every message is a frame: a one byte type, length of payload (4 bytes, big
+endian) and the payload. Client sends a single DATA frame holding the json
+request, daemon answers with STDOUT/STDERR frames streaming output of the
+command, followed by an EXIT frame holding the exit code. Daemon answers with
+a RUN_LOCALLY frame, if the command has to be run by the client itself.
+"""
+
+import json
+import os
+import socket
+import struct
+
+from calm.dsl.constants import DAEMON
+
+HEADER = struct.Struct(">cI")
+
+
+def get_socket_file():
+    """returns path of daemon socket"""
+
+    return os.environ.get(DAEMON.SOCKET_ENV) or DAEMON.SOCKET_FILE
+
+
+def get_env():
+    """returns dsl environment variables of this process"""
+
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if key.startswith(DAEMON.ENV_PREFIX) and key != DAEMON.SOCKET_ENV
+    }
+
+
+def send_frame(sock, frame_type, payload=b""):
+    sock.sendall(HEADER.pack(frame_type, len(payload)) + payload)
+
+
+def _recv_exactly(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed by dsl daemon")
+        data += chunk
+    return data
+
+
+def recv_frame(sock):
+    """returns (type, payload) of next frame"""
+
+    frame_type, size = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    return frame_type, _recv_exactly(sock, size) if size else b""
+
+
+def send_json(sock, data):
+    send_frame(sock, DAEMON.FRAME.DATA, json.dumps(data).encode("utf-8"))
+
+
+def recv_json(sock):
+    frame_type, payload = recv_frame(sock)
+    if frame_type != DAEMON.FRAME.DATA:
+        raise ValueError("Unexpected frame '{}' from dsl daemon".format(frame_type))
+    return json.loads(payload.decode("utf-8"))
+
+
+def connect(socket_file=None):
+    """returns socket connected to daemon, None if daemon is not running"""
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_file or get_socket_file())
+    except OSError:
+        sock.close()
+        return None
+
+    return sock
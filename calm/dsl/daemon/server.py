@@ -0,0 +1,306 @@
+"""
+Resident dsl daemon serving cli commands over a unix socket.
+
+Daemon imports the cli (all command modules, dsl models and schemas, provider
+plugins) and opens the local db once, and then runs commands sent by clients
+in its own process, so that imports, rendered schemas, cached data and pooled
+https connections of api client are reused by every command. Commands are run
+one at a time. Module level state changed by a command (dsl context, metadata
+maps, modules imported by dsl files etc.) is reset before every command.
+Stdout and stderr of a command are streamed to the client, stdin is empty (i.e.
+prompts are aborted).
+"""
+
+import io
+import os
+import socket
+import sys
+import time
+import traceback
+
+import click
+
+from calm.dsl.constants import DAEMON
+from calm.dsl.log import CustomLogging, get_logging_handle
+from calm.dsl.tools import is_shared_module
+from . import protocol
+
+LOG = get_logging_handle(__name__)
+
+
+class FrameWriter(io.RawIOBase):
+    """Binary stream sending every write as a frame of given type"""
+
+    def __init__(self, sock, frame_type, is_tty=False):
+        super().__init__()
+        self.sock = sock
+        self.frame_type = frame_type
+        self.is_tty = is_tty
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return self.is_tty
+
+    def write(self, data):
+        data = bytes(data)
+        if data:
+            protocol.send_frame(self.sock, self.frame_type, data)
+        return len(data)
+
+
+def get_frame_stream(sock, frame_type, is_tty=False):
+    """returns text stream writing to client"""
+
+    return io.TextIOWrapper(
+        FrameWriter(sock, frame_type, is_tty),
+        encoding="utf-8",
+        errors="backslashreplace",
+        write_through=True,
+    )
+
+
+def get_exit_code(exp):
+    """returns exit code of SystemExit, as set by python interpreter"""
+
+    if exp.code is None:
+        return 0
+
+    elif isinstance(exp.code, int):
+        return exp.code
+
+    sys.stderr.write("{}\n".format(exp.code))
+    return 1
+
+
+class DslDaemon:
+    """Daemon running cli commands sent over socket_file"""
+
+    def __init__(self, socket_file=None, config_file=None):
+        self.socket_file = socket_file or protocol.get_socket_file()
+        self.config_file = config_file
+        self.env = protocol.get_env()
+        self.start_time = None
+        self.command_count = 0
+        self.cli = None
+        self._server_config = None
+        self._modules = set()
+        self._sys_path = []
+        self._stopped = False
+
+    def warm_up(self):
+        """loads the cli, dsl models and local db"""
+
+        start_time = time.time()
+        from calm.dsl.cli import main
+        from calm.dsl.cli.command_index import load_command_modules
+        from calm.dsl.builtins.models.schema import _get_all_schemas
+        from calm.dsl.providers import get_provider_types
+        from calm.dsl.db import get_db_handle
+
+        load_command_modules()
+
+        schemas = _get_all_schemas()
+        for name in schemas.keys():
+            schemas.get(name)
+
+        get_provider_types()
+        get_db_handle()
+
+        self.cli = main
+        self._modules = set(sys.modules)
+        self._sys_path = list(sys.path)
+        LOG.info("DSL loaded in {:.2f}s".format(time.time() - start_time))
+
+    def reset_state(self):
+        """resets module level state of dsl changed by previous command"""
+
+        from calm.dsl.api import reset_api_client_handle
+        from calm.dsl.builtins import reset_dsl_metadata_map
+        from calm.dsl.builtins.models.metadata_payload import reset_metadata_obj
+        from calm.dsl.config import get_context
+        from calm.dsl.decompile.main import init_decompile_context
+        from calm.dsl.store import Cache
+
+        # Config files may be changed by previous command (ex: `calm set config`)
+        context = get_context()
+        context.reset_configuration()
+        if self.config_file:
+            context.update_config_file_context(config_file=self.config_file)
+
+        # Pooled connections are kept as long as server config is same
+        if context.server_config != self._server_config:
+            reset_api_client_handle()
+            self._server_config = dict(context.server_config)
+
+        CustomLogging._SHOW_TRACE = False
+        reset_dsl_metadata_map()
+        reset_metadata_obj()
+        init_decompile_context()
+        Cache._checked_tables.clear()
+
+        marketplace = sys.modules.get("calm.dsl.cli.marketplace", None)
+        if marketplace:
+            marketplace.clear_mpi_listing_cache()
+
+        # Modules imported by dsl files (i.e. local modules of same name)
+        for module_name in set(sys.modules) - self._modules:
+            if not is_shared_module(sys.modules[module_name]):
+                sys.modules.pop(module_name, None)
+        sys.path[:] = self._sys_path
+
+    def get_command_path(self, args):
+        """returns names of command and its parent groups (ex: ['get', 'apps']) for args"""
+
+        # Options are only parsed, not processed (i.e. callbacks are not invoked)
+        path = []
+        command = self.cli
+        ctx = None
+        args = list(args)
+        try:
+            while isinstance(command, click.MultiCommand):
+                ctx = click.Context(command, parent=ctx, resilient_parsing=True)
+                _, args, _ = command.make_parser(ctx).parse_args(args=args)
+                if not args:
+                    break
+
+                cmd_name, command, args = command.resolve_command(ctx, args)
+                if command is None:
+                    break
+
+                path.append(cmd_name)
+
+        except click.ClickException:
+            pass
+
+        return path
+
+    def is_local_command(self, args):
+        path = self.get_command_path(args)
+        return any(path[: len(command)] == command for command in DAEMON.LOCAL_COMMANDS)
+
+    def run_command(self, sock, request):
+        """runs cli command of request, streaming its output to client"""
+
+        args = request.get("args", [])
+        if request.get("env", {}) != self.env or self.is_local_command(args):
+            protocol.send_frame(sock, DAEMON.FRAME.RUN_LOCALLY)
+            return
+
+        self.command_count += 1
+        stdout = get_frame_stream(sock, DAEMON.FRAME.STDOUT, request.get("stdout_tty"))
+        stderr = get_frame_stream(sock, DAEMON.FRAME.STDERR, request.get("stderr_tty"))
+        old_streams = (sys.stdin, sys.stdout, sys.stderr)
+        old_argv = sys.argv
+        old_cwd = os.getcwd()
+
+        self.reset_state()
+        sys.stdin, sys.stdout, sys.stderr = io.StringIO(), stdout, stderr
+        sys.argv = ["calm"] + args
+        handler_streams = [
+            (handler, handler.stream) for handler in CustomLogging._HANDLERS
+        ]
+        for handler, _ in handler_streams:
+            handler.setStream(stderr)
+
+        exit_code = 0
+        try:
+            os.chdir(request.get("cwd") or old_cwd)
+            self.cli.main(args=args, prog_name="calm")
+
+        except SystemExit as exp:
+            exit_code = get_exit_code(exp)
+
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = old_streams
+            sys.argv = old_argv
+            os.chdir(old_cwd)
+            for handler, stream in handler_streams:
+                handler.setStream(stream)
+
+        protocol.send_frame(sock, DAEMON.FRAME.EXIT, str(exit_code).encode("utf-8"))
+
+    def get_status(self):
+        return {
+            "pid": os.getpid(),
+            "socket": self.socket_file,
+            "start_time": self.start_time,
+            "commands": self.command_count,
+        }
+
+    def handle(self, sock):
+        request = protocol.recv_json(sock)
+        request_type = request.get("type")
+
+        if request_type == DAEMON.REQUEST.RUN:
+            self.run_command(sock, request)
+
+        elif request_type == DAEMON.REQUEST.STATUS:
+            protocol.send_json(sock, self.get_status())
+
+        elif request_type == DAEMON.REQUEST.STOP:
+            self._stopped = True
+            protocol.send_json(sock, self.get_status())
+
+        else:
+            LOG.warning("Invalid request type '{}'".format(request_type))
+
+    def bind(self):
+        """returns socket listening on socket_file, accessible only by current user"""
+
+        sock = protocol.connect(self.socket_file)
+        if sock is not None:
+            sock.close()
+            raise Exception("DSL daemon already running at {}".format(self.socket_file))
+
+        # Socket of a killed daemon
+        if os.path.exists(self.socket_file):
+            os.remove(self.socket_file)
+
+        socket_dir = os.path.dirname(os.path.abspath(self.socket_file))
+        os.makedirs(socket_dir, exist_ok=True)
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_file)
+        finally:
+            os.umask(old_umask)
+
+        sock.listen()
+        return sock
+
+    def serve(self):
+        """serves commands till daemon is stopped"""
+
+        self.warm_up()
+        server_sock = self.bind()
+        self.start_time = time.time()
+        LOG.info(
+            "DSL daemon (pid {}) listening on {}".format(os.getpid(), self.socket_file)
+        )
+
+        try:
+            while not self._stopped:
+                sock, _ = server_sock.accept()
+                with sock:
+                    try:
+                        self.handle(sock)
+
+                    # Client exited while command was running
+                    except (ConnectionError, ValueError) as exp:
+                        LOG.debug("Request aborted: {}".format(exp))
+
+        finally:
+            server_sock.close()
+            if os.path.exists(self.socket_file):
+                os.remove(self.socket_file)
+
+        LOG.info(
+            "DSL daemon stopped after serving {} commands".format(self.command_count)
+        )
@@ -2,7 +2,9 @@ import atexit
 import os
 
 from calm.dsl.config import get_context
+from calm.dsl.constants import CACHE
 from .table_config import dsl_database, SecretTable, DataTable, VersionTable
+from .table_config import CacheSyncTable
 from .table_config import CacheTableBase
 from calm.dsl.log import get_logging_handle
 
@@ -24,7 +26,7 @@ class Database:
         ContextObj = get_context()
         init_obj = ContextObj.get_init_config()
         db_location = init_obj["DB"]["location"]
-        dsl_database.init(db_location)
+        dsl_database.init(db_location, pragmas=CACHE.DB_PRAGMAS)
         return dsl_database
 
     def __init__(self):
@@ -33,6 +35,7 @@ class Database:
         self.secret_table = self.set_and_verify(SecretTable)
         self.data_table = self.set_and_verify(DataTable)
         self.version_table = self.set_and_verify(VersionTable)
+        self.cache_sync_table = self.set_and_verify(CacheSyncTable)
 
         for table_type, table in CacheTableBase.tables.items():
             setattr(self, table_type, self.set_and_verify(table))
@@ -45,6 +48,10 @@ class Database:
         if not self.db.table_exists((table_cls.__name__).lower()):
             self.db.create_tables([table_cls])
 
+        elif table_cls._meta.indexes:
+            # Tables created by older versions may not have the lookup indexes
+            table_cls._schema.create_indexes(safe=True)
+
         # Register table to class
         if table_cls not in self.registered_tables:
             self.registered_tables.append(table_cls)
@@ -9,17 +9,23 @@ from peewee import (
     CompositeKey,
     DoesNotExist,
     IntegerField,
+    FloatField,
+    AutoField,
+    chunked,
 )
 import datetime
+import threading
 import click
 import arrow
 import json
 import sys
 import re
+import traceback
 from prettytable import PrettyTable
 
 from calm.dsl.api import get_resource_api, get_api_client
 from calm.dsl.config import get_context
+from calm.dsl.config.env_config import EnvConfig
 from calm.dsl.log import get_logging_handle
 from calm.dsl.constants import CACHE, TUNNEL, GLOBAL_VARIABLE, VARIABLE
 from calm.dsl.api.util import is_policy_check_required
@@ -31,6 +37,33 @@ REPLACED_CLUSTER_NAME_CHARACTER = "_"
 # Proxy database
 dsl_database = SqliteDatabase(None)
 
+# Per-thread staging buffer used while fetching rows for incremental cache sync
+_SYNC_STAGE = threading.local()
+
+# (value of cache ttl in environment, its parsed ttl in seconds)
+_ENV_SYNC_TTL = ("", None)
+
+
+def get_env_sync_ttl():
+    """returns ttl (in seconds) of cache tables set in environment, None if not set or invalid"""
+
+    global _ENV_SYNC_TTL
+    cache_ttl = EnvConfig.cache_ttl
+    if cache_ttl != _ENV_SYNC_TTL[0]:
+        sync_ttl = None
+        try:
+            sync_ttl = int(cache_ttl)
+        except ValueError:
+            LOG.warning(
+                "Invalid cache ttl '{}' set in environment, using default ttl of tables".format(
+                    cache_ttl
+                )
+            )
+        _ENV_SYNC_TTL = (cache_ttl, sync_ttl)
+
+    return _ENV_SYNC_TTL[1]
+
+
 context = get_context()
 ncm_server_config = context.get_ncm_server_config()
 NCM_ENABLED = ncm_server_config.get("ncm_enabled", False)
@@ -73,6 +106,16 @@ class CacheTableBase(BaseModel):
     is_approval_policy_required = False
     is_policy_required = False
 
+    # Tables whose rows are read while syncing this table
+    sync_dependencies = []
+
+    # Time (in seconds) after which synced data of table is stale
+    sync_ttl = CACHE.SYNC_TTL
+
+    # Api of client (ex: 'project') listing entities of table by name, used to
+    # fault in an entity missing in table (see `fault_in`)
+    fault_in_api = None
+
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
 
@@ -187,6 +230,76 @@ class CacheTableBase(BaseModel):
             )
         )
 
+    @classmethod
+    def get_sync_ttl(cls):
+        """returns time (in seconds) after which synced data of table is stale"""
+
+        env_ttl = get_env_sync_ttl()
+        return cls.sync_ttl if env_ttl is None else env_ttl
+
+    @classmethod
+    def supports_fault_in(cls):
+        """returns True if a single entity can be fetched into table on a cache miss"""
+
+        return cls.add_one.__func__ is not CacheTableBase.add_one.__func__
+
+    @classmethod
+    def get_fault_in_uuids(cls, name):
+        """returns uuids of entities (on server) having supplied name"""
+
+        if not cls.fault_in_api:
+            return []
+
+        client = get_api_client()
+        res, err = getattr(client, cls.fault_in_api).list(
+            {"length": 250, "filter": "name=={}".format(name)}
+        )
+        if err:
+            LOG.debug("[{}] - {}".format(err["code"], err["error"]))
+            return []
+
+        uuids = []
+        for entity in res.json().get("entities", []):
+            # Filter on name is not an exact match
+            entity_name = entity.get("status", {}).get("name") or entity.get(
+                "spec", {}
+            ).get("name")
+            if entity_name == name:
+                uuids.append(entity["metadata"]["uuid"])
+        return uuids
+
+    @classmethod
+    def fault_in(cls, name=None, uuid=None):
+        """
+        Fetches entity missing in table (by uuid, else by name) from server and
+        upserts it. Entities are not faulted in while syncing the cache.
+        Returns:
+            (bool): True if any entity is upserted
+        """
+
+        if not cls.supports_fault_in() or getattr(_SYNC_STAGE, "table", None):
+            return False
+
+        uuids = [uuid] if uuid else cls.get_fault_in_uuids(name)
+        is_upserted = False
+        for _uuid in uuids:
+            LOG.debug(
+                "Fetching {} (uuid={}) missing in cache".format(
+                    cls.get_cache_type(), _uuid
+                )
+            )
+            try:
+                with cls._meta.database.atomic():
+                    # Row of entity (ex: renamed entity) is replaced by latest data
+                    cls.delete().where(cls.uuid == _uuid).execute()
+                    cls.add_one(_uuid)
+                is_upserted = True
+
+            except Exception:
+                LOG.debug("Exception Traceback:\n{}".format(traceback.format_exc()))
+
+        return is_upserted
+
     @classmethod
     def delete_one(cls, uuid, **kwargs):
         raise NotImplementedError(
@@ -203,9 +316,200 @@ class CacheTableBase(BaseModel):
             )
         )
 
+    @classmethod
+    def create(cls, **query):
+        """creates a row, or stages it if the table is being fetched for sync"""
+
+        staged_rows = cls._get_staged_rows()
+        if staged_rows is not None:
+            staged_rows.append(query)
+            return None
+
+        return super().create(**query)
+
+    def delete_instance(self, *args, **kwargs):
+        # Stale rows are removed by apply_sync_rows, so clear() is a no-op while staging
+        if self._get_staged_rows() is not None:
+            return 0
+
+        return super().delete_instance(*args, **kwargs)
+
+    @classmethod
+    def _get_staged_rows(cls):
+        """returns staging buffer if current thread is fetching rows for this table"""
+
+        if getattr(_SYNC_STAGE, "table", None) is cls:
+            return _SYNC_STAGE.rows
+        return None
+
+    @classmethod
+    def fetch_sync_rows(cls):
+        """
+        Runs the sync of table without touching the stored data
+        Returns:
+            rows (list): column values of every row the table should contain
+        """
+
+        _SYNC_STAGE.table = cls
+        _SYNC_STAGE.rows = []
+        try:
+            cls.sync()
+            return _SYNC_STAGE.rows
+
+        finally:
+            _SYNC_STAGE.table = None
+            _SYNC_STAGE.rows = None
+
+    @classmethod
+    def _get_sync_compare_fields(cls):
+        """returns fields compared to detect changed rows"""
+
+        fields = []
+        for field in cls._meta.sorted_fields:
+            if isinstance(field, AutoField) or field.name == "last_update_time":
+                continue
+            fields.append(field)
+        return fields
+
+    @classmethod
+    def _get_sync_key_fields(cls):
+        """returns names of fields identifying a row across syncs"""
+
+        primary_key = cls._meta.primary_key
+        if isinstance(primary_key, CompositeKey):
+            return list(primary_key.field_names)
+
+        elif not isinstance(primary_key, AutoField):
+            return [primary_key.name]
+
+        elif "uuid" in cls._meta.fields:
+            return ["uuid"]
+
+        return [field.name for field in cls._get_sync_compare_fields()]
+
+    @classmethod
+    def _normalize_sync_row(cls, row, fields):
+        """returns comparable db values for supplied fields of row"""
+
+        values = {}
+        for field in fields:
+            if field.name in row:
+                value = row[field.name]
+            elif callable(field.default):
+                value = field.default()
+            else:
+                value = field.default
+
+            value = field.db_value(value)
+            if isinstance(value, (memoryview, bytearray)):
+                value = bytes(value)
+            values[field.name] = value
+        return values
+
+    @classmethod
+    def apply_sync_rows(cls, rows):
+        """
+        Reconciles stored data with rows fetched from server in a single transaction.
+        Only new, modified and stale rows are written.
+        Args:
+            rows (list): rows returned by fetch_sync_rows
+        Returns:
+            (tuple): count of inserted, updated and deleted rows
+        """
+
+        compare_fields = cls._get_sync_compare_fields()
+        key_fields = cls._get_sync_key_fields()
+        has_update_time = "last_update_time" in cls._meta.fields
+
+        def get_key(values):
+            return tuple(values[name] for name in key_fields)
+
+        def get_where_clause(key):
+            clause = None
+            for name, value in zip(key_fields, key):
+                expr = getattr(cls, name) == value
+                clause = expr if clause is None else (clause & expr)
+            return clause
+
+        fetched_rows = {}
+        for row in rows:
+            values = cls._normalize_sync_row(row, compare_fields)
+            fetched_rows.setdefault(get_key(values), []).append((row, values))
+
+        stored_rows = {}
+        for row in cls.select().dicts():
+            values = cls._normalize_sync_row(row, compare_fields)
+            stored_rows.setdefault(get_key(values), []).append(values)
+
+        # Rows can not be matched one-to-one, so replace the whole table
+        full_replace = any(len(v) > 1 for v in fetched_rows.values()) or any(
+            len(v) > 1 for v in stored_rows.values()
+        )
+
+        now = datetime.datetime.now()
+        inserted = updated = deleted = 0
+        with cls._meta.database.atomic():
+            if full_replace:
+                deleted = cls.delete().execute()
+
+            else:
+                for key in stored_rows:
+                    if key not in fetched_rows:
+                        deleted += cls.delete().where(get_where_clause(key)).execute()
+
+            insert_rows = []
+            for key, matched_rows in fetched_rows.items():
+                for row, values in matched_rows:
+                    row = dict(row)
+                    if has_update_time:
+                        row["last_update_time"] = now
+
+                    if full_replace or key not in stored_rows:
+                        insert_rows.append(row)
+
+                    elif stored_rows[key][0] != values:
+                        cls.update(**row).where(get_where_clause(key)).execute()
+                        updated += 1
+
+            inserted = cls._insert_sync_rows(insert_rows)
+
+        return inserted, updated, deleted
+
+    @classmethod
+    def _insert_sync_rows(cls, rows):
+        """inserts rows using multi-row insert statements, returns count of inserted rows"""
+
+        if not rows:
+            return 0
+
+        # Every statement inserts the same columns, missing ones take field default
+        fields = [
+            field
+            for field in cls._meta.sorted_fields
+            if not isinstance(field, AutoField)
+        ]
+        insert_rows = []
+        for row in rows:
+            insert_row = {}
+            for field in fields:
+                if field.name in row:
+                    insert_row[field] = row[field.name]
+                elif callable(field.default):
+                    insert_row[field] = field.default()
+                else:
+                    insert_row[field] = field.default
+            insert_rows.append(insert_row)
+
+        batch_size = max(1, CACHE.SYNC_MAX_INSERT_VARIABLES // len(fields))
+        for batch in chunked(insert_rows, batch_size):
+            cls.insert_many(batch).execute()
+
+        return len(insert_rows)
+
 
 class AccountCache(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.ACCOUNT
+    fault_in_api = "account"
     feature_min_version = "2.7.0"
     is_policy_required = False
     name = CharField()
@@ -993,6 +1297,10 @@ class AhvClustersCache(CacheTableBase):
     class Meta:
         database = dsl_database
         primary_key = CompositeKey("name", "uuid", "account_uuid")
+        indexes = (
+            (("name", "account_uuid"), False),
+            (("uuid", "account_uuid"), False),
+        )
 
 
 class AhvVpcsCache(CacheTableBase):
@@ -1179,6 +1487,10 @@ class AhvVpcsCache(CacheTableBase):
     class Meta:
         database = dsl_database
         primary_key = CompositeKey("name", "uuid", "account_uuid")
+        indexes = (
+            (("name", "account_uuid"), False),
+            (("uuid", "account_uuid"), False),
+        )
 
 
 class AhvSubnetsCache(CacheTableBase):
@@ -1384,6 +1696,10 @@ class AhvSubnetsCache(CacheTableBase):
     class Meta:
         database = dsl_database
         primary_key = CompositeKey("name", "uuid", "account_uuid")
+        indexes = (
+            (("name", "account_uuid"), False),
+            (("uuid", "account_uuid"), False),
+        )
 
 
 class AhvImagesCache(CacheTableBase):
@@ -1531,10 +1847,15 @@ class AhvImagesCache(CacheTableBase):
     class Meta:
         database = dsl_database
         primary_key = CompositeKey("name", "uuid", "account_uuid")
+        indexes = (
+            (("name", "account_uuid", "image_type"), False),
+            (("uuid", "account_uuid"), False),
+        )
 
 
 class ProjectCache(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.PROJECT
+    fault_in_api = "project"
     feature_min_version = "2.7.0"
     is_policy_required = False
     name = CharField()
@@ -1992,6 +2313,7 @@ class ProjectCache(CacheTableBase):
 
 class EnvironmentCache(CacheTableBase):
     __cache_type__ = "environment"
+    fault_in_api = "environment"
     feature_min_version = "2.7.0"
     is_policy_required = False
     name = CharField()
@@ -2279,6 +2601,10 @@ class EnvironmentCache(CacheTableBase):
     class Meta:
         database = dsl_database
         primary_key = CompositeKey("name", "uuid")
+        indexes = (
+            (("name", "project_uuid"), False),
+            (("uuid",), False),
+        )
 
 
 class UsersCache(CacheTableBase):
@@ -2475,6 +2801,7 @@ class UsersCache(CacheTableBase):
 
 class RolesCache(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.ROLE
+    fault_in_api = "role"
     feature_min_version = "2.7.0"
     is_policy_required = False
     name = CharField()
@@ -4616,6 +4943,7 @@ class NDB_SnapshotCache(CacheTableBase):
     __cache_type__ = CACHE.NDB + CACHE.KEY_SEPARATOR + CACHE.NDB_ENTITY.SNAPSHOT
     feature_min_version = "3.7.0"
     is_policy_required = True if not NCM_ENABLED else False
+    sync_dependencies = [NDB_TimeMachineCache]
     name = CharField()
     uuid = CharField()
     account_name = CharField()
@@ -5160,6 +5488,38 @@ class VersionTable(BaseModel):
         return {"name": self.name, "pc_ip": self.pc_ip, "version": self.version}
 
 
+class CacheSyncTable(BaseModel):
+    """Time and duration of last sync of every cache table"""
+
+    cache_type = CharField(primary_key=True)
+    last_sync_time = DateTimeField()
+    sync_duration = FloatField()
+
+    @classmethod
+    def record_sync(cls, cache_type, sync_duration):
+        """stores sync of a cache table, replacing the previous one"""
+
+        cls.insert(
+            cache_type=cache_type,
+            last_sync_time=datetime.datetime.now(),
+            sync_duration=sync_duration,
+        ).on_conflict_replace().execute()
+
+    @classmethod
+    def get_entity_data(cls, cache_type):
+        try:
+            return cls.get(cls.cache_type == cache_type).get_detail_dict()
+        except DoesNotExist:
+            return dict()
+
+    def get_detail_dict(self):
+        return {
+            "cache_type": self.cache_type,
+            "last_sync_time": self.last_sync_time,
+            "sync_duration": self.sync_duration,
+        }
+
+
 def highlight_text(text, **kwargs):
     """Highlight text in our standard format"""
     return click.style("{}".format(text), fg="blue", bold=False, **kwargs)
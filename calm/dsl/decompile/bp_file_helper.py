@@ -21,7 +21,7 @@ from calm.dsl.decompile.blueprint import render_blueprint_template
 from calm.dsl.decompile.metadata import render_metadata_template
 from calm.dsl.decompile.variable import get_secret_variable_files
 from calm.dsl.decompile.ref_dependency import update_entity_gui_dsl_name
-from calm.dsl.decompile.file_handler import get_local_dir
+from calm.dsl.decompile.file_handler import get_local_dir, write_file
 from calm.dsl.builtins import BlueprintType, ServiceType, PackageType
 from calm.dsl.builtins import DeploymentType, ProfileType, SubstrateType
 from calm.dsl.builtins import get_valid_identifier
@@ -169,8 +169,7 @@ def render_bp_file_template(
                     hide_input=True,
                 )
             file_loc = os.path.join(get_local_dir(), file_name)
-            with open(file_loc, "w+") as fd:
-                fd.write(secret_val)
+            write_file(file_loc, secret_val)
 
     dependepent_entities = []
     dependepent_entities = get_ordered_entities(entity_name_text_map, entity_edges)
@@ -370,8 +369,7 @@ def encrypt_decompile_secrets(key=SECRETS_FILE_ENCRYPTION_KEY, secrets_dict=[]):
 
     encrypted_file_path = os.path.join(get_local_dir(), "decompiled_secrets.bin")
 
-    with open(encrypted_file_path, "wb") as f:
-        [f.write(x) for x in (cipher.nonce, tag, ciphertext)]
+    write_file(encrypted_file_path, cipher.nonce + tag + ciphertext)
 
 
 def decrypt_decompiled_secrets_file(key=SECRETS_FILE_ENCRYPTION_KEY, pth=""):
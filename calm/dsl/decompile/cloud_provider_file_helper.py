@@ -18,7 +18,7 @@ from calm.dsl.decompile.credential import render_credential_template, get_cred_f
 from calm.dsl.decompile.cloud_provider import render_cloud_provider_template
 from calm.dsl.decompile.variable import get_secret_variable_files
 from calm.dsl.decompile.ref_dependency import update_entity_gui_dsl_name
-from calm.dsl.decompile.file_handler import get_local_dir
+from calm.dsl.decompile.file_handler import get_local_dir, write_file
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
@@ -135,8 +135,7 @@ def render_cloud_provider_file_template(
                     hide_input=True,
                 )
             file_loc = os.path.join(get_local_dir(), file_name)
-            with open(file_loc, "w+") as fd:
-                fd.write(secret_val)
+            write_file(file_loc, secret_val)
 
     is_any_secret_value_available = False
     for _e in secrets_dict:
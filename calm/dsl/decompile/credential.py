@@ -2,7 +2,7 @@ import os
 
 from calm.dsl.decompile.render import render_template
 from calm.dsl.builtins import CredentialType
-from calm.dsl.decompile.file_handler import get_local_dir
+from calm.dsl.decompile.file_handler import get_local_dir, write_file
 from calm.dsl.log import get_logging_handle
 from calm.dsl.builtins import get_valid_identifier
 
@@ -58,8 +58,7 @@ def create_file_from_file_name(file_name):
     file_loc = os.path.join(get_local_dir(), file_name)
 
     # Storing empty value in the file
-    with open(file_loc, "w+") as fd:
-        fd.write("")
+    write_file(file_loc, "")
 
     CRED_FILES.append(file_name)
 
@@ -14,6 +14,7 @@ from calm.dsl.decompile.file_handler import (
     init_environment_dir,
     init_project_dir,
     init_global_variable_dir,
+    write_file,
 )
 from calm.dsl.decompile.environments import render_environment_template
 from calm.dsl.decompile.projects import render_project_template
@@ -25,43 +26,37 @@ LOG = get_logging_handle(__name__)
 def create_bp_file(dir_name, bp_data):
 
     bp_path = os.path.join(dir_name, "blueprint.py")
-    with open(bp_path, "w") as fd:
-        fd.write(bp_data)
+    write_file(bp_path, bp_data)
 
 
 def create_provider_file(dir_name, provider_data):
 
     provider_path = os.path.join(dir_name, "provider.py")
-    with open(provider_path, "w") as fd:
-        fd.write(provider_data)
+    write_file(provider_path, provider_data)
 
 
 def create_runbook_file(dir_name, runbook_data):
 
     runbook_path = os.path.join(dir_name, "runbook.py")
-    with open(runbook_path, "w") as fd:
-        fd.write(runbook_data)
+    write_file(runbook_path, runbook_data)
 
 
 def create_project_file(dir_name, project_data):
 
     project_path = os.path.join(dir_name, "project.py")
-    with open(project_path, "w") as fd:
-        fd.write(project_data)
+    write_file(project_path, project_data)
 
 
 def create_environment_file(dir_name, environment_data):
 
     environment_path = os.path.join(dir_name, "environment.py")
-    with open(environment_path, "w") as fd:
-        fd.write(environment_data)
+    write_file(environment_path, environment_data)
 
 
 def create_global_variable_file(dir_name, global_variable_data):
 
     gv_path = os.path.join(dir_name, "global_variable.py")
-    with open(gv_path, "w") as fd:
-        fd.write(global_variable_data)
+    write_file(gv_path, global_variable_data)
 
 
 def create_bp_dir(
@@ -1,4 +1,6 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 LOCAL_DIR = None
 SCRIPTS_DIR = None
@@ -11,111 +13,166 @@ LOCAL_DIR_KEY = ".local"
 SCRIPTS_DIR_KEY = "scripts"
 SPECS_DIR_KEY = "specs"
 
+# In-memory tree of decompiled files (path: data), written in one pass by `flush_file_tree`
+FILE_TREE = None
+FILE_TREE_DIRS = None
+FILE_WRITE_WORKERS = 8
+
+
+def init_file_tree():
+    """Files (and directories) created by decompilers are kept in memory till flushed"""
+
+    global FILE_TREE, FILE_TREE_DIRS
+    FILE_TREE = {}
+    FILE_TREE_DIRS = []
+
+
+def reset_file_tree():
+    global FILE_TREE, FILE_TREE_DIRS
+    FILE_TREE = None
+    FILE_TREE_DIRS = None
+
+
+def get_file_tree_stats():
+    """returns number of files and total size (bytes) of in-memory file tree"""
+
+    size = 0
+    for data in FILE_TREE.values():
+        size += len(data.encode("utf-8") if isinstance(data, str) else data)
+
+    return {"files": len(FILE_TREE), "dirs": len(FILE_TREE_DIRS), "size": size}
+
+
+def make_dir(dir_path):
+
+    if FILE_TREE_DIRS is not None:
+        if dir_path not in FILE_TREE_DIRS:
+            FILE_TREE_DIRS.append(dir_path)
+
+    elif not os.path.isdir(dir_path):
+        os.makedirs(dir_path)
+
+
+def _write(file_path, data):
+
+    mode = "w" if isinstance(data, str) else "wb"
+    with open(file_path, mode) as fd:
+        fd.write(data)
+
+
+def write_file(file_path, data):
+    """writes data (str or bytes) to file, or adds it to in-memory file tree"""
+
+    if FILE_TREE is not None:
+        FILE_TREE[file_path] = data
+
+    else:
+        _write(file_path, data)
+
+
+def flush_file_tree(max_workers=FILE_WRITE_WORKERS):
+    """
+    Writes in-memory file tree to disk and stops buffering files
+    Returns:
+        (float): time taken (seconds) to write the files
+    """
+
+    start_time = time.time()
+    for dir_path in FILE_TREE_DIRS:
+        if not os.path.isdir(dir_path):
+            os.makedirs(dir_path)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Raises error of first failed write
+        list(executor.map(lambda item: _write(*item), FILE_TREE.items()))
+
+    reset_file_tree()
+    return time.time() - start_time
+
 
 def make_bp_dirs(bp_dir):
 
-    if not os.path.isdir(bp_dir):
-        os.makedirs(bp_dir)
+    make_dir(bp_dir)
 
     local_dir = os.path.join(bp_dir, LOCAL_DIR_KEY)
-    if not os.path.isdir(local_dir):
-        os.makedirs(local_dir)
+    make_dir(local_dir)
 
     spec_dir = os.path.join(bp_dir, SPECS_DIR_KEY)
-    if not os.path.isdir(spec_dir):
-        os.makedirs(spec_dir)
+    make_dir(spec_dir)
 
     scripts_dir = os.path.join(bp_dir, SCRIPTS_DIR_KEY)
-    if not os.path.isdir(scripts_dir):
-        os.makedirs(scripts_dir)
+    make_dir(scripts_dir)
 
     return (bp_dir, local_dir, spec_dir, scripts_dir)
 
 
 def make_provider_dirs(provider_dir):
 
-    if not os.path.isdir(provider_dir):
-        os.makedirs(provider_dir)
+    make_dir(provider_dir)
 
     local_dir = os.path.join(provider_dir, LOCAL_DIR_KEY)
-    if not os.path.isdir(local_dir):
-        os.makedirs(local_dir)
+    make_dir(local_dir)
 
     scripts_dir = os.path.join(provider_dir, SCRIPTS_DIR_KEY)
-    if not os.path.isdir(scripts_dir):
-        os.makedirs(scripts_dir)
+    make_dir(scripts_dir)
 
     return (provider_dir, local_dir, scripts_dir)
 
 
 def make_runbook_dirs(runbook_dir):
 
-    if not os.path.isdir(runbook_dir):
-        os.makedirs(runbook_dir)
+    make_dir(runbook_dir)
 
     local_dir = os.path.join(runbook_dir, LOCAL_DIR_KEY)
-    if not os.path.isdir(local_dir):
-        os.makedirs(local_dir)
+    make_dir(local_dir)
 
     scripts_dir = os.path.join(runbook_dir, SCRIPTS_DIR_KEY)
-    if not os.path.isdir(scripts_dir):
-        os.makedirs(scripts_dir)
+    make_dir(scripts_dir)
 
     return (runbook_dir, local_dir, scripts_dir)
 
 
 def make_project_dirs(project_dir):
 
-    if not os.path.isdir(project_dir):
-        os.makedirs(project_dir)
+    make_dir(project_dir)
 
     local_dir = os.path.join(project_dir, LOCAL_DIR_KEY)
-    if not os.path.isdir(local_dir):
-        os.makedirs(local_dir)
+    make_dir(local_dir)
 
     spec_dir = os.path.join(project_dir, SPECS_DIR_KEY)
-    if not os.path.isdir(spec_dir):
-        os.makedirs(spec_dir)
+    make_dir(spec_dir)
 
     scripts_dir = os.path.join(project_dir, SCRIPTS_DIR_KEY)
-    if not os.path.isdir(scripts_dir):
-        os.makedirs(scripts_dir)
+    make_dir(scripts_dir)
 
     return (project_dir, local_dir, spec_dir, scripts_dir)
 
 
 def make_environment_dirs(environment_dir):
 
-    if not os.path.isdir(environment_dir):
-        os.makedirs(environment_dir)
+    make_dir(environment_dir)
 
     local_dir = os.path.join(environment_dir, LOCAL_DIR_KEY)
-    if not os.path.isdir(local_dir):
-        os.makedirs(local_dir)
+    make_dir(local_dir)
 
     spec_dir = os.path.join(environment_dir, SPECS_DIR_KEY)
-    if not os.path.isdir(spec_dir):
-        os.makedirs(spec_dir)
+    make_dir(spec_dir)
 
     scripts_dir = os.path.join(environment_dir, SCRIPTS_DIR_KEY)
-    if not os.path.isdir(scripts_dir):
-        os.makedirs(scripts_dir)
+    make_dir(scripts_dir)
 
     return (environment_dir, local_dir, spec_dir, scripts_dir)
 
 
 def make_global_variable_dirs(global_variable_dir):
 
-    if not os.path.isdir(global_variable_dir):
-        os.makedirs(global_variable_dir)
+    make_dir(global_variable_dir)
 
     local_dir = os.path.join(global_variable_dir, LOCAL_DIR_KEY)
-    if not os.path.isdir(local_dir):
-        os.makedirs(local_dir)
+    make_dir(local_dir)
 
     scripts_dir = os.path.join(global_variable_dir, SCRIPTS_DIR_KEY)
-    if not os.path.isdir(scripts_dir):
-        os.makedirs(scripts_dir)
+    make_dir(scripts_dir)
 
     return (global_variable_dir, local_dir, scripts_dir)
 
@@ -226,9 +283,12 @@ def get_scripts_dir_key():
 
 def init_file_globals():
     global LOCAL_DIR, SPECS_DIR, SCRIPTS_DIR, BP_DIR, PROVIDER_DIR, GLOBAL_VARIABLE_DIR
+    global FILE_TREE, FILE_TREE_DIRS
     LOCAL_DIR = None
     SCRIPTS_DIR = None
     SPECS_DIR = None
     BP_DIR = None
     PROVIDER_DIR = None
     GLOBAL_VARIABLE_DIR = None
+    FILE_TREE = None
+    FILE_TREE_DIRS = None
@@ -19,7 +19,7 @@ from calm.dsl.builtins.models.variable import VariableType
 from calm.dsl.constants import CACHE
 from calm.dsl.store import Cache
 from calm.dsl.tools import get_escaped_quotes_string
-from calm.dsl.decompile.file_handler import get_local_dir
+from calm.dsl.decompile.file_handler import get_local_dir, write_file
 from calm.dsl.decompile.decompile_helpers import modify_var_format
 
 from calm.dsl.log import get_logging_handle
@@ -527,8 +527,7 @@ def create_file_from_file_name(file_name):
     file_loc = os.path.join(get_local_dir(), file_name)
 
     # Storing empty value in the file
-    with open(file_loc, "w+") as fd:
-        fd.write("")
+    write_file(file_loc, "")
 
     NDB_FILES.append(file_name)
 
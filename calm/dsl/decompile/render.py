@@ -1,17 +1,90 @@
-from jinja2 import Environment, PackageLoader
+import os
+import time
+
+from jinja2 import Environment, FileSystemBytecodeCache, PackageLoader
+
+from calm.dsl.tools.artifact_cache import ARTIFACT_CACHE_DIR
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+TEMPLATE_BYTECODE_DIR = os.path.join(ARTIFACT_CACHE_DIR, "jinja2")
+
+_TEMPLATE_ENV = None
+
+# Render time(in seconds) and count per template, collected if enabled
+_RENDER_STATS = None
+
+
+def get_template_env():
+    """
+    returns jinja environment shared by all templates. Environment keeps the
+    compiled templates in memory and compiled bytecode is cached on disk, so
+    templates are compiled only when their source changes.
+    """
+
+    global _TEMPLATE_ENV
+    if _TEMPLATE_ENV is None:
+        loader = PackageLoader(__name__, "schemas")
+        bytecode_cache = None
+        try:
+            # Bytecode is invalidated by jinja if template source changes
+            os.makedirs(TEMPLATE_BYTECODE_DIR, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(TEMPLATE_BYTECODE_DIR)
+
+        except OSError as exp:
+            LOG.debug("Template bytecode cache is disabled: {}".format(exp))
+
+        # Templates are part of package, so they are never reloaded
+        _TEMPLATE_ENV = Environment(
+            loader=loader,
+            bytecode_cache=bytecode_cache,
+            cache_size=-1,
+            auto_reload=False,
+        )
+
+    return _TEMPLATE_ENV
 
 
 def get_template(schema_file):
 
-    loader = PackageLoader(__name__, "schemas")
-    env = Environment(loader=loader)
+    env = get_template_env()
     template = env.get_template(schema_file)
     return template
 
 
 def render_template(schema_file, obj):
 
+    start_time = time.perf_counter() if _RENDER_STATS is not None else None
+
     template = get_template(schema_file)
     text = template.render(obj=obj)
 
+    if start_time is not None:
+        render_count, render_time = _RENDER_STATS.get(schema_file, (0, 0.0))
+        _RENDER_STATS[schema_file] = (
+            render_count + 1,
+            render_time + time.perf_counter() - start_time,
+        )
+
     return text.strip()
+
+
+def enable_render_stats():
+    """starts collecting render count and time per template"""
+
+    global _RENDER_STATS
+    _RENDER_STATS = {}
+
+
+def disable_render_stats():
+    """stops collecting render stats, dropping the collected ones"""
+
+    global _RENDER_STATS
+    _RENDER_STATS = None
+
+
+def get_render_stats():
+    """returns template to (render count, total render time) map"""
+
+    return dict(_RENDER_STATS or {})
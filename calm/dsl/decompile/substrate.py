@@ -4,7 +4,7 @@ import os
 from calm.dsl.decompile.render import render_template
 from calm.dsl.decompile.action import render_action_template
 from calm.dsl.decompile.readiness_probe import render_readiness_probe_template
-from calm.dsl.decompile.file_handler import get_specs_dir, get_specs_dir_key
+from calm.dsl.decompile.file_handler import get_specs_dir, get_specs_dir_key, write_file
 from calm.dsl.builtins import SubstrateType, get_valid_identifier
 from calm.dsl.decompile.ahv_vm import render_ahv_vm
 from calm.dsl.store import Cache
@@ -71,8 +71,9 @@ def render_substrate_template(
         )
 
         # Write editable spec to separate file
-        with open(file_location, "w+") as fd:
-            fd.write(yaml.dump(create_spec_editables, default_flow_style=False))
+        write_file(
+            file_location, yaml.dump(create_spec_editables, default_flow_style=False)
+        )
 
     # Handle provider_spec for substrate
     provider_spec = cls.provider_spec
@@ -109,8 +110,7 @@ def render_substrate_template(
 
         # Write provider spec to separate file
         file_location = os.path.join(spec_dir, provider_spec_file_name)
-        with open(file_location, "w+") as fd:
-            fd.write(yaml.dump(provider_spec, default_flow_style=False))
+        write_file(file_location, yaml.dump(provider_spec, default_flow_style=False))
 
     # Actions
     action_list = []
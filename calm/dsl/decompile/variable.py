@@ -4,7 +4,7 @@ from calm.dsl.decompile.render import render_template
 from calm.dsl.decompile.endpoint import render_endpoint
 from calm.dsl.decompile.task import render_task_template
 from calm.dsl.builtins import VariableType, TaskType, CalmEndpoint as Endpoint
-from calm.dsl.decompile.file_handler import get_local_dir
+from calm.dsl.decompile.file_handler import get_local_dir, write_file
 from calm.dsl.log import get_logging_handle
 from calm.dsl.constants import VARIABLE
 
@@ -237,8 +237,7 @@ def get_secret_var_val(entity_context, value=""):
     SECRET_VAR_FILES.append(entity_context)
     file_location = os.path.join(get_local_dir(), entity_context)
 
-    with open(file_location, "w+") as fd:
-        fd.write(value)
+    write_file(file_location, value)
 
     # Replace read_local_file by a constant
     return entity_context
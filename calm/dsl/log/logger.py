@@ -1,5 +1,5 @@
 import logging
-import inspect
+import json
 
 from colorlog import ColoredFormatter
 import time
@@ -13,6 +13,40 @@ class StdErrFilter(logging.Filter):
         return rec.levelno >= logging.DEBUG
 
 
+class JsonFormatter(logging.Formatter):
+    """Formats log records as json lines, used by `json` log format"""
+
+    # Attributes of LogRecord, anything else is supplied by caller using `extra`
+    RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def format(self, record):
+        log_entry = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+            + ".{:03d}Z".format(int(record.msecs)),
+            "level": record.levelname,
+            "module": record.name,
+            "file": record.pathname,
+            "func": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+            # Time elapsed since start of process
+            "elapsed_ms": round(record.relativeCreated, 3),
+        }
+
+        # Fields supplied using `extra` ex: LOG.info(msg, extra={"duration": 1.2})
+        for key, value in vars(record).items():
+            if key not in self.RECORD_ATTRS:
+                log_entry[key] = value
+
+        if record.exc_info:
+            log_entry["exc_info"] = self.formatException(record.exc_info)
+
+        if record.stack_info:
+            log_entry["stack_info"] = self.formatStack(record.stack_info)
+
+        return json.dumps(log_entry, default=str)
+
+
 class CustomLogging:
     """
     customization on logging module.
@@ -32,6 +66,13 @@ class CustomLogging:
     _VERBOSE_LEVEL = 20
     _SHOW_TRACE = False
 
+    TEXT_FORMAT = "text"
+    JSON_FORMAT = "json"
+    _LOG_FORMAT = TEXT_FORMAT
+
+    # Console handlers of all loggers, used to switch log format
+    _HANDLERS = []
+
     DEBUG = logging.DEBUG
     INFO = logging.INFO
     WARNING = logging.WARNING
@@ -56,6 +97,7 @@ class CustomLogging:
 
         # add custom formatter to console handler
         self.__addCustomFormatter(self._ch1)
+        CustomLogging._HANDLERS.append(self._ch1)
 
         # create custom logger
         self._logger = logging.getLogger(name)
@@ -68,13 +110,17 @@ class CustomLogging:
 
     @staticmethod
     def __add_caller_info(msg):
-        stack = inspect.stack()
+        # Json records carry caller info in their own fields (see `stacklevel`)
+        if CustomLogging._LOG_FORMAT == CustomLogging.JSON_FORMAT:
+            return msg
 
-        # filename = stack[2][1]
-        # func = stack[2][3]
-        ln = stack[2][2]
+        # Frame of caller of the logging method (info, debug etc.)
+        frame = sys._getframe(2)
+        ln = frame.f_lineno
         if CustomLogging.IS_RP_ENABLED:
-            ln = "{}-{}:{}".format(stack[2][1], stack[2][3], stack[2][2])
+            ln = "{}-{}:{}".format(
+                frame.f_code.co_filename, frame.f_code.co_name, frame.f_lineno
+            )
 
         return ":{}] {}".format(ln, msg)
 
@@ -86,8 +132,30 @@ class CustomLogging:
     def enable_show_trace(cls):
         cls._SHOW_TRACE = True
 
+    @classmethod
+    def set_log_format(cls, log_format):
+        """sets the format(text/json) of logs emitted by all loggers"""
+
+        if log_format not in cls.get_log_formats():
+            raise ValueError(
+                "Invalid log format. Select from {}".format(cls.get_log_formats())
+            )
+
+        cls._LOG_FORMAT = log_format
+        for handler in cls._HANDLERS:
+            if log_format == cls.JSON_FORMAT:
+                handler.setFormatter(JsonFormatter())
+            else:
+                cls.__addCustomFormatter(handler)
+
+    @classmethod
+    def get_log_formats(cls):
+        return [cls.TEXT_FORMAT, cls.JSON_FORMAT]
+
     def get_logger(self):
-        self.set_logger_level(self._VERBOSE_LEVEL)
+        # Setting level clears level cache of all loggers, so set it only on change
+        if self._logger.level != self._VERBOSE_LEVEL:
+            self.set_logger_level(self._VERBOSE_LEVEL)
         self.show_trace = self._SHOW_TRACE
         return self._logger
 
@@ -110,12 +178,16 @@ class CustomLogging:
             None
         """
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.INFO):
+            return
 
+        # Every json record should be on its own line
+        nl = nl or self._LOG_FORMAT == self.JSON_FORMAT
         if not nl:
             for handler in logger.handlers:
                 handler.terminator = " "
 
-        logger.info(self.__add_caller_info(msg), **kwargs)
+        logger.info(self.__add_caller_info(msg), stacklevel=2, **kwargs)
 
         if not nl:
             for handler in logger.handlers:
@@ -133,7 +205,12 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
-        return logger.warning(self.__add_caller_info(msg), *args, **kwargs)
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+
+        return logger.warning(
+            self.__add_caller_info(msg), *args, stacklevel=2, **kwargs
+        )
 
     def error(self, msg, *args, **kwargs):
         """
@@ -147,9 +224,12 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.ERROR):
+            return
+
         if self.show_trace:
             kwargs["stack_info"] = sys.exc_info()
-        return logger.error(self.__add_caller_info(msg), *args, **kwargs)
+        return logger.error(self.__add_caller_info(msg), *args, stacklevel=2, **kwargs)
 
     def exception(self, msg, *args, **kwargs):
         """
@@ -163,11 +243,18 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.ERROR):
+            return
+
         exc_info = False
         if self.show_trace:
             exc_info = True
         return logger.exception(
-            self.__add_caller_info(msg), exc_info=exc_info, *args, **kwargs
+            self.__add_caller_info(msg),
+            exc_info=exc_info,
+            stacklevel=2,
+            *args,
+            **kwargs,
         )
 
     def critical(self, msg, *args, **kwargs):
@@ -182,9 +269,14 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.CRITICAL):
+            return
+
         if self.show_trace:
             kwargs["stack_info"] = sys.exc_info()
-        return logger.critical(self.__add_caller_info(msg), *args, **kwargs)
+        return logger.critical(
+            self.__add_caller_info(msg), *args, stacklevel=2, **kwargs
+        )
 
     def debug(self, msg, *args, **kwargs):
         """
@@ -198,9 +290,13 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
-        return logger.debug(self.__add_caller_info(msg), *args, **kwargs)
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        return logger.debug(self.__add_caller_info(msg), *args, stacklevel=2, **kwargs)
 
-    def __addCustomFormatter(self, ch):
+    @staticmethod
+    def __addCustomFormatter(ch):
         """
         add ColorFormatter with custom colors for each log level
 
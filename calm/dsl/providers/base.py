@@ -1,15 +1,28 @@
 from collections import OrderedDict
 from io import StringIO
+import importlib
 import json
+import os
+import threading
 
 from ruamel import yaml
 from jinja2 import Environment, PackageLoader
 import jsonref
-from calm.dsl.tools import StrictDraft7Validator
+from calm.dsl.tools import StrictDraft7Validator, resolve_json_refs
+from calm.dsl.tools.artifact_cache import (
+    get_artifact_key,
+    get_files_digest,
+    load_artifact,
+    save_artifact,
+)
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
 
+PROVIDER_SPEC_ARTIFACT_NAME = "provider_spec_{}"
+
+_SPEC_LOCK = threading.RLock()
+
 
 class ProviderBase:
 
@@ -37,6 +50,10 @@ class Provider(ProviderBase):
 
     @classmethod
     def _init(cls):
+        """
+        Called while registering the provider. Provider spec and its validator
+        are built on first use, so that unused providers cost nothing.
+        """
 
         if cls.package_name is None:
             raise NotImplementedError("Package name not given")
@@ -44,6 +61,20 @@ class Provider(ProviderBase):
         if cls.spec_template_file is None:
             raise NotImplementedError("Spec file not given")
 
+        cls._provider_spec = None
+        cls._validator = None
+
+    @classmethod
+    def _get_spec_template_path(cls):
+        package = importlib.import_module(cls.package_name)
+        return os.path.join(
+            os.path.dirname(os.path.abspath(package.__file__)), cls.spec_template_file
+        )
+
+    @classmethod
+    def _render_provider_spec(cls):
+        """returns provider spec rendered from spec template with resolved refs"""
+
         loader = PackageLoader(cls.package_name, "")
         env = Environment(loader=loader)
         template = env.get_template(cls.spec_template_file)
@@ -51,16 +82,43 @@ class Provider(ProviderBase):
         tdict = jsonref.loads(json.dumps(tdict))
 
         # TODO - Check if keys are present
-        cls.provider_spec = tdict["components"]["schemas"]["provider_spec"]
-        cls.Validator = StrictDraft7Validator(cls.provider_spec)
+        return resolve_json_refs(tdict["components"]["schemas"]["provider_spec"])
+
+    @classmethod
+    def _load_provider_spec(cls):
+        """returns provider spec from artifact cache, rendering it on a miss"""
+
+        artifact_name = PROVIDER_SPEC_ARTIFACT_NAME.format(cls.provider_type.lower())
+        artifact_key = get_artifact_key(
+            cls.package_name,
+            get_files_digest([cls._get_spec_template_path()]),
+        )
+
+        provider_spec = load_artifact(artifact_name, artifact_key)
+        if provider_spec is None:
+            LOG.debug("Rendering provider spec of {}".format(cls.provider_type))
+            provider_spec = cls._render_provider_spec()
+            save_artifact(artifact_name, artifact_key, provider_spec)
+
+        return provider_spec
 
     @classmethod
     def get_provider_spec(cls):
-        return cls.provider_spec
+        if cls._provider_spec is None:
+            with _SPEC_LOCK:
+                if cls._provider_spec is None:
+                    cls._provider_spec = cls._load_provider_spec()
+
+        return cls._provider_spec
 
     @classmethod
     def get_validator(cls):
-        return cls.Validator
+        if cls._validator is None:
+            with _SPEC_LOCK:
+                if cls._validator is None:
+                    cls._validator = StrictDraft7Validator(cls.get_provider_spec())
+
+        return cls._validator
 
     @classmethod
     def validate_spec(cls, spec):
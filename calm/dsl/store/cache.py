@@ -1,14 +1,25 @@
 import click
+import contextlib
+import datetime
+import os
+import subprocess
 import sys
+import threading
+import time
 import traceback
+import arrow
+from prettytable import PrettyTable
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from peewee import OperationalError, IntegrityError
 from distutils.version import LooseVersion as LV
 
 from calm.dsl.config import get_context
+from calm.dsl.constants import CACHE
 from .version import Version
 from calm.dsl.db import get_db_handle, init_db_handle
+from calm.dsl.db.table_config import highlight_text
 from calm.dsl.log import get_logging_handle
-from calm.dsl.api import get_client_handle_obj
+from calm.dsl.api import get_client_handle_obj, get_api_client
 from calm.dsl.api.util import get_auth_info
 
 LOG = get_logging_handle(__name__)
@@ -17,6 +28,17 @@ LOG = get_logging_handle(__name__)
 class Cache:
     """Cache class Implementation"""
 
+    # Entities fetched on cache misses ((entity_type, name or uuid): time till it is not fetched again)
+    _fault_in_expiry_times = {}
+
+    # Tables checked for staleness (on first access) by this process
+    _checked_tables = set()
+    _refresh_lock = threading.Lock()
+
+    # Count of syncs in progress (by any thread), stale tables are not refreshed meanwhile
+    _sync_lock = threading.Lock()
+    _sync_count = 0
+
     @classmethod
     def get_cache_tables(cls, sync_version=False):
         """returns tables used for cache purpose"""
@@ -87,6 +109,9 @@ class Cache:
             )
             sys.exit(-1)
 
+        if not res and cls._fault_in(db_cls, entity_type, name=name):
+            res = db_cls.get_entity_data(name=name, **kwargs)
+
         if not res:
             kwargs["name"] = name
             LOG.debug(
@@ -113,6 +138,9 @@ class Cache:
             )
             sys.exit(-1)
 
+        if not res and cls._fault_in(db_cls, entity_type, uuid=uuid):
+            res = db_cls.get_entity_data_using_uuid(uuid=uuid, **kwargs)
+
         if not res:
             kwargs["uuid"] = uuid
             LOG.debug(
@@ -123,6 +151,31 @@ class Cache:
 
         return res
 
+    @classmethod
+    def _fault_in(cls, db_cls, entity_type, name=None, uuid=None):
+        """
+        Fetches entity missing in cache from server (see CacheTableBase.fault_in).
+        An entity is fetched once in CACHE.FAULT_IN_MISS_TTL seconds, so repeated
+        misses (ex: entity not present on server) do not call the server again.
+        Returns:
+            (bool): True if entity is added to cache
+        """
+
+        if not (db_cls.supports_fault_in() and (uuid or name)):
+            return False
+
+        key = (entity_type, uuid or name)
+        if cls._fault_in_expiry_times.get(key, 0) > time.monotonic():
+            return False
+
+        cls._fault_in_expiry_times[key] = time.monotonic() + CACHE.FAULT_IN_MISS_TTL
+        try:
+            return db_cls.fault_in(name=name, uuid=uuid)
+
+        except OperationalError:
+            LOG.debug("Exception Traceback:\n{}".format(traceback.format_exc()))
+            return False
+
     @classmethod
     def get_entity_db_table_object(cls, entity_type):
         """returns database entity table object corresponding to entity"""
@@ -137,8 +190,73 @@ class Cache:
             LOG.error("Unknown entity type ({}) supplied".format(entity_type))
             sys.exit(-1)
 
+        cls._refresh_if_stale(db_cls)
         return db_cls
 
+    @classmethod
+    def get_sync_state(cls, table, sync_data=None):
+        """returns sync state (CACHE.SYNC_STATE) of table using data of its last sync"""
+
+        if sync_data is None:
+            db = get_db_handle()
+            sync_data = db.cache_sync_table.get_entity_data(table.get_cache_type())
+
+        if not sync_data:
+            return CACHE.SYNC_STATE.NOT_SYNCED
+
+        ttl = table.get_sync_ttl()
+        age = datetime.datetime.now() - sync_data["last_sync_time"]
+        if ttl > 0 and age.total_seconds() > ttl:
+            return CACHE.SYNC_STATE.STALE
+
+        return CACHE.SYNC_STATE.FRESH
+
+    @classmethod
+    @contextlib.contextmanager
+    def _syncing(cls):
+        """marks cache as being synced while the context is active"""
+
+        with cls._sync_lock:
+            cls._sync_count += 1
+        try:
+            yield
+
+        finally:
+            with cls._sync_lock:
+                cls._sync_count -= 1
+
+    @classmethod
+    def _refresh_if_stale(cls, table):
+        """
+        Syncs table on its first access by the process, if data of its last sync is stale.
+        Tables never synced by 'calm update cache' are not synced on access.
+        """
+
+        if cls._sync_count or table in cls._checked_tables:
+            return
+
+        with cls._refresh_lock:
+            if table in cls._checked_tables:
+                return
+            cls._checked_tables.add(table)
+
+        try:
+            if cls.get_sync_state(table) != CACHE.SYNC_STATE.STALE:
+                return
+
+            LOG.info("Refreshing stale cache table '{}'".format(table.get_cache_type()))
+            with cls._syncing():
+                cls._sync_tables([table])
+
+        # Stale data is used if server is not reachable
+        except (Exception, SystemExit):
+            LOG.debug("Exception Traceback:\n{}".format(traceback.format_exc()))
+            LOG.warning(
+                "Unable to refresh stale cache table '{}'".format(
+                    table.get_cache_type()
+                )
+            )
+
     @classmethod
     def add_one(cls, entity_type, uuid, **kwargs):
         """adds one entity to entity db object"""
@@ -160,43 +278,148 @@ class Cache:
         db_obj = cls.get_entity_db_table_object(entity_type)
         db_obj.update_one(uuid, **kwargs)
 
+    @classmethod
+    def _echo_table_sync_stats(cls, cache_type, sync_time, counts=None):
+        """prints time taken to sync a table along with the rows changed"""
+
+        msg = "  {:<32}{:>8.2f}s".format(cache_type, sync_time)
+        if counts:
+            msg += "  (+{} ~{} -{})".format(*counts)
+        click.echo(msg, err=True)
+
+    @classmethod
+    def _sync_tables(cls, tables, max_workers=CACHE.SYNC_MAX_WORKERS):
+        """
+        Fetches data of tables concurrently and applies the changes of each
+        table (on the calling thread) as soon as its data arrives.
+        Tables listed in `sync_dependencies` of a table are synced before it.
+        """
+
+        db = get_db_handle()
+
+        # Initialize the api client before sharing it across worker threads
+        get_api_client()
+
+        def fetch_rows(table):
+            start_time = time.time()
+            try:
+                return table.fetch_sync_rows(), time.time() - start_time
+
+            finally:
+                # Close the db connection opened by this worker thread (if any)
+                db.db.close()
+
+        pending_tables = list(tables)
+        synced_tables = set()
+        future_table_map = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending_tables or future_table_map:
+                for table in list(pending_tables):
+                    dependencies = [
+                        _table
+                        for _table in table.sync_dependencies
+                        if _table in tables and _table not in synced_tables
+                    ]
+                    if not dependencies:
+                        pending_tables.remove(table)
+                        future_table_map[executor.submit(fetch_rows, table)] = table
+
+                if not future_table_map:
+                    # Dependencies can not be resolved, sync remaining tables in order
+                    table = pending_tables.pop(0)
+                    future_table_map[executor.submit(fetch_rows, table)] = table
+
+                done_futures, _ = wait(future_table_map, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    table = future_table_map.pop(future)
+                    synced_tables.add(table)
+                    cache_type = table.get_cache_type()
+                    try:
+                        rows, fetch_time = future.result()
+                        start_time = time.time()
+                        counts = table.apply_sync_rows(rows)
+                        sync_time = fetch_time + time.time() - start_time
+                        db.cache_sync_table.record_sync(cache_type, sync_time)
+                        cls._echo_table_sync_stats(cache_type, sync_time, counts)
+
+                    except Exception:
+                        LOG.debug(
+                            "Exception Traceback:\n{}".format(traceback.format_exc())
+                        )
+                        LOG.error("Cache sync failed for '{}' table".format(cache_type))
+
     @classmethod
     def sync(cls):
         """Sync cache by latest data"""
 
         def sync_tables(tables):
-            for table in tables:
-                try:
-                    LOG.debug(
-                        "Syncing cache for '{}' table".format(table.get_cache_type())
-                    )
-                    table.sync()
-                except Exception as exp:
-                    LOG.error(
-                        "Cache sync failed for '{}' table".format(
-                            table.get_cache_type()
-                        )
-                    )
-                click.echo(".", nl=False, err=True)
+            start_time = time.time()
+            LOG.debug("Syncing cache for '{}' table".format(Version.get_cache_type()))
+            Version.sync()
+            cls._echo_table_sync_stats(
+                Version.get_cache_type(), time.time() - start_time
+            )
+            cls._sync_tables(tables)
+            click.echo("[Done] ({:.2f}s)".format(time.time() - start_time), err=True)
 
         cache_table_map = cls.get_cache_tables(sync_version=True)
         tables = list(cache_table_map.values())
 
-        # Inserting version table at start
-        tables.insert(0, Version)
+        with cls._syncing():
+            try:
+                LOG.info("Updating cache")
+                sync_tables(tables)
 
-        try:
-            LOG.info("Updating cache", nl=False)
-            sync_tables(tables)
-
-        except (OperationalError, IntegrityError):
-            click.echo(" [Fail]")
-            # init db handle once (recreating db if some schema changes are there)
-            LOG.info("Removing existing db and updating cache again")
-            init_db_handle()
-            LOG.info("Updating cache", nl=False)
-            sync_tables(tables)
-        click.echo(" [Done]", err=True)
+            except (OperationalError, IntegrityError):
+                click.echo("[Fail]", err=True)
+                # init db handle once (recreating db if some schema changes are there)
+                LOG.info("Removing existing db and updating cache again")
+                init_db_handle()
+                LOG.info("Updating cache")
+                sync_tables(tables)
+
+    @classmethod
+    def sync_stale_tables(cls):
+        """Syncs cache tables which are stale or never synced"""
+
+        db = get_db_handle()
+        tables = [
+            table
+            for table in cls.get_cache_tables().values()
+            if cls.get_sync_state(
+                table, db.cache_sync_table.get_entity_data(table.get_cache_type())
+            )
+            != CACHE.SYNC_STATE.FRESH
+        ]
+        if not tables:
+            LOG.info("No stale table found in cache")
+            return
+
+        LOG.info("Updating {} stale tables of cache".format(len(tables)))
+        start_time = time.time()
+        with cls._syncing():
+            cls._sync_tables(tables)
+        click.echo("[Done] ({:.2f}s)".format(time.time() - start_time), err=True)
+
+    @classmethod
+    def sync_stale_tables_in_background(cls, config_file=None):
+        """Starts a detached process syncing stale tables of cache, returns its pid"""
+
+        command = [sys.executable, "-c", "from calm.dsl.cli import main; main()"]
+        if config_file:
+            command.extend(["--config", config_file])
+        command.extend(["update", "cache", "--stale"])
+
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            env=os.environ.copy(),
+        )
+        return process.pid
 
     @classmethod
     def sync_table(cls, cache_type):
@@ -208,14 +431,19 @@ class Cache:
         cache_type = [cache_type] if not isinstance(cache_type, list) else cache_type
         cache_table_map = cls.get_cache_tables()
 
-        for _ct in cache_type:
-            if _ct not in cache_table_map:
-                LOG.warning("Invalid cache_type ('{}') provided".format(cache_type))
-                continue
+        with cls._syncing():
+            for _ct in cache_type:
+                if _ct not in cache_table_map:
+                    LOG.warning("Invalid cache_type ('{}') provided".format(cache_type))
+                    continue
+
+                cache_table = cache_table_map[_ct]
+                start_time = time.time()
+                counts = cache_table.apply_sync_rows(cache_table.fetch_sync_rows())
+                sync_time = time.time() - start_time
+                get_db_handle().cache_sync_table.record_sync(_ct, sync_time)
+                cls._echo_table_sync_stats(_ct, sync_time, counts)
 
-            cache_table = cache_table_map[_ct]
-            cache_table.sync()
-            click.echo(".", nl=False, err=True)
         click.echo("[Done]", err=True)
 
     @classmethod
@@ -242,6 +470,39 @@ class Cache:
                 )
                 sys.exit(-1)
 
+    @classmethod
+    def show_sync_data(cls):
+        """Display time of last sync, sync duration and state of every cache table"""
+
+        db = get_db_handle()
+        table = PrettyTable()
+        table.field_names = [
+            "TABLE",
+            "LAST SYNCED",
+            "SYNC TIME (S)",
+            "TTL (S)",
+            "STATE",
+        ]
+        for cache_type, cache_table in cls.get_cache_tables().items():
+            sync_data = db.cache_sync_table.get_entity_data(cache_type)
+            last_sync_time = sync_duration = "-"
+            if sync_data:
+                last_sync_time = arrow.get(
+                    sync_data["last_sync_time"].astimezone(datetime.timezone.utc)
+                ).humanize()
+                sync_duration = "{:.2f}".format(sync_data["sync_duration"])
+
+            table.add_row(
+                [
+                    highlight_text(cache_type),
+                    highlight_text(last_sync_time),
+                    highlight_text(sync_duration),
+                    highlight_text(cache_table.get_sync_ttl()),
+                    highlight_text(cls.get_sync_state(cache_table, sync_data)),
+                ]
+            )
+        click.echo(table)
+
     @classmethod
     def show_table(cls, cache_type):
         """sync the cache table provided in cache_type list"""
@@ -1,8 +1,10 @@
 import datetime
 import uuid
 import peewee
+from concurrent.futures import ThreadPoolExecutor
 
 from ..crypto import Crypto
+from calm.dsl.constants import SECRET_STORE
 from calm.dsl.db import get_db_handle
 from calm.dsl.log import get_logging_handle
 
@@ -114,6 +116,46 @@ class Secret:
 
         return secret_val
 
+    @classmethod
+    def find_many(cls, names, pass_phrase=None):
+        """
+        Find the values of multiple secrets. Secrets are fetched using a single
+        query and decrypted concurrently.
+        Returns:
+            (dict): secret name to value mapping, names not present in db are skipped
+        """
+
+        db = get_db_handle()
+        names = list(set(names))
+        if not names:
+            return {}
+
+        # Secret name is the primary key of secret table, so it is the foreign key
+        query = db.data_table.select().where(db.data_table.secret_ref.in_(names))
+
+        if pass_phrase:
+            pass_phrase = pass_phrase.encode()
+
+        def decrypt(secret_data):
+            LOG.debug("Decrypting data of secret {}".format(secret_data.secret_ref_id))
+            return Crypto.decrypt_AES_GCM(
+                secret_data.generate_enc_msg(), pass_phrase or secret_data.pass_phrase
+            )
+
+        secret_data_list = list(query)
+        max_workers = min(SECRET_STORE.DECRYPT_MAX_WORKERS, len(secret_data_list))
+        if max_workers <= 1:
+            secret_values = [decrypt(secret_data) for secret_data in secret_data_list]
+        else:
+            # scrypt key derivation releases the GIL, so threads decrypt in parallel
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                secret_values = list(executor.map(decrypt, secret_data_list))
+
+        return {
+            secret_data.secret_ref_id: secret_value
+            for secret_data, secret_value in zip(secret_data_list, secret_values)
+        }
+
     @classmethod
     def clear(cls):
         """Deletes all the secrets present in the data"""
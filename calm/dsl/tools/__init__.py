@@ -1,6 +1,12 @@
 from .ping import ping
 from .validator import StrictDraft7Validator
-from .utils import get_module_from_file, make_file_dir, get_escaped_quotes_string
+from .utils import (
+    get_module_from_file,
+    is_shared_module,
+    make_file_dir,
+    get_escaped_quotes_string,
+    resolve_json_refs,
+)
 
 
 __all__ = [
@@ -8,6 +14,8 @@ __all__ = [
     "ping",
     "StrictDraft7Validator",
     "get_module_from_file",
+    "is_shared_module",
     "make_file_dir",
     "get_escaped_quotes_string",
+    "resolve_json_refs",
 ]
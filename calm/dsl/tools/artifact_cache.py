@@ -0,0 +1,105 @@
+"""
+artifact_cache: Stores artifacts derived from package data (compiled schemas,
+provider specs etc.) on disk, so that they are built once and reused across
+`calm` invocations.
+
+Every artifact is stored along with a key. A stored artifact is used only if
+its key matches the key supplied while loading it, so keys should be derived
+from everything the artifact depends on (dsl version, content of source files).
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import threading
+
+from calm.dsl.log import get_logging_handle
+from .utils import make_file_dir
+
+LOG = get_logging_handle(__name__)
+
+ARTIFACT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".calm", ".cache")
+
+
+def get_dsl_version():
+    """returns version of installed dsl package"""
+
+    try:
+        from importlib.metadata import version
+
+        return version("ntnx-ncm-dsl")
+
+    except Exception:
+        return ""
+
+
+def get_files_digest(file_paths):
+    """returns sha256 digest of content of supplied files"""
+
+    digest = hashlib.sha256()
+    for file_path in sorted(file_paths):
+        digest.update(os.path.basename(file_path).encode("utf-8"))
+        with open(file_path, "rb") as fd:
+            digest.update(fd.read())
+
+    return digest.hexdigest()
+
+
+def get_artifact_key(*parts):
+    """returns key for artifact built from supplied parts and current interpreter"""
+
+    parts = (sys.version, get_dsl_version()) + tuple(str(part) for part in parts)
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_artifact_path(name):
+    """returns location of artifact on disk"""
+
+    return os.path.join(ARTIFACT_CACHE_DIR, "{}.pickle".format(name))
+
+
+def load_artifact(name, key):
+    """returns data stored for artifact if stored key matches with supplied key"""
+
+    artifact_path = get_artifact_path(name)
+    if not os.path.exists(artifact_path):
+        return None
+
+    try:
+        with open(artifact_path, "rb") as fd:
+            artifact = pickle.load(fd)
+
+    except Exception as exp:
+        LOG.debug("Unable to load artifact '{}': {}".format(name, exp))
+        return None
+
+    if not isinstance(artifact, dict) or artifact.get("key") != key:
+        LOG.debug("Artifact '{}' is outdated".format(name))
+        return None
+
+    return artifact["data"]
+
+
+def save_artifact(name, key, data, mode=0o666):
+    """
+    stores artifact data on disk(file permissions are limited by mode).
+    Failures are ignored as artifacts can be rebuilt.
+    """
+
+    artifact_path = get_artifact_path(name)
+    tmp_path = "{}.{}.{}.tmp".format(artifact_path, os.getpid(), threading.get_ident())
+    try:
+        make_file_dir(artifact_path)
+        with os.fdopen(
+            os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode), "wb"
+        ) as fd:
+            pickle.dump({"key": key, "data": data}, fd, pickle.HIGHEST_PROTOCOL)
+
+        # Replace atomically, so that concurrent processes never read partial file
+        os.replace(tmp_path, artifact_path)
+
+    except Exception as exp:
+        LOG.debug("Unable to save artifact '{}': {}".format(name, exp))
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -1,12 +1,22 @@
 import importlib.util
 import os
 import sys
+import sysconfig
 import errno
 
+import jsonref
+
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
 
+# Modules loaded from these directories (python, installed packages and dsl) are
+# not specific to a dsl file
+SHARED_MODULE_DIRS = [
+    sysconfig.get_paths()[name]
+    for name in ["stdlib", "platstdlib", "purelib", "platlib"]
+] + [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+
 
 def make_file_dir(path, is_dir=False):
     """creates the file directory if not present"""
@@ -24,6 +34,17 @@ def make_file_dir(path, is_dir=False):
         os.makedirs(path)
 
 
+def is_shared_module(module):
+    """returns True if module is not loaded from a dsl file (or its local modules)"""
+
+    module_file = getattr(module, "__file__", None)
+    if not module_file:
+        return True
+
+    module_file = os.path.abspath(module_file)
+    return any(module_file.startswith(path + os.sep) for path in SHARED_MODULE_DIRS)
+
+
 def get_module_from_file(module_name, file):
     """Returns a module given a user python file (.py)"""
     spec = importlib.util.spec_from_file_location(module_name, file)
@@ -38,6 +59,21 @@ def get_module_from_file(module_name, file):
     return user_module
 
 
+def resolve_json_refs(obj):
+    """returns copy of object with all json references replaced by plain objects"""
+
+    if isinstance(obj, jsonref.JsonRef):
+        obj = obj.__subject__
+
+    if isinstance(obj, dict):
+        return {k: resolve_json_refs(v) for k, v in obj.items()}
+
+    elif isinstance(obj, list):
+        return [resolve_json_refs(v) for v in obj]
+
+    return obj
+
+
 def get_escaped_quotes_string(val):
     """Returns a string with backslash support"""
 
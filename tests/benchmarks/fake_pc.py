@@ -0,0 +1,409 @@
+"""
+Local stand-in of Prism Central (Calm apis) used by benchmarks.
+
+Serves list (offset/length, `name==` filters), read and create calls for
+apps, blueprints, projects, subnets, clusters, accounts, users and runlogs,
+groups calls, and
+the version calls made while syncing cache. Every entity kind has a
+configurable number of synthetic entities and every request a configurable
+latency, so that client side cost can be measured with realistic server round
+trips. Runlogs of an app stay RUNNING for `runlog_polls` list calls and then
+turn SUCCESS. Server is served over https (self-signed certificate generated
+by openssl), as some calls of dsl (ex: version check while syncing cache)
+always use https.
+
+Usage:
+    with FakePrismCentral(latency=0.005, counts={"apps": 1000}) as fake_pc:
+        fake_pc.use()  # Points api client of dsl to the fake server
+"""
+
+import json
+import os
+import re
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from calm.dsl.api import reset_api_client_handle
+from calm.dsl.api.handle import update_api_client
+from calm.dsl.api.connection import REQUEST
+from calm.dsl.config import get_context
+from calm.dsl.config.constants import CONFIG
+
+API_PREFIXES = ["api/nutanix/v3/nutanix/v1/", "api/nutanix/v3/", "api/calm/v3.0/"]
+CALM_VERSION = "4.0.0"
+PC_VERSION = "pc.2024.1"
+
+# Entities referred by other kinds (clusters by accounts, subnets by projects) are created first
+DEFAULT_COUNTS = {
+    "users": 1,
+    "clusters": 2,
+    "accounts": 2,
+    "subnets": 50,
+    "projects": 10,
+    "blueprints": 100,
+    "apps": 100,
+}
+
+NAME_FILTER_RE = re.compile(r"name==([^;,)]+)")
+RUNLOG_LIST_RE = re.compile(r"^apps/([^/]+)/app_runlogs/list$")
+
+
+def is_supported():
+    """returns True if certificate of fake server can be generated"""
+
+    return shutil.which("openssl") is not None
+
+
+def _generate_certificate(cert_dir):
+    cert_file = os.path.join(cert_dir, "cert.pem")
+    key_file = os.path.join(cert_dir, "key.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=127.0.0.1",
+            "-keyout",
+            key_file,
+            "-out",
+            cert_file,
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return cert_file, key_file
+
+
+def _usecs(offset=0):
+    return str(int((time.time() - offset) * 1000000))
+
+
+def _make_entity(kind, name, **resources):
+    entity_uuid = str(uuid.uuid4())
+    return {
+        "metadata": {
+            "kind": kind.rstrip("s"),
+            "name": name,
+            "uuid": entity_uuid,
+            "creation_time": _usecs(3600),
+            "last_update_time": _usecs(),
+            "project_reference": {"kind": "project", "name": "project0"},
+            "owner_reference": {"kind": "user", "name": "admin"},
+        },
+        "spec": {"name": name, "resources": resources},
+        "status": {
+            "name": name,
+            "uuid": entity_uuid,
+            "state": "ACTIVE",
+            "description": "",
+            "resources": resources,
+        },
+    }
+
+
+class FakePrismCentral:
+    """Fake Calm api server running on a local port in a background thread"""
+
+    def __init__(self, latency=0.0, counts=None, runlog_polls=2):
+        self.latency = latency
+        self.runlog_polls = runlog_polls
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._runlog_polls = {}
+
+        self.entities = {}
+        counts = dict(DEFAULT_COUNTS, **(counts or {}))
+        for kind in DEFAULT_COUNTS:
+            self.entities[kind] = []
+        for kind, count in counts.items():
+            self.entities[kind] = [
+                self._create_entity(kind, ind) for ind in range(count)
+            ]
+
+        fake_pc = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                fake_pc._handle(self, "GET")
+
+            def do_POST(self):
+                fake_pc._handle(self, "POST")
+
+            def do_PUT(self):
+                fake_pc._handle(self, "PUT")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_port
+        self._thread = None
+        self._server_config = None
+
+        self._cert_dir = tempfile.mkdtemp()
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(*_generate_certificate(self._cert_dir))
+        self.server.socket = ssl_context.wrap_socket(
+            self.server.socket, server_side=True
+        )
+
+    def _create_entity(self, kind, ind):
+        name = "{}{}".format(kind.rstrip("s"), ind)
+        if kind == "apps":
+            entity = _make_entity(
+                kind,
+                name,
+                app_blueprint_reference={"kind": "blueprint", "name": "blueprint0"},
+            )
+            entity["status"]["state"] = "running"
+            return entity
+
+        elif kind == "subnets":
+            clusters = self.entities["clusters"]
+            entity = _make_entity(kind, name, subnet_type="VLAN", vpc_reference={})
+            entity["status"]["cluster_reference"] = {
+                "kind": "cluster",
+                "uuid": clusters[ind % len(clusters)]["metadata"]["uuid"],
+            }
+            return entity
+
+        elif kind == "accounts":
+            entity = _make_entity(
+                kind,
+                name,
+                type="nutanix_pc",
+                state="VERIFIED",
+                data={
+                    "host_pc": ind == 0,
+                    "cluster_account_reference_list": [
+                        # PE account of every cluster
+                        {
+                            "uuid": str(uuid.uuid4()),
+                            "resources": {
+                                "data": {
+                                    "cluster_uuid": cluster["metadata"]["uuid"],
+                                    "cluster_name": cluster["metadata"]["name"],
+                                }
+                            },
+                        }
+                        for cluster in self.entities["clusters"]
+                    ],
+                },
+            )
+            entity["status"]["state"] = "VERIFIED"
+            return entity
+
+        elif kind == "users":
+            # Owner of entities is the first user
+            name = "admin" if ind == 0 else name
+            return _make_entity(kind, name, display_name=name)
+
+        elif kind == "projects":
+            return _make_entity(
+                kind,
+                name,
+                account_reference_list=self._get_references("accounts"),
+                subnet_reference_list=self._get_references("subnets"),
+            )
+
+        return _make_entity(kind, name)
+
+    def _get_references(self, kind):
+        return [
+            {"kind": kind.rstrip("s"), "uuid": entity["metadata"]["uuid"]}
+            for entity in self.entities[kind]
+        ]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self._cert_dir, ignore_errors=True)
+
+        # Restore server config of dsl context
+        if self._server_config is not None:
+            server_config = get_context().server_config
+            server_config.clear()
+            server_config.update(self._server_config)
+            reset_api_client_handle()
+
+    def use(self):
+        """points dsl context and api client of dsl to this server"""
+
+        server_config = get_context().server_config
+        if self._server_config is None:
+            self._server_config = dict(server_config)
+
+        server_config.update(
+            {
+                CONFIG.SERVER.HOST: "127.0.0.1",
+                CONFIG.SERVER.PORT: str(self.port),
+                CONFIG.SERVER.USERNAME: "admin",
+                CONFIG.SERVER.PASSWORD: "password",
+            }
+        )
+        reset_api_client_handle()
+        return update_api_client(
+            host="127.0.0.1",
+            port=self.port,
+            scheme=REQUEST.SCHEME.HTTPS,
+            auth=("admin", "password"),
+        )
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _handle(self, handler, method):
+        with self._lock:
+            self.request_count += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        payload = json.loads(body) if body else {}
+
+        path = handler.path.split("?")[0].lstrip("/")
+        for prefix in API_PREFIXES:
+            if path.startswith(prefix):
+                path = path[len(prefix) :]
+                break
+
+        status, response = self._route(method, path, payload)
+        data = (
+            response.encode("utf-8")
+            if isinstance(response, str)
+            else json.dumps(response).encode("utf-8")
+        )
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _route(self, method, path, payload):
+        if path == "apps/version":
+            return 200, CALM_VERSION
+
+        elif path.endswith("cluster/version"):
+            return 200, {"version": PC_VERSION}
+
+        elif path == "groups":
+            return 200, self._groups(payload)
+
+        match = RUNLOG_LIST_RE.match(path)
+        if match:
+            return 200, self._runlogs(match.group(1), payload)
+
+        parts = path.split("/")
+        kind = parts[0]
+        if method == "POST" and len(parts) == 2 and parts[1] == "list":
+            return 200, self._list(self.entities.get(kind, []), kind, payload)
+
+        elif method == "GET" and len(parts) == 2:
+            for entity in self.entities.get(kind, []):
+                if entity["metadata"]["uuid"] == parts[1]:
+                    return 200, entity
+
+        elif method == "POST" and len(parts) == 1:
+            name = payload.get("spec", {}).get("name") or payload.get(
+                "metadata", {}
+            ).get("name", "")
+            entity = _make_entity(
+                kind, name, **payload.get("spec", {}).get("resources", {})
+            )
+            with self._lock:
+                self.entities.setdefault(kind, []).append(entity)
+            return 200, entity
+
+        return 404, {"code": 404, "message_list": [{"message": "not found"}]}
+
+    @staticmethod
+    def _list(entities, kind, payload):
+        names = NAME_FILTER_RE.findall(payload.get("filter", "") or "")
+        if names:
+            entities = [
+                entity for entity in entities if entity["metadata"]["name"] in names
+            ]
+
+        offset = int(payload.get("offset", 0))
+        length = int(payload.get("length", 20))
+        return {
+            "api_version": "3.1",
+            "metadata": {
+                "kind": kind.rstrip("s"),
+                "total_matches": len(entities),
+                "length": length,
+                "offset": offset,
+            },
+            "entities": entities[offset : offset + length],
+        }
+
+    def _runlogs(self, app_uuid, payload):
+        key = (app_uuid, payload.get("filter", ""))
+        with self._lock:
+            polls = self._runlog_polls.get(key, 0) + 1
+            self._runlog_polls[key] = polls
+
+        runlog = _make_entity("app_runlogs", "action_runlog")
+        runlog["status"]["state"] = (
+            "SUCCESS" if polls > self.runlog_polls else "RUNNING"
+        )
+        runlog["status"]["type"] = "action_runlog"
+        return self._list([runlog], "app_runlogs", {"length": 250})
+
+    def _groups(self, payload):
+        entities = self.entities.get(payload.get("entity_type", ""), [])
+        offset = int(payload.get("group_offset", 0))
+        count = int(payload.get("group_count", 64))
+        attributes = [
+            attr["attribute"] for attr in payload.get("group_member_attributes", [])
+        ]
+
+        group_results = []
+        for entity in entities[offset : offset + count]:
+            data = [
+                {
+                    "name": attribute,
+                    "values": [{"values": [str(entity["status"].get(attribute, ""))]}],
+                }
+                for attribute in attributes
+            ]
+            group_results.append(
+                {
+                    "group_by_column_value": entity["metadata"]["name"],
+                    "entity_results": [
+                        {"entity_id": entity["metadata"]["uuid"], "data": data}
+                    ],
+                }
+            )
+
+        return {
+            "filtered_group_count": len(entities),
+            "total_group_count": len(entities),
+            "group_results": group_results,
+        }
@@ -0,0 +1,266 @@
+"""
+Client side cost of commands talking to Calm apis, measured against a local
+fake Prism Central (see fake_pc.py) adding LATENCY seconds to every request:
+cache sync (`calm update cache`), list_all of apps, `calm get apps`, compile
+and decompile of example blueprints against the synced cache, and watching
+runlogs of app actions. Commands served by dsl daemon (`calmc`) are measured
+against the same commands run by cli. Cache sync, list and watch calls are measured in
+process, while cli commands (including start up of cli) are measured in
+separate processes, as the calm version used to validate dsl entities is read
+from cache while importing dsl models. Number of requests made by a round of
+every benchmark is saved in `extra_info`.
+
+Results are saved under .benchmarks by `make benchmark`, and compared with the
+last saved run by `make benchmark-compare` to spot regressions between releases.
+
+Run: py.test tests/benchmarks/test_api_hot_paths.py --benchmark-only
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+import pytest
+
+from calm.dsl.api import get_api_client
+from calm.dsl.config import get_context
+from calm.dsl.constants import CACHE
+from calm.dsl.db import handler
+from calm.dsl.db.table_config import dsl_database
+
+from .fake_pc import FakePrismCentral, is_supported
+
+pytest.importorskip("pytest_benchmark")
+
+LATENCY = 0.002
+APP_COUNT = 1000
+WATCHED_APP_COUNT = 20
+CLI = [sys.executable, "-c", "from calm.dsl.cli import main; main()"]
+DAEMON_CLIENT = [sys.executable, "-m", "calm.dsl.daemon"]
+
+# Example blueprints (compiled against entities of fake server) with local files used by them
+EXAMPLE_BLUEPRINTS = {
+    "examples/AHV_MACRO_BLUEPRINT/blueprint.py": ["cred_username", "cred_password"],
+    "examples/EraPostgres/erapostgres.py": ["passwd", "db_passwd"],
+    "examples/Redis_Cluser_K8S/Redis_Cluser_K8S.py": ["root_passwd"],
+}
+
+# Decompilation of k8s pods is not supported
+DECOMPILED_BLUEPRINTS = [
+    "examples/AHV_MACRO_BLUEPRINT/blueprint.py",
+    "examples/EraPostgres/erapostgres.py",
+]
+
+
+@pytest.fixture(scope="module")
+def fake_pc():
+    if not is_supported():
+        pytest.skip("openssl is required to serve fake Prism Central over https")
+
+    db_dir = tempfile.mkdtemp()
+
+    # Cache of fake server is stored in a separate db
+    def instantiate_db():
+        dsl_database.init(os.path.join(db_dir, "dsl.db"), pragmas=CACHE.DB_PRAGMAS)
+        return dsl_database
+
+    project_config = get_context().project_config
+    old_project_config = dict(project_config)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            handler.Database, "instantiate_db", staticmethod(instantiate_db)
+        )
+        monkeypatch.setattr(handler, "_Database", None)
+        with FakePrismCentral(latency=LATENCY, counts={"apps": APP_COUNT}) as server:
+            server.use()
+            project_config["name"] = "project0"
+            yield server
+
+            project_config.clear()
+            project_config.update(old_project_config)
+            if not dsl_database.deferred:
+                dsl_database.close()
+
+
+def _benchmark_requests(benchmark, fake_pc, func, *args, rounds=5, **kwargs):
+    """benchmarks func, saving number of requests made by a round"""
+
+    request_count = fake_pc.request_count
+    func(*args, **kwargs)
+    benchmark.extra_info["requests"] = fake_pc.request_count - request_count
+
+    return benchmark.pedantic(func, args=args, kwargs=kwargs, rounds=rounds)
+
+
+def test_update_cache(benchmark, fake_pc):
+    from calm.dsl.store import Cache
+
+    with redirect_stdout(io.StringIO()):
+        _benchmark_requests(benchmark, fake_pc, Cache.sync, rounds=3)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_list_all_apps(benchmark, fake_pc, max_workers):
+    client = get_api_client()
+    entities = _benchmark_requests(
+        benchmark,
+        fake_pc,
+        client.application.list_all,
+        api_limit=100,
+        max_workers=max_workers,
+    )
+    assert len(entities) == APP_COUNT
+
+
+def test_get_apps(benchmark, fake_pc):
+    from calm.dsl.cli.apps import get_apps
+
+    with redirect_stdout(io.StringIO()):
+        _benchmark_requests(
+            benchmark, fake_pc, get_apps, None, None, 100, 0, False, False, "text"
+        )
+
+
+def _run_cli(env, *args, cli=CLI):
+    result = subprocess.run(
+        cli + list(args),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+@pytest.fixture(scope="module")
+def cli_env(fake_pc):
+    """environment of cli processes using fake server, with a synced cache"""
+
+    env_dir = tempfile.mkdtemp()
+    local_dir = os.path.join(env_dir, "local")
+    os.makedirs(local_dir)
+    for files in EXAMPLE_BLUEPRINTS.values():
+        for file in files:
+            with open(os.path.join(local_dir, file), "w") as fd:
+                fd.write("placeholder")
+
+    env = dict(
+        os.environ,
+        CALM_DSL_PC_IP="127.0.0.1",
+        CALM_DSL_PC_PORT=str(fake_pc.port),
+        CALM_DSL_PC_USERNAME="admin",
+        CALM_DSL_PC_PASSWORD="password",
+        CALM_DSL_DEFAULT_PROJECT="project0",
+        CALM_DSL_DB_LOCATION=os.path.join(env_dir, "dsl.db"),
+        CALM_DSL_LOCAL_DIR_LOCATION=local_dir,
+    )
+    _run_cli(env, "update", "cache")
+    yield env
+
+    shutil.rmtree(env_dir, ignore_errors=True)
+
+
+def test_cli_update_cache(benchmark, fake_pc, cli_env):
+    _benchmark_requests(
+        benchmark, fake_pc, _run_cli, cli_env, "update", "cache", rounds=3
+    )
+
+
+def test_cli_get_apps(benchmark, fake_pc, cli_env):
+    _benchmark_requests(
+        benchmark, fake_pc, _run_cli, cli_env, "get", "apps", "--limit", "100"
+    )
+
+
+@pytest.fixture(scope="module")
+def daemon_env(cli_env):
+    """environment of cli processes using a running dsl daemon"""
+
+    env = dict(
+        cli_env,
+        CALM_DSL_DAEMON_SOCKET=os.path.join(
+            os.path.dirname(cli_env["CALM_DSL_DB_LOCATION"]), "dsl.sock"
+        ),
+    )
+    _run_cli(env, "start", "daemon")
+    yield env
+
+    _run_cli(env, "stop", "daemon")
+
+
+def test_daemon_get_apps(benchmark, fake_pc, daemon_env):
+    _benchmark_requests(
+        benchmark,
+        fake_pc,
+        _run_cli,
+        daemon_env,
+        "get",
+        "apps",
+        "--limit",
+        "100",
+        cli=DAEMON_CLIENT,
+    )
+
+
+@pytest.mark.parametrize("bp_file", list(EXAMPLE_BLUEPRINTS))
+def test_cli_compile_bp(benchmark, fake_pc, cli_env, bp_file):
+    _benchmark_requests(
+        benchmark, fake_pc, _run_cli, cli_env, "compile", "bp", "-f", bp_file
+    )
+
+
+@pytest.mark.parametrize("bp_file", DECOMPILED_BLUEPRINTS)
+def test_cli_decompile_bp(benchmark, fake_pc, cli_env, bp_file, tmp_path):
+    bp_json = str(tmp_path / "blueprint.json")
+    with open(bp_json, "w") as fd:
+        fd.write(_run_cli(cli_env, "compile", "bp", "-f", bp_file))
+
+    def decompile_bp():
+        bp_dir = tempfile.mkdtemp(dir=str(tmp_path))
+        _run_cli(
+            cli_env,
+            "decompile",
+            "bp",
+            "--file",
+            bp_json,
+            "--dir",
+            bp_dir,
+            "--no-format",
+        )
+
+    _benchmark_requests(benchmark, fake_pc, decompile_bp, rounds=3)
+
+
+def test_watch_action_runlogs(benchmark, fake_pc, monkeypatch):
+    from calm.dsl.cli import bulk_ops
+    from calm.dsl.cli.apps import get_action_runlog_poll_func
+    from calm.dsl.cli.constants import RUNLOG
+
+    # Runlogs of fake server complete after few polls, so only polling cost is measured
+    monkeypatch.setattr(RUNLOG.POLL, "MIN_INTERVAL", 0.01)
+    monkeypatch.setattr(RUNLOG.POLL, "MAX_INTERVAL", 0.01)
+
+    client = get_api_client()
+    apps = client.application.list_all(base_params={"length": WATCHED_APP_COUNT})
+    apps = apps[:WATCHED_APP_COUNT]
+    app_uuids = {app["metadata"]["name"]: app["metadata"]["uuid"] for app in apps}
+
+    def watch_runlogs():
+        # New runlog for every round
+        runlog_uuid = os.urandom(8).hex()
+        results = bulk_ops.run_bulk(list(app_uuids), lambda result: runlog_uuid)
+
+        def get_poll_func(result):
+            return get_action_runlog_poll_func(
+                client, app_uuids[result.name], result.runlog_uuid
+            )
+
+        bulk_ops.watch_bulk_results(results, get_poll_func)
+        assert all(result.state == RUNLOG.STATUS.SUCCESS for result in results)
+
+    _benchmark_requests(benchmark, fake_pc, watch_runlogs)
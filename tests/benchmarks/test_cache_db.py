@@ -0,0 +1,108 @@
+"""
+Sync and lookup throughput of cache tables on a synthetic subnet cache of
+50k rows, stored in an on-disk db opened with the pragmas used by `calm`.
+Sync is measured with multi-row inserts (apply_sync_rows) against inserting
+rows one by one, lookups are measured by name and by uuid of subnet.
+
+Run: py.test tests/benchmarks/test_cache_db.py --benchmark-only
+"""
+
+import random
+import uuid
+
+import pytest
+from peewee import SqliteDatabase
+
+from calm.dsl.constants import CACHE
+from calm.dsl.db.table_config import (
+    AhvClustersCache,
+    AhvVpcsCache,
+    AhvSubnetsCache,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+ROW_COUNT = 50000
+ACCOUNT_COUNT = 5
+LOOKUP_COUNT = 1000
+TABLES = [AhvClustersCache, AhvVpcsCache, AhvSubnetsCache]
+
+
+def _subnet_rows():
+    account_uuids = [str(uuid.uuid4()) for _ in range(ACCOUNT_COUNT)]
+    cluster_uuids = [str(uuid.uuid4()) for _ in range(ACCOUNT_COUNT)]
+    return [
+        {
+            "name": "subnet{}".format(ind),
+            "uuid": str(uuid.uuid4()),
+            "account_uuid": account_uuids[ind % ACCOUNT_COUNT],
+            "subnet_type": "VLAN",
+            "cluster": cluster_uuids[ind % ACCOUNT_COUNT],
+        }
+        for ind in range(ROW_COUNT)
+    ]
+
+
+@pytest.fixture(scope="module")
+def subnet_rows(tmp_path_factory):
+    """binds cache tables to an on-disk db and returns rows to be synced"""
+
+    db_location = str(tmp_path_factory.mktemp("cache_db") / "dsl.db")
+    test_db = SqliteDatabase(db_location, pragmas=CACHE.DB_PRAGMAS)
+    with test_db.bind_ctx(TABLES):
+        test_db.create_tables(TABLES)
+        yield _subnet_rows()
+
+    test_db.close()
+
+
+def _clear():
+    AhvSubnetsCache.delete().execute()
+
+
+def _insert_row_by_row(rows):
+    with AhvSubnetsCache._meta.database.atomic():
+        for row in rows:
+            AhvSubnetsCache.insert(**row).execute()
+
+
+def _lookup_by_name(rows):
+    for row in rows:
+        AhvSubnetsCache.get_entity_data(row["name"], account_uuid=row["account_uuid"])
+
+
+def _lookup_by_uuid(rows):
+    for row in rows:
+        AhvSubnetsCache.get_entity_data_using_uuid(
+            row["uuid"], account_uuid=row["account_uuid"]
+        )
+
+
+def test_sync_row_by_row(benchmark, subnet_rows):
+    benchmark.pedantic(_insert_row_by_row, args=(subnet_rows,), setup=_clear, rounds=3)
+
+
+def test_sync_bulk(benchmark, subnet_rows):
+    benchmark.pedantic(
+        AhvSubnetsCache.apply_sync_rows, args=(subnet_rows,), setup=_clear, rounds=3
+    )
+    assert AhvSubnetsCache.select().count() == ROW_COUNT
+
+
+def test_sync_unchanged(benchmark, subnet_rows):
+    _clear()
+    AhvSubnetsCache.apply_sync_rows(subnet_rows)
+    result = benchmark.pedantic(
+        AhvSubnetsCache.apply_sync_rows, args=(subnet_rows,), rounds=3
+    )
+    assert result == (0, 0, 0)
+
+
+@pytest.mark.parametrize("lookup", [_lookup_by_name, _lookup_by_uuid])
+def test_lookup(benchmark, subnet_rows, lookup):
+    if AhvSubnetsCache.select().count() != ROW_COUNT:
+        _clear()
+        AhvSubnetsCache.apply_sync_rows(subnet_rows)
+
+    lookup_rows = random.Random(0).sample(subnet_rows, LOOKUP_COUNT)
+    benchmark(lookup, lookup_rows)
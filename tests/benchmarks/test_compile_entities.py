@@ -0,0 +1,94 @@
+"""
+Compile time of dsl entities, measured over a synthetic blueprint with
+ENTITY_COUNT services, every service having variables and an action with
+tasks, and over ENTITY_COUNT standalone variables and tasks. Covers attribute
+resolution of entities (`get_all_attrs`) and conversion of attributes to api
+schema, without any server calls. Compile of services is dominated by actions,
+as the runbook of an action is generated every time the action is accessed.
+
+Run: py.test tests/benchmarks/test_compile_entities.py --benchmark-only
+"""
+
+import pytest
+
+from calm.dsl.builtins import (
+    CalmTask,
+    CalmVariable,
+    Service,
+    action,
+    reset_dsl_metadata_map,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+ENTITY_COUNT = 1000
+
+
+@action
+def _service_action():
+    """Synthetic action of every service"""
+
+    CalmTask.Exec.ssh(name="Task1", script="echo 'Task1'")
+    CalmTask.Exec.ssh(name="Task2", script="echo 'Task2'")
+
+
+def _make_services(count):
+    return [
+        type(Service)(
+            "Service{}".format(ind),
+            (Service,),
+            {
+                "__doc__": "Synthetic service",
+                "var1": CalmVariable.Simple("value1"),
+                "var2": CalmVariable.Simple.string("value2", runtime=True),
+                "var3": CalmVariable.Simple.int("1", is_mandatory=True),
+                "custom_action": action(_service_action.user_func),
+            },
+        )
+        for ind in range(count)
+    ]
+
+
+def _make_variables_and_tasks(count):
+    entities = []
+    for ind in range(count):
+        entities.append(CalmVariable.Simple.string("value", name="var{}".format(ind)))
+        entities.append(
+            CalmTask.Exec.ssh(name="Task{}".format(ind), script="echo 'Task'")
+        )
+
+    return entities
+
+
+def _compile(entities):
+    reset_dsl_metadata_map()
+    return [entity.get_dict() for entity in entities]
+
+
+def test_compile_services(benchmark):
+    services = _make_services(ENTITY_COUNT)
+    payloads = benchmark.pedantic(_compile, args=(services,), rounds=5, warmup_rounds=1)
+
+    assert len(payloads) == ENTITY_COUNT
+    assert len(payloads[0]["variable_list"]) == 3
+    assert "custom_action" in [
+        action_payload["name"] for action_payload in payloads[0]["action_list"]
+    ]
+
+
+def test_compile_variables_and_tasks(benchmark):
+    entities = _make_variables_and_tasks(ENTITY_COUNT)
+    payloads = benchmark.pedantic(_compile, args=(entities,), rounds=5, warmup_rounds=1)
+
+    assert [payload["name"] for payload in payloads[:2]] == ["var0", "Task0"]
+
+
+def test_get_all_attrs(benchmark):
+    entities = _make_variables_and_tasks(ENTITY_COUNT)
+
+    def get_all_attrs():
+        return [entity.get_all_attrs() for entity in entities]
+
+    attrs = benchmark.pedantic(get_all_attrs, rounds=5, warmup_rounds=1)
+    assert attrs[0]["value"] == "value"
+    assert attrs[1]["name"] == "Task0"
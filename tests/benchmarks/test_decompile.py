@@ -0,0 +1,58 @@
+"""
+Decompile time of runbook payloads under tests/runbook_decompile, along with
+render count and render time per template (saved in `extra_info` of every
+benchmark).
+
+Run: py.test tests/benchmarks/test_decompile.py --benchmark-only
+"""
+
+import glob
+import json
+import os
+
+import pytest
+
+from calm.dsl.decompile import render
+
+pytest.importorskip("pytest_benchmark")
+
+RUNBOOK_JSONS = sorted(glob.glob("tests/runbook_decompile/runbook_json/*.json"))
+
+
+def _decompile_runbook(runbook_json, runbook_dir):
+    from calm.dsl.cli.runbooks import _decompile_runbook
+
+    with open(runbook_json) as fd:
+        runbook_payload = json.load(fd)
+
+    _decompile_runbook(runbook_payload, runbook_dir, prefix="")
+
+
+@pytest.mark.parametrize(
+    "runbook_json", RUNBOOK_JSONS, ids=[os.path.basename(f) for f in RUNBOOK_JSONS]
+)
+def test_decompile_runbook(benchmark, runbook_json, tmp_path):
+    runbook_dir = str(tmp_path)
+
+    # Some payloads refer entities that are looked up in cache/server
+    try:
+        _decompile_runbook(runbook_json, runbook_dir)
+    except (Exception, SystemExit) as exp:
+        pytest.skip("Unable to decompile {}: {}".format(runbook_json, exp))
+
+    render.enable_render_stats()
+    try:
+        benchmark.pedantic(
+            _decompile_runbook, args=(runbook_json, runbook_dir), rounds=5
+        )
+        render_stats = render.get_render_stats()
+
+    finally:
+        render.disable_render_stats()
+
+    benchmark.extra_info["render_stats"] = {
+        template: {"count": count, "time": render_time}
+        for template, (count, render_time) in sorted(
+            render_stats.items(), key=lambda item: -item[1][1]
+        )
+    }
@@ -0,0 +1,40 @@
+"""
+Per call overhead of `CustomLogging` methods, for log lines filtered by level
+(ex: debug logs in default runs) and for emitted ones.
+
+Run: py.test tests/benchmarks/test_logging.py --benchmark-only
+"""
+
+import io
+import logging
+
+import pytest
+
+from calm.dsl.log import CustomLogging, get_logging_handle
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture
+def LOG():
+    log_handle = get_logging_handle("benchmark_logging")
+    log_handle._ch1.setStream(io.StringIO())
+    CustomLogging.set_verbose_level(logging.INFO)
+    yield log_handle
+
+    log_handle._logger.removeHandler(log_handle._ch1)
+    CustomLogging._HANDLERS.remove(log_handle._ch1)
+    CustomLogging.set_log_format(CustomLogging.TEXT_FORMAT)
+
+
+def test_filtered_debug(benchmark, LOG):
+    benchmark(LOG.debug, "filtered message")
+
+
+def test_emitted_info(benchmark, LOG):
+    benchmark(LOG.info, "emitted message")
+
+
+def test_emitted_info_json(benchmark, LOG):
+    CustomLogging.set_log_format(CustomLogging.JSON_FORMAT)
+    benchmark(LOG.info, "emitted message")
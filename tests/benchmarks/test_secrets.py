@@ -0,0 +1,72 @@
+"""
+Resolution time of secrets stored in local secret store, resolving them one
+by one (Secret.find) and in bulk (Secret.find_many). Derived key cache is
+cleared before every round, so that each round pays the key derivation cost.
+
+Run: py.test tests/benchmarks/test_secrets.py --benchmark-only
+"""
+
+import types
+
+import pytest
+from peewee import SqliteDatabase
+
+from calm.dsl.crypto import Crypto
+from calm.dsl.db.table_config import SecretTable, DataTable
+from calm.dsl.store import secrets
+from calm.dsl.store import Secret
+
+pytest.importorskip("pytest_benchmark")
+
+SECRET_COUNTS = [1, 50, 500]
+
+
+@pytest.fixture(scope="module")
+def secret_names():
+    """stores secrets in an in-memory db"""
+
+    db_handle = types.SimpleNamespace(secret_table=SecretTable, data_table=DataTable)
+    get_db_handle = secrets.get_db_handle
+    secrets.get_db_handle = lambda: db_handle
+
+    test_db = SqliteDatabase(":memory:", check_same_thread=False)
+    with test_db.bind_ctx([SecretTable, DataTable]):
+        test_db.create_tables([SecretTable, DataTable])
+        names = ["secret{}".format(ind) for ind in range(max(SECRET_COUNTS))]
+        for name in names:
+            Secret.create(name, "value_{}".format(name))
+
+        yield names
+
+    secrets.get_db_handle = get_db_handle
+    Crypto.key_cache.clear()
+
+
+def _find(names):
+    return [Secret.find(name) for name in names]
+
+
+@pytest.mark.parametrize("count", SECRET_COUNTS)
+def test_find(benchmark, secret_names, count):
+    benchmark.pedantic(
+        _find,
+        args=(secret_names[:count],),
+        setup=Crypto.key_cache.clear,
+        rounds=1 if count > 50 else 3,
+    )
+
+
+@pytest.mark.parametrize("count", SECRET_COUNTS)
+def test_find_many(benchmark, secret_names, count):
+    benchmark.pedantic(
+        Secret.find_many,
+        args=(secret_names[:count],),
+        setup=Crypto.key_cache.clear,
+        rounds=1 if count > 50 else 3,
+    )
+
+
+@pytest.mark.parametrize("count", SECRET_COUNTS)
+def test_find_many_cached_keys(benchmark, secret_names, count):
+    Secret.find_many(secret_names[:count])
+    benchmark(Secret.find_many, secret_names[:count])
@@ -0,0 +1,35 @@
+"""
+Wall time of fresh `calm` processes, covers import time, schema loading and
+provider initialization paid by every invocation.
+
+Run: py.test tests/benchmarks/test_startup.py --benchmark-only
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+CALM_CLI = [sys.executable, "-c", "from calm.dsl.cli import main; main()"]
+DSL_BP_FILEPATH = "tests/simple_blueprint/test_simple_blueprint.py"
+
+
+def _run_cli(*args):
+    subprocess.run(
+        CALM_CLI + list(args), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def test_calm_help(benchmark):
+    benchmark.pedantic(_run_cli, args=("--help",), rounds=5, warmup_rounds=1)
+
+
+def test_calm_compile_bp(benchmark):
+    benchmark.pedantic(
+        _run_cli,
+        args=("compile", "bp", "--file", DSL_BP_FILEPATH),
+        rounds=5,
+        warmup_rounds=1,
+    )
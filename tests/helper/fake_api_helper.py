@@ -0,0 +1,23 @@
+import json
+
+
+class FakeResponse:
+    """
+    Response of api calls made by fake api clients in unit tests
+
+    Args:
+        data (dict): Json payload of response
+        status_code (int): Http status code of response
+    """
+
+    def __init__(self, data=None, status_code=200):
+        self.data = {} if data is None else data
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        # Every call returns a new copy, like a response parsed from server
+        return json.loads(json.dumps(self.data))
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from calm.dsl.api.connection import Connection, REQUEST
+from calm.dsl.api.resource import ResourceAPI
+from calm.dsl.api.async_resource import AsyncResourceAPI, bulk_delete, run_bulk
+
+# Time taken by stand-in server to serve a request
+RESPONSE_DELAY = 0.1
+TOTAL_VMS = 45
+
+
+class StandInServer(ThreadingHTTPServer):
+    request_queue_size = 64
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """serves vm list, read and delete calls"""
+
+    def _respond(self, status, payload):
+        time.sleep(RESPONSE_DELAY)
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        uuid = self.path.split("?")[0].rsplit("/", 1)[-1]
+        if uuid == "missing":
+            return self._respond(404, {"message_list": ["vm not found"]})
+        self._respond(200, {"metadata": {"uuid": uuid}})
+
+    def do_DELETE(self):
+        self._respond(202, {"metadata": {"uuid": self.path.rsplit("/", 1)[-1]}})
+
+    def do_POST(self):
+        params = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        offset, length = params["offset"], params["length"]
+        entities = [
+            {"metadata": {"uuid": str(ind)}}
+            for ind in range(offset, min(offset + length, TOTAL_VMS))
+        ]
+        self._respond(
+            200, {"entities": entities, "metadata": {"total_matches": TOTAL_VMS}}
+        )
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def connection():
+    server = StandInServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    connection = Connection(
+        "127.0.0.1", server.server_address[1], scheme=REQUEST.SCHEME.HTTP
+    )
+    connection.connect()
+    yield connection
+
+    connection.close()
+    server.shutdown()
+
+
+def test_bulk_delete_runs_concurrently(connection):
+    uuids = ["vm-{}".format(ind) for ind in range(20)]
+
+    start_time = time.time()
+    results = bulk_delete(ResourceAPI(connection, "vms"), uuids, max_concurrency=10)
+    elapsed_time = time.time() - start_time
+
+    assert [res.json()["metadata"]["uuid"] for res, _ in results] == uuids
+    assert all(err is None for _, err in results)
+
+    # Sequential calls would take 20 * RESPONSE_DELAY
+    assert elapsed_time < 10 * RESPONSE_DELAY
+
+
+def test_bulk_read_returns_errors(connection):
+    api = AsyncResourceAPI(connection, "vms")
+    results = run_bulk(api.read, ["vm-1", "missing"])
+    api.connection.close()
+
+    assert results[0][1] is None
+    assert results[1][1]["code"] == 404
+
+
+def test_list_all(connection):
+    api = AsyncResourceAPI(connection, "vms")
+    entities = asyncio.run(api.list_all(api_limit=10))
+    api.connection.close()
+
+    assert [e["metadata"]["uuid"] for e in entities] == [
+        str(ind) for ind in range(TOTAL_VMS)
+    ]
+
+
+def test_only_async_methods_are_exposed(connection):
+    api = AsyncResourceAPI.from_resource_api(ResourceAPI(connection, "vms"))
+
+    assert api.resource_api.LIST == "api/nutanix/v3/vms/list"
+    for method in ["download", "download_export_file", "iter_all"]:
+        assert not hasattr(api, method)
+
+    res, err = asyncio.run(api.read("vm-1"))
+    api.connection.close()
+    assert err is None and res.json()["metadata"]["uuid"] == "vm-1"
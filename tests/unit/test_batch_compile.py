@@ -0,0 +1,112 @@
+import importlib
+import os
+import shutil
+import sys
+
+from calm.dsl.builtins import get_dsl_metadata_map, update_dsl_metadata_map
+from calm.dsl.cli import batch_compile
+from calm.dsl.cli.constants import BATCH_COMPILE
+
+AWS_SPEC_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "examples/AWS_ELB_Demo/aws_mysql_spec.yaml"
+)
+
+
+def test_files_are_collected_from_dirs_and_globs(tmp_path):
+    (tmp_path / "bps" / "scripts").mkdir(parents=True)
+    for file in ["bps/bp1.py", "bps/bp2.py", "bps/scripts/script.sh", "rb.py"]:
+        (tmp_path / file).write_text("")
+
+    files = batch_compile.get_batch_files(
+        [str(tmp_path / "bps"), str(tmp_path / "*.py"), str(tmp_path / "bps/bp1.py")],
+        BATCH_COMPILE.KINDS.BLUEPRINT,
+    )
+    assert files == [
+        str(tmp_path / "bps/bp1.py"),
+        str(tmp_path / "bps/bp2.py"),
+        str(tmp_path / "rb.py"),
+    ]
+
+
+def test_state_is_reset_for_every_file(tmp_path, monkeypatch):
+    for name in ["a", "b"]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "helper.py").write_text("VALUE = '{}'\n".format(name))
+
+    def compile_file(kind, file, use_compile_cache, provider_type):
+        import helper
+
+        metadata = get_dsl_metadata_map(["Service"])
+        update_dsl_metadata_map("Service", helper.VALUE, {})
+        return {"value": helper.VALUE, "services": list(metadata)}
+
+    monkeypatch.setattr(batch_compile, "_compile_file", compile_file)
+    batch_compile._init_worker(BATCH_COMPILE.KINDS.PROVIDER_SPEC, None, None)
+
+    results = [
+        batch_compile._run_task(
+            BATCH_COMPILE.KINDS.BLUEPRINT, str(tmp_path / name / "bp.py"), False, None
+        )
+        for name in ["a", "b"]
+    ]
+    batch_compile._reset_worker_state()
+
+    assert [result["payload"] for result in results] == [
+        {"value": "a", "services": []},
+        {"value": "b", "services": []},
+    ]
+
+
+def test_dsl_modules_are_kept_loaded_across_files(tmp_path, monkeypatch):
+    # Module is imported only after the worker is initialized
+    monkeypatch.delitem(sys.modules, "calm.dsl.cli.bps", raising=False)
+    modules = []
+
+    def compile_file(kind, file, use_compile_cache, provider_type):
+        modules.append(importlib.import_module("calm.dsl.cli.bps"))
+        return {}
+
+    monkeypatch.setattr(batch_compile, "_compile_file", compile_file)
+    batch_compile._init_worker(BATCH_COMPILE.KINDS.PROVIDER_SPEC, None, None)
+
+    for name in ["a", "b"]:
+        batch_compile._run_task(
+            BATCH_COMPILE.KINDS.BLUEPRINT, str(tmp_path / name / "bp.py"), False, None
+        )
+    batch_compile._reset_worker_state()
+
+    assert len(modules) == 2 and modules[0] is modules[1]
+    assert sys.modules["calm.dsl.cli.bps"] is modules[0]
+
+
+def test_provider_specs_are_validated_on_workers(tmp_path):
+    shutil.copy(AWS_SPEC_FILE, str(tmp_path / "valid.yaml"))
+    (tmp_path / "invalid.yaml").write_text("type: PROVISION_AWS_VM\nresources: 1\n")
+
+    files = batch_compile.get_batch_files(
+        [str(tmp_path)], BATCH_COMPILE.KINDS.PROVIDER_SPEC
+    )
+    results = {
+        os.path.basename(result["file"]): result
+        for result in batch_compile.compile_files(
+            BATCH_COMPILE.KINDS.PROVIDER_SPEC, files, max_workers=2
+        )
+    }
+
+    assert results["valid.yaml"]["state"] == BATCH_COMPILE.STATES.SUCCESS
+    assert results["valid.yaml"]["payload"] == {"provider_type": "AWS_VM"}
+    assert results["invalid.yaml"]["state"] == BATCH_COMPILE.STATES.FAILED
+    assert results["invalid.yaml"]["error"]
+    assert results["valid.yaml"]["pid"] != os.getpid()
+
+
+def test_secrets_are_not_compiled_on_workers(monkeypatch):
+    from calm.dsl.builtins import CalmVariable
+    from calm.dsl.builtins.models import utils
+
+    monkeypatch.setattr(utils, "COMPILE_WITH_SECRETS", True)
+    batch_compile._init_worker(BATCH_COMPILE.KINDS.BLUEPRINT, None, None)
+
+    secret_var = CalmVariable.Simple.Secret.string("TOPSECRET")
+    assert secret_var.get_dict()["value"] == ""
+    assert CalmVariable.Simple.string("visible").get_dict()["value"] == "visible"
@@ -0,0 +1,88 @@
+import threading
+import time
+
+from calm.dsl.cli import bulk_ops
+from calm.dsl.cli.constants import BULK, RUNLOG
+
+from tests.helper.fake_api_helper import FakeResponse
+
+
+class FakeResource:
+    LIST_ALL_MAX_WORKERS = 1
+
+    def __init__(self, names):
+        self.names = names
+        self.filters = []
+
+    def iter_all(self, base_params=None, max_workers=1):
+        self.filters.append(base_params["filter"])
+        for name in self.names:
+            # Name filter of list api matches names partially
+            if "name=={}".format(name.rstrip("0123456789")) in base_params["filter"]:
+                yield {"metadata": {"name": name, "uuid": name + "_uuid"}}
+
+
+def test_names_are_resolved_in_chunks(monkeypatch):
+    monkeypatch.setattr(BULK, "NAMES_PER_LIST_CALL", 2)
+    resource = FakeResource(["app1", "app10", "app2", "app3"])
+
+    entities = bulk_ops.get_entities_by_name(
+        resource, ["app1", "app2", "app3", "app1"], base_filter=";state!=DELETED"
+    )
+    assert sorted(entities) == ["app1", "app2", "app3"]
+    assert resource.filters == [
+        "(name==app1,name==app2);state!=DELETED",
+        "(name==app3);state!=DELETED",
+    ]
+
+
+def test_failures_do_not_stop_other_operations():
+    lock = threading.Lock()
+    running = {"count": 0, "max": 0}
+
+    def operation(result):
+        with lock:
+            running["count"] += 1
+            running["max"] = max(running["max"], running["count"])
+        time.sleep(0.01)
+        with lock:
+            running["count"] -= 1
+
+        if result.name == "failed":
+            raise Exception("delete failed")
+        if result.name == "skipped":
+            raise bulk_ops.SkipOperation("system app")
+        return result.name + "_runlog"
+
+    names = ["failed", "skipped"] + ["app{}".format(ind) for ind in range(8)]
+    results = bulk_ops.run_bulk(names, operation, max_workers=3)
+
+    assert [result.name for result in results] == names
+    assert running["max"] <= 3
+    assert results[0].state == BULK.STATES.FAILED and results[0].is_failed
+    assert results[1].state == BULK.STATES.SKIPPED and not results[1].is_failed
+    assert all(result.state == BULK.STATES.TRIGGERED for result in results[2:])
+    assert all(result.trigger_time is not None for result in results)
+
+
+def test_runlogs_are_watched_together():
+    states = {
+        "app1": [RUNLOG.STATUS.SUCCESS],
+        "app2": [RUNLOG.STATUS.SUCCESS, RUNLOG.STATUS.FAILURE],
+    }
+    results = bulk_ops.run_bulk(list(states), lambda result: result.name + "_runlog")
+
+    def get_poll_func(result):
+        def poll_func():
+            entities = [{"status": {"state": state}} for state in states[result.name]]
+            return FakeResponse({"entities": entities}), None
+
+        return poll_func
+
+    bulk_ops.watch_bulk_results(results, get_poll_func)
+    assert [result.state for result in results] == [
+        RUNLOG.STATUS.SUCCESS,
+        RUNLOG.STATUS.FAILURE,
+    ]
+    assert [result.is_failed for result in results] == [False, True]
+    assert all(result.run_time is not None for result in results)
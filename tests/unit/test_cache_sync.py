@@ -0,0 +1,249 @@
+import json
+import threading
+import pytest
+from peewee import SqliteDatabase
+
+from calm.dsl.db.table_config import AccountCache, AhvSubnetsCache
+
+from tests.helper.fake_api_helper import FakeResponse
+
+
+def _account_row(name, uuid, state="VERIFIED"):
+    return {
+        "name": name,
+        "uuid": uuid,
+        "provider_type": "nutanix_pc",
+        "state": state,
+        "data": json.dumps({}),
+    }
+
+
+@pytest.fixture
+def account_table(monkeypatch):
+    """binds AccountCache to an in-memory db and lets test control synced rows"""
+
+    server_rows = []
+
+    def sync(cls):
+        cls.clear()
+        for row in server_rows:
+            cls.create_entry(**row)
+
+    monkeypatch.setattr(AccountCache, "sync", classmethod(sync))
+
+    test_db = SqliteDatabase(":memory:")
+    with test_db.bind_ctx([AccountCache]):
+        test_db.create_tables([AccountCache])
+        yield server_rows
+
+
+def test_sync_rows_are_staged(account_table):
+    account_table.append(_account_row("acc1", "uuid1"))
+
+    rows = AccountCache.fetch_sync_rows()
+    assert [row["uuid"] for row in rows] == ["uuid1"]
+    assert AccountCache.select().count() == 0
+
+
+def test_incremental_sync(account_table):
+    account_table.extend([_account_row("acc1", "uuid1"), _account_row("acc2", "uuid2")])
+    assert AccountCache.apply_sync_rows(AccountCache.fetch_sync_rows()) == (2, 0, 0)
+
+    # Nothing is written if server data is unchanged
+    assert AccountCache.apply_sync_rows(AccountCache.fetch_sync_rows()) == (0, 0, 0)
+
+    account_table[0] = _account_row("acc1", "uuid1", state="DRAFT")
+    account_table[1] = _account_row("acc3", "uuid3")
+    assert AccountCache.apply_sync_rows(AccountCache.fetch_sync_rows()) == (1, 1, 1)
+
+    assert AccountCache.get_entity_data_using_uuid("uuid1")["state"] == "DRAFT"
+    assert not AccountCache.get_entity_data_using_uuid("uuid2")
+    assert AccountCache.get_entity_data("acc3")
+
+
+def test_bulk_insert_uses_field_defaults(account_table):
+    rows = [
+        _account_row("acc{}".format(ind), "uuid{}".format(ind)) for ind in range(500)
+    ]
+    rows[0]["is_host"] = True
+    account_table.extend(rows)
+
+    assert AccountCache.apply_sync_rows(AccountCache.fetch_sync_rows()) == (500, 0, 0)
+    assert AccountCache.select().count() == 500
+    assert AccountCache.get(AccountCache.uuid == "uuid0").is_host
+    assert not AccountCache.get(AccountCache.uuid == "uuid1").is_host
+
+
+def test_lookup_indexes_created_for_existing_table():
+    from calm.dsl.db.handler import Database
+
+    test_db = SqliteDatabase(":memory:")
+    with test_db.bind_ctx([AhvSubnetsCache]):
+        # Table created by an older version, without the lookup indexes
+        AhvSubnetsCache._schema.create_table()
+        index_names = {index.name for index in test_db.get_indexes("ahvsubnetscache")}
+        assert "ahvsubnetscache_uuid_account_uuid" not in index_names
+
+        db_handle = Database.__new__(Database)
+        db_handle.db = test_db
+        db_handle.registered_tables = []
+        assert db_handle.set_and_verify(AhvSubnetsCache) is AhvSubnetsCache
+
+        index_names = {index.name for index in test_db.get_indexes("ahvsubnetscache")}
+        assert "ahvsubnetscache_uuid_account_uuid" in index_names
+        assert "ahvsubnetscache_name_account_uuid" in index_names
+
+
+@pytest.fixture
+def fault_in_server(account_table, monkeypatch):
+    """serves rows of account_table to single entity fetches, recording the calls"""
+
+    from calm.dsl.db import table_config
+    from calm.dsl.store import Cache
+
+    calls = []
+
+    class FakeAccountApi:
+        def list(self, params):
+            calls.append(params["filter"])
+            entities = [
+                {"metadata": {"uuid": row["uuid"]}, "status": {"name": row["name"]}}
+                for row in account_table
+                if "name=={}".format(row["name"]) == params["filter"]
+            ]
+            return FakeResponse({"entities": entities}), None
+
+    class FakeClient:
+        account = FakeAccountApi()
+
+    def fetch_one(cls, uuid):
+        calls.append(uuid)
+        return [row for row in account_table if row["uuid"] == uuid][0]
+
+    monkeypatch.setattr(table_config, "get_api_client", lambda: FakeClient())
+    monkeypatch.setattr(AccountCache, "fetch_one", classmethod(fetch_one))
+    monkeypatch.setattr(
+        Cache, "get_entity_db_table_object", classmethod(lambda cls, _: AccountCache)
+    )
+    monkeypatch.setattr(Cache, "_fault_in_expiry_times", {})
+    return calls
+
+
+def test_missing_entity_is_faulted_in(account_table, fault_in_server):
+    from calm.dsl.store import Cache
+
+    account_table.extend([_account_row("acc1", "uuid1"), _account_row("acc2", "uuid2")])
+
+    assert Cache.get_entity_data("account", "acc1")["uuid"] == "uuid1"
+    assert Cache.get_entity_data_using_uuid("account", "uuid2")["name"] == "acc2"
+    assert Cache.get_entity_data("account", "acc1")["uuid"] == "uuid1"
+    assert fault_in_server == ["name==acc1", "uuid1", "uuid2"]
+
+    # Renamed entity replaces the old row
+    account_table[0] = _account_row("acc1_new", "uuid1")
+    assert Cache.get_entity_data("account", "acc1_new")["uuid"] == "uuid1"
+    assert AccountCache.select().where(AccountCache.uuid == "uuid1").count() == 1
+
+
+def test_repeated_misses_are_not_fetched(account_table, fault_in_server, monkeypatch):
+    from calm.dsl.store import Cache
+
+    for _ in range(3):
+        assert not Cache.get_entity_data("account", "missing")
+    assert fault_in_server == ["name==missing"]
+
+    # Entities are not faulted in while syncing the cache
+    account_table.append(_account_row("acc1", "uuid1"))
+    fault_in_results = []
+
+    def sync(cls):
+        fault_in_results.append(cls.fault_in(name="acc1"))
+
+    monkeypatch.setattr(AccountCache, "sync", classmethod(sync))
+    AccountCache.fetch_sync_rows()
+    assert fault_in_results == [False]
+    assert fault_in_server == ["name==missing"]
+
+
+def test_sync_state_of_tables(monkeypatch):
+    import datetime
+
+    from calm.dsl.constants import CACHE
+    from calm.dsl.db.table_config import CacheSyncTable, EnvConfig
+    from calm.dsl.store import Cache
+
+    test_db = SqliteDatabase(":memory:")
+    with test_db.bind_ctx([CacheSyncTable]):
+        test_db.create_tables([CacheSyncTable])
+        CacheSyncTable.record_sync("account", 1.5)
+        CacheSyncTable.record_sync("account", 2.5)
+        sync_data = CacheSyncTable.get_entity_data("account")
+
+    assert sync_data["sync_duration"] == 2.5
+    assert Cache.get_sync_state(AccountCache, sync_data) == CACHE.SYNC_STATE.FRESH
+    assert Cache.get_sync_state(AccountCache, {}) == CACHE.SYNC_STATE.NOT_SYNCED
+
+    sync_data["last_sync_time"] -= datetime.timedelta(seconds=CACHE.SYNC_TTL + 1)
+    assert Cache.get_sync_state(AccountCache, sync_data) == CACHE.SYNC_STATE.STALE
+
+    # TTL of all tables can be overridden, 0 disables refresh of stale tables
+    monkeypatch.setattr(EnvConfig, "cache_ttl", "0")
+    assert Cache.get_sync_state(AccountCache, sync_data) == CACHE.SYNC_STATE.FRESH
+
+    # Invalid ttl in environment falls back to ttl of table
+    monkeypatch.setattr(EnvConfig, "cache_ttl", "1h")
+    assert AccountCache.get_sync_ttl() == CACHE.SYNC_TTL
+    assert Cache.get_sync_state(AccountCache, sync_data) == CACHE.SYNC_STATE.STALE
+
+
+def test_stale_table_is_refreshed_on_first_access(monkeypatch):
+    from calm.dsl.constants import CACHE
+    from calm.dsl.store import Cache
+
+    synced_tables = []
+    monkeypatch.setattr(Cache, "_checked_tables", set())
+    monkeypatch.setattr(
+        Cache,
+        "get_sync_state",
+        classmethod(lambda cls, table: CACHE.SYNC_STATE.STALE),
+    )
+    monkeypatch.setattr(
+        Cache,
+        "_sync_tables",
+        classmethod(lambda cls, tables: synced_tables.extend(tables)),
+    )
+
+    for _ in range(3):
+        Cache._refresh_if_stale(AccountCache)
+    assert synced_tables == [AccountCache]
+
+    # Tables are not refreshed while syncing the cache
+    with Cache._syncing():
+        Cache._refresh_if_stale(AhvSubnetsCache)
+    assert synced_tables == [AccountCache]
+
+
+def test_syncs_of_threads_do_not_reset_each_other():
+    from calm.dsl.store import Cache
+
+    first_sync_started = threading.Event()
+    second_sync_done = threading.Event()
+    sync_counts = []
+
+    def first_sync():
+        with Cache._syncing():
+            first_sync_started.set()
+            second_sync_done.wait(10)
+            sync_counts.append(Cache._sync_count)
+
+    thread = threading.Thread(target=first_sync)
+    thread.start()
+    first_sync_started.wait(10)
+    with Cache._syncing():
+        pass
+    second_sync_done.set()
+    thread.join(10)
+
+    # First sync is still in progress after the second one is done
+    assert sync_counts == [1]
+    assert Cache._sync_count == 0
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+# Modules which are costly to import and are not needed to parse cli arguments
+HEAVY_MODULES = ["calm.dsl.providers", "calm.dsl.builtins", "click_repl"]
+
+# Generous budget (in seconds) for importing the cli package
+CLI_IMPORT_BUDGET = 1.5
+
+
+def _get_import_times(module_name):
+    """returns cumulative import time (in us) of modules imported by module_name"""
+
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import {}".format(module_name)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    import_times = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        import_times[name.strip()] = int(cumulative)
+
+    return import_times
+
+
+def test_cli_import_skips_heavy_modules():
+    import_times = _get_import_times("calm.dsl.cli")
+
+    for module_name in HEAVY_MODULES:
+        assert module_name not in import_times, "{} imported by cli".format(module_name)
+
+    assert import_times["calm.dsl.cli"] < CLI_IMPORT_BUDGET * 10**6
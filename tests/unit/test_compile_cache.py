@@ -0,0 +1,143 @@
+import builtins
+import io
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from calm.dsl.builtins.models import utils
+from calm.dsl.tools import artifact_cache
+from calm.dsl.cli import compile_cache
+
+
+@pytest.fixture
+def dsl_file(tmp_path, monkeypatch):
+    """uses a temporary artifact cache dir and returns a dsl file reading a script"""
+
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(artifact_cache, "ARTIFACT_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(compile_cache, "ARTIFACT_CACHE_DIR", cache_dir)
+
+    # Secrets are not compiled by `calm compile` commands
+    monkeypatch.setattr(utils, "COMPILE_WITH_SECRETS", False)
+
+    (tmp_path / "script.sh").write_text("echo 1")
+    bp_file = tmp_path / "bp.py"
+    bp_file.write_text("SCRIPT = 'script.sh'")
+    return str(bp_file)
+
+
+def _compile_func(dsl_file, calls):
+    def compile_func():
+        calls.append(dsl_file)
+        script_file = os.path.join(os.path.dirname(dsl_file), "script.sh")
+        with open(script_file) as fd:
+            return {"spec": {"script": fd.read()}}
+
+    return compile_func
+
+
+def test_payload_is_reused_until_dependency_changes(dsl_file):
+    calls = []
+    compile_func = _compile_func(dsl_file, calls)
+
+    payload = compile_cache.compile_with_cache(compile_func, dsl_file)
+    assert payload == {"spec": {"script": "echo 1"}}
+    assert compile_cache.compile_with_cache(compile_func, dsl_file) == payload
+    assert len(calls) == 1
+
+    # Script read while compiling is a dependency of the dsl file
+    script_file = os.path.join(os.path.dirname(dsl_file), "script.sh")
+    with open(script_file, "w") as fd:
+        fd.write("echo 2")
+
+    payload = compile_cache.compile_with_cache(compile_func, dsl_file)
+    assert payload == {"spec": {"script": "echo 2"}}
+    assert len(calls) == 2
+
+    assert compile_cache.get_compile_cache_stats() == {"hits": 1, "misses": 2}
+
+
+def test_extra_files_are_part_of_key(dsl_file, tmp_path):
+    calls = []
+    compile_func = _compile_func(dsl_file, calls)
+    (tmp_path / "deployments.py").write_text("")
+
+    compile_cache.compile_with_cache(compile_func, dsl_file)
+    compile_cache.compile_with_cache(
+        compile_func, dsl_file, str(tmp_path / "deployments.py")
+    )
+    assert len(calls) == 2
+
+
+def test_entries_are_private_and_cleared(dsl_file):
+    compile_cache.compile_with_cache(_compile_func(dsl_file, []), dsl_file)
+
+    entries, _ = compile_cache.get_compile_cache_size()
+    assert entries == 1
+
+    cache_dir = compile_cache.get_compile_cache_dir()
+    for entry in os.listdir(cache_dir):
+        mode = os.stat(os.path.join(cache_dir, entry)).st_mode
+        assert stat.S_IMODE(mode) & 0o077 == 0
+
+    compile_cache.clear_compile_cache()
+    assert compile_cache.get_compile_cache_size() == (0, 0)
+    assert compile_cache.get_compile_cache_stats() == {}
+
+
+def test_payloads_compiled_with_secrets_are_not_stored(dsl_file, monkeypatch):
+    calls = []
+    compile_func = _compile_func(dsl_file, calls)
+
+    monkeypatch.setattr(utils, "COMPILE_WITH_SECRETS", True)
+    compile_cache.compile_with_cache(compile_func, dsl_file)
+    compile_cache.compile_with_cache(compile_func, dsl_file)
+    assert len(calls) == 2
+    assert compile_cache.get_compile_cache_size() == (0, 0)
+    assert compile_cache.get_compile_cache_stats() == {}
+
+
+def test_server_lookups_are_used_till_entry_expires(dsl_file, monkeypatch):
+    server_entities = {"project": "uuid1"}
+
+    def compile_func():
+        return {"project_uuid": server_entities["project"]}
+
+    compile_cache.compile_with_cache(compile_func, dsl_file)
+
+    # Entities looked up on server are not part of the key
+    server_entities["project"] = "uuid2"
+    payload = compile_cache.compile_with_cache(compile_func, dsl_file)
+    assert payload == {"project_uuid": "uuid1"}
+
+    compile_time = time.time()
+    monkeypatch.setattr(
+        compile_cache.time,
+        "time",
+        lambda: compile_time + compile_cache.COMPILE_CACHE_TTL + 1,
+    )
+    payload = compile_cache.compile_with_cache(compile_func, dsl_file)
+    assert payload == {"project_uuid": "uuid2"}
+
+
+def test_open_is_restored_after_compile(dsl_file):
+    builtin_open = builtins.open
+    compile_cache.compile_with_cache(_compile_func(dsl_file, []), dsl_file)
+    assert builtins.open is builtin_open and io.open is builtin_open
+
+
+def test_stats_of_concurrent_lookups_are_counted(dsl_file):
+    def lookup():
+        for _ in range(50):
+            compile_cache._update_stats("hits")
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert compile_cache.get_compile_cache_stats() == {"hits": 200}
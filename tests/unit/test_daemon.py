@@ -0,0 +1,89 @@
+import io
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from calm.dsl.daemon.client import get_daemon_status, run_command, stop_daemon
+from calm.dsl.daemon.server import DslDaemon
+
+AWS_SPEC_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "examples/AWS_ELB_Demo/aws_mysql_spec.yaml"
+)
+
+
+@pytest.fixture
+def socket_file(tmp_path):
+    socket_file = str(tmp_path / "dsl.sock")
+    thread = threading.Thread(
+        target=DslDaemon(socket_file=socket_file).serve, daemon=True
+    )
+    thread.start()
+
+    end_time = time.time() + 60
+    while not get_daemon_status(socket_file):
+        assert thread.is_alive() and time.time() < end_time
+        time.sleep(0.1)
+
+    yield socket_file
+
+    stop_daemon(socket_file)
+    thread.join(10)
+    assert not os.path.exists(socket_file)
+
+
+def _run(socket_file, *args):
+    stdout, stderr = io.BytesIO(), io.BytesIO()
+    exit_code = run_command(args, socket_file, stdout=stdout, stderr=stderr)
+    return exit_code, stdout.getvalue().decode(), stderr.getvalue().decode()
+
+
+def test_commands_are_run_by_daemon(socket_file):
+    exit_code, stdout, _ = _run(socket_file, "--version")
+    assert exit_code == 0
+    assert "version" in stdout
+
+    exit_code, _, stderr = _run(
+        socket_file, "validate", "provider_spec", "-f", AWS_SPEC_FILE, "-t", "AWS_VM"
+    )
+    assert exit_code == 0
+    assert "is a valid AWS_VM spec" in stderr
+
+    exit_code, _, stderr = _run(socket_file, "get", "nosuch")
+    assert exit_code == 2
+    assert "No such command" in stderr
+
+    assert get_daemon_status(socket_file)["commands"] == 3
+
+
+def test_commands_run_locally(socket_file, monkeypatch):
+    # Commands managing the daemon
+    assert _run(socket_file, "-v", "get", "daemon")[0] is None
+
+    # Daemon is started with different dsl environment
+    monkeypatch.setenv("CALM_DSL_DEFAULT_PROJECT", "other_project")
+    assert _run(socket_file, "--version")[0] is None
+
+    assert get_daemon_status(socket_file)["commands"] == 0
+
+
+class _TerminalStdout(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def test_watch_commands_are_run_by_daemon(socket_file, monkeypatch):
+    from calm.dsl.cli import app_commands
+
+    def watch_app(app_name, screen):
+        screen.print_at("Watching app {}".format(app_name), 0, 0)
+
+    monkeypatch.setattr(app_commands, "watch_app", watch_app)
+
+    # Client running in a terminal, for which watch commands draw screen
+    monkeypatch.setattr(sys, "stdout", _TerminalStdout())
+    exit_code, stdout, stderr = _run(socket_file, "watch", "app", "app1")
+    assert exit_code == 0, stderr
+    assert "Watching app app1" in stdout
@@ -0,0 +1,35 @@
+from calm.dsl.decompile import file_handler
+
+
+def test_files_are_written_after_flush(tmp_path):
+    file_handler.init_file_tree()
+    try:
+        bp_dir, local_dir, _, scripts_dir = file_handler.init_bp_dir(
+            str(tmp_path / "bp")
+        )
+        file_handler.write_file(scripts_dir + "/task.py", "print('task')")
+        file_handler.write_file(local_dir + "/secrets.bin", b"\x00\x01")
+        file_handler.write_file(bp_dir + "/blueprint.py", "bp = 1")
+
+        # Nothing is written to disk before flush
+        assert not (tmp_path / "bp").exists()
+        assert file_handler.get_file_tree_stats() == {
+            "files": 3,
+            "dirs": 4,
+            "size": 21,
+        }
+
+        file_handler.flush_file_tree(max_workers=2)
+
+    finally:
+        file_handler.reset_file_tree()
+
+    assert (tmp_path / "bp" / "scripts" / "task.py").read_text() == "print('task')"
+    assert (tmp_path / "bp" / ".local" / "secrets.bin").read_bytes() == b"\x00\x01"
+    assert (tmp_path / "bp" / "blueprint.py").read_text() == "bp = 1"
+    assert (tmp_path / "bp" / "specs").is_dir()
+
+
+def test_files_are_written_directly_without_file_tree(tmp_path):
+    file_handler.write_file(str(tmp_path / "task.py"), "print('task')")
+    assert (tmp_path / "task.py").read_text() == "print('task')"
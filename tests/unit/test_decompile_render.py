@@ -0,0 +1,23 @@
+from calm.dsl.decompile import render
+
+
+def test_templates_are_compiled_once():
+    template = render.get_template("task_delay.py.jinja2")
+    assert render.get_template("task_delay.py.jinja2") is template
+
+
+def test_render_stats(monkeypatch):
+    monkeypatch.setattr(render, "_RENDER_STATS", None)
+    render.render_template("task_delay.py.jinja2", {"name": "t1", "target": ""})
+    assert render.get_render_stats() == {}
+
+    render.enable_render_stats()
+    for _ in range(3):
+        render.render_template("task_delay.py.jinja2", {"name": "t1", "target": ""})
+
+    render_count, render_time = render.get_render_stats()["task_delay.py.jinja2"]
+    assert render_count == 3
+    assert render_time > 0
+
+    render.disable_render_stats()
+    assert render.get_render_stats() == {}
@@ -0,0 +1,38 @@
+from calm.dsl.builtins import CalmVariable, Service
+
+
+class BaseService(Service):
+    """Base service"""
+
+    base_var = CalmVariable.Simple("base")
+
+
+class MyService(BaseService):
+    """Derived service"""
+
+    my_var = CalmVariable.Simple("derived")
+
+
+def test_attrs_include_base_classes_and_defaults():
+    attrs = MyService.get_all_attrs()
+
+    assert attrs["base_var"] is BaseService.base_var
+    assert attrs["my_var"] is MyService.my_var
+    assert attrs["my_var"].name == "my_var"
+    assert attrs["dependencies"] == []
+
+
+def test_changed_attrs_are_resolved_again():
+    assert "new_var" not in MyService.get_all_attrs()
+
+    BaseService.new_var = CalmVariable.Simple("new")
+    attrs = MyService.get_all_attrs()
+    assert attrs["new_var"].value == "new"
+    assert attrs["new_var"].name == "new_var"
+
+    MyService.new_var = CalmVariable.Simple("overridden")
+    assert MyService.get_all_attrs()["new_var"].value == "overridden"
+
+    delattr(MyService, "new_var")
+    delattr(BaseService, "new_var")
+    assert "new_var" not in MyService.get_all_attrs()
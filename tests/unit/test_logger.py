@@ -0,0 +1,59 @@
+import io
+import json
+import logging
+import sys
+
+import pytest
+
+from calm.dsl.log import CustomLogging, get_logging_handle
+
+
+@pytest.fixture
+def LOG():
+    """returns logging handle writing to a buffer"""
+
+    log_handle = get_logging_handle("test_logger")
+    log_handle._ch1.setStream(io.StringIO())
+    yield log_handle
+
+    log_handle._logger.removeHandler(log_handle._ch1)
+    CustomLogging._HANDLERS.remove(log_handle._ch1)
+    CustomLogging.set_log_format(CustomLogging.TEXT_FORMAT)
+    CustomLogging.set_verbose_level(logging.INFO)
+
+
+def test_text_log_has_caller_line(LOG):
+    LOG.info("hello")
+    line_no = sys._getframe().f_lineno - 1
+
+    assert "[test_logger:{}] hello".format(line_no) in LOG._ch1.stream.getvalue()
+
+
+def test_json_log(LOG):
+    CustomLogging.set_log_format(CustomLogging.JSON_FORMAT)
+
+    LOG.warning("took long", extra={"duration": 1.5})
+    line_no = sys._getframe().f_lineno - 1
+    LOG.info("no newline", nl=False)
+
+    records = [json.loads(line) for line in LOG._ch1.stream.getvalue().splitlines()]
+    assert len(records) == 2
+    assert records[0]["module"] == "test_logger"
+    assert records[0]["level"] == "WARNING"
+    assert records[0]["message"] == "took long"
+    assert records[0]["func"] == "test_json_log"
+    assert records[0]["line"] == line_no
+    assert records[0]["duration"] == 1.5
+    assert "timestamp" in records[0] and "elapsed_ms" in records[0]
+
+
+def test_filtered_log_skips_caller_lookup(LOG, monkeypatch):
+    CustomLogging.set_verbose_level(logging.INFO)
+
+    def _getframe(*args):
+        raise AssertionError("caller looked up for filtered log")
+
+    monkeypatch.setattr(sys, "_getframe", _getframe)
+    LOG.debug("not emitted")
+
+    assert LOG._ch1.stream.getvalue() == ""
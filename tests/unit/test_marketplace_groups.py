@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from calm.dsl.cli import marketplace
+from calm.dsl.cli.constants import MARKETPLACE_ITEM
+
+from tests.helper.fake_api_helper import FakeResponse
+
+GROUP_COUNT = 150
+
+
+class FakeGroupsAPI:
+    def __init__(self):
+        self.payloads = []
+
+    def create(self, payload):
+        self.payloads.append(dict(payload))
+        offset, count = payload["group_offset"], payload["group_count"]
+        groups = [
+            {
+                "group_by_column_value": "group{}".format(ind),
+                "entity_results": [
+                    {
+                        "data": [
+                            {
+                                "name": "name",
+                                "values": [{"values": ["mpi{}".format(ind)]}],
+                            }
+                        ]
+                    }
+                ],
+            }
+            for ind in range(offset, min(offset + count, GROUP_COUNT))
+        ]
+        return (
+            FakeResponse(
+                {"filtered_group_count": GROUP_COUNT, "group_results": groups}
+            ),
+            None,
+        )
+
+
+@pytest.fixture
+def groups_api(monkeypatch):
+    api = FakeGroupsAPI()
+
+    class FakeClient:
+        groups = api
+
+    monkeypatch.setattr(marketplace, "get_api_client", lambda: FakeClient())
+    monkeypatch.setattr(marketplace.Version, "get_version", lambda name: "3.7.0")
+    marketplace.clear_mpi_listing_cache()
+    yield api
+    marketplace.clear_mpi_listing_cache()
+
+
+def test_all_group_pages_are_fetched(groups_api):
+    res = marketplace.get_mpis_group_call(
+        attributes=MARKETPLACE_ITEM.GROUP_ATTRIBUTES.LIST
+    )
+    assert len(res["group_results"]) == GROUP_COUNT
+    assert [payload["group_offset"] for payload in groups_api.payloads] == [0, 64, 128]
+
+    attributes = [
+        attr["attribute"] for attr in groups_api.payloads[0]["group_member_attributes"]
+    ]
+    assert attributes == MARKETPLACE_ITEM.GROUP_ATTRIBUTES.LIST
+    assert "icon_list" not in attributes
+
+
+def test_listing_is_reused_until_cleared(groups_api):
+    res = marketplace.get_mpis_group_call(name="mpi1")
+    res["group_results"].clear()
+
+    # Cached listing is not affected by changes in returned data
+    assert marketplace.get_mpis_group_call(name="mpi1")["group_results"]
+    assert len(groups_api.payloads) == 3
+
+    marketplace.clear_mpi_listing_cache()
+    marketplace.get_mpis_group_call(name="mpi1")
+    assert len(groups_api.payloads) == 6
+
+
+def test_groups_are_streamed(groups_api):
+    groups = marketplace.iter_mpis_groups(name="mpi")
+    assert next(groups)["group_by_column_value"] == "group0"
+    assert len(groups_api.payloads) == 1
+    assert len(list(groups)) == GROUP_COUNT - 1
+
+
+class LatestVersionGroupsAPI:
+    """serves a published version of marketplace item, having only requested attributes"""
+
+    VALUES = {
+        "name": ["mpi"],
+        "version": ["1.0.0"],
+        "app_state": [MARKETPLACE_ITEM.STATES.PUBLISHED],
+        "project_names": ["project1"],
+        "icon_list": [json.dumps({"icon_uuid": "icon-uuid"})],
+    }
+
+    def create(self, payload):
+        data = [
+            {
+                "name": attr["attribute"],
+                "values": [{"values": self.VALUES[attr["attribute"]]}],
+            }
+            for attr in payload["group_member_attributes"]
+            if attr["attribute"] in self.VALUES
+        ]
+        groups = [
+            {"group_by_column_value": "group0", "entity_results": [{"data": data}]}
+        ]
+        return (
+            FakeResponse({"filtered_group_count": 1, "group_results": groups}),
+            None,
+        )
+
+
+def test_new_version_inherits_projects_and_icon(monkeypatch):
+    class FakeAppIconAPI:
+        def get_uuid_name_map(self):
+            return {"icon-uuid": "icon1"}
+
+    class FakeClient:
+        groups = LatestVersionGroupsAPI()
+        app_icon = FakeAppIconAPI()
+
+    published = {}
+    monkeypatch.setattr(marketplace, "get_api_client", lambda: FakeClient())
+    monkeypatch.setattr(marketplace.Version, "get_version", lambda name: "4.0.0")
+    monkeypatch.setattr(
+        marketplace,
+        "publish_runbook_to_marketplace_manager",
+        lambda **kwargs: published.update(kwargs),
+    )
+    marketplace.clear_mpi_listing_cache()
+
+    marketplace.publish_runbook_as_existing_marketplace_item("rb", "mpi", "2.0.0")
+    marketplace.clear_mpi_listing_cache()
+
+    assert published["projects"] == ["project1"]
+    assert published["icon_name"] == "icon1"
@@ -0,0 +1,59 @@
+import ast
+import importlib.util
+
+from calm.dsl.builtins.models import parse_cache
+
+MODULE_SOURCE = """
+def decorator(func):
+    return func
+
+
+class Service:
+    @decorator
+    def action_1():
+        var = 1
+        print({})
+"""
+
+
+def _load_func(tmp_path, value):
+    module_file = tmp_path / "module_{}.py".format(value)
+    module_file.write_text(MODULE_SOURCE.format(value))
+    spec = importlib.util.spec_from_file_location(module_file.stem, str(module_file))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.Service.action_1
+
+
+def test_parsed_source_is_reused(tmp_path):
+    func = _load_func(tmp_path, 1)
+    start_stats = parse_cache.get_parse_stats()
+
+    parsed_source = parse_cache.get_parsed_source(func)
+    assert parse_cache.get_parsed_source(func) is parsed_source
+
+    stats = parse_cache.get_parse_stats()
+    assert stats["misses"] - start_stats["misses"] == 1
+    assert stats["hits"] - start_stats["hits"] == 1
+
+    # Decorator and indentation are stripped from source
+    func_def = parsed_source.node.body[0]
+    assert isinstance(func_def, ast.FunctionDef) and func_def.name == "action_1"
+    assert not func_def.decorator_list
+    assert not parsed_source.has_with_stmt
+
+
+def test_changed_source_is_parsed_again(tmp_path):
+    parsed_source = parse_cache.get_parsed_source(_load_func(tmp_path, 1))
+    other_parsed_source = parse_cache.get_parsed_source(_load_func(tmp_path, 2))
+    assert other_parsed_source is not parsed_source
+
+    call = other_parsed_source.node.body[0].body[1].value
+    assert call.args[0].value == 2
+
+
+def test_expression_code_is_cached_on_node():
+    node = ast.parse("value + 1").body[0].value
+    code = parse_cache.compile_expr(node)
+    assert parse_cache.compile_expr(node) is code
+    assert eval(code, {"value": 1}) == 2
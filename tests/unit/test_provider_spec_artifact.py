@@ -0,0 +1,25 @@
+from calm.dsl.tools import artifact_cache
+from calm.dsl.providers import get_provider
+
+
+def test_provider_spec_is_built_on_first_use(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_cache, "ARTIFACT_CACHE_DIR", str(tmp_path))
+
+    AwsProvider = get_provider("AWS_VM")
+    monkeypatch.setattr(AwsProvider, "_provider_spec", None)
+    monkeypatch.setattr(AwsProvider, "_validator", None)
+
+    provider_spec = AwsProvider.get_provider_spec()
+    assert (tmp_path / "provider_spec_aws_vm.pickle").exists()
+    assert provider_spec == AwsProvider._render_provider_spec()
+    assert AwsProvider.get_provider_spec() is provider_spec
+
+    # Spec is read from artifact in a fresh process
+    monkeypatch.setattr(AwsProvider, "_provider_spec", None)
+    monkeypatch.setattr(
+        AwsProvider, "_render_provider_spec", classmethod(lambda cls: None)
+    )
+    assert AwsProvider.get_provider_spec() == provider_spec
+
+    validator = AwsProvider.get_validator()
+    assert AwsProvider.get_validator() is validator
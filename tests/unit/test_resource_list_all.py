@@ -0,0 +1,75 @@
+import threading
+import pytest
+
+from calm.dsl.api.connection import Connection
+from calm.dsl.api.resource import ResourceAPI
+
+from tests.helper.fake_api_helper import FakeResponse
+
+
+class FakeListConnection(Connection):
+    """serves list calls from an in-memory list of entities"""
+
+    def __init__(self, total, fail_offset=None):
+        super().__init__("127.0.0.1", 9440)
+        self.entities = [
+            {"status": {"name": "vm-{}".format(i)}, "metadata": {"uuid": str(i)}}
+            for i in range(total)
+        ]
+        self.fail_offset = fail_offset
+        self.offsets = []
+        self.lock = threading.Lock()
+
+    def _call(self, endpoint, request_json=None, ignore_error=False, **kwargs):
+        offset = request_json["offset"]
+        length = request_json["length"]
+        with self.lock:
+            self.offsets.append(offset)
+
+        if offset == self.fail_offset:
+            return None, {"code": 500, "error": "list failed"}
+
+        return (
+            FakeResponse(
+                {
+                    "entities": self.entities[offset : offset + length],
+                    "metadata": {"total_matches": len(self.entities)},
+                }
+            ),
+            None,
+        )
+
+
+def _get_resource_api(connection):
+    return ResourceAPI(connection, "vms")
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_list_all_pages_in_order(max_workers):
+    connection = FakeListConnection(total=1001)
+    api = _get_resource_api(connection)
+
+    entities = api.list_all(api_limit=100, max_workers=max_workers)
+    assert [e["metadata"]["uuid"] for e in entities] == [str(i) for i in range(1001)]
+    assert sorted(connection.offsets) == list(range(0, 1001, 100))
+
+
+def test_iter_all_streams_entities():
+    api = _get_resource_api(FakeListConnection(total=30))
+
+    uuids = [e["metadata"]["uuid"] for e in api.iter_all(api_limit=7, max_workers=3)]
+    assert uuids == [str(i) for i in range(30)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_list_all_error(max_workers):
+    api = _get_resource_api(FakeListConnection(total=500, fail_offset=200))
+
+    entities, err = api.list_all(
+        api_limit=100, ignore_error=True, max_workers=max_workers
+    )
+    assert entities == []
+    assert err["code"] == 500
+
+    with pytest.raises(Exception):
+        list(api.iter_all(api_limit=100, max_workers=max_workers))
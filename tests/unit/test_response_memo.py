@@ -0,0 +1,59 @@
+from calm.dsl.api.connection import Connection, REQUEST
+from calm.dsl.api.response_memo import memoize_responses, invalidate_responses
+
+from tests.helper.fake_api_helper import FakeResponse
+
+
+class FakeSession:
+    headers = {}
+
+    def __init__(self):
+        self.calls = []
+
+    def _request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        return FakeResponse()
+
+    def get(self, url, **kwargs):
+        return self._request("get", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._request("post", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._request("put", url, **kwargs)
+
+
+def _connection():
+    conn = Connection("127.0.0.1", 9440)
+    conn.session = FakeSession()
+    return conn
+
+
+def test_read_only_calls_are_memoized_in_block():
+    conn = _connection()
+    read = dict(method=REQUEST.METHOD.GET, timeout=(5, 5))
+    list_call = dict(request_json={"filter": "name==p1"}, timeout=(5, 5))
+
+    with memoize_responses() as memo:
+        res, _ = conn._call("projects/1", **read)
+        assert conn._call("projects/1", **read)[0] is res
+        conn._call("projects/list", **list_call)
+        conn._call("projects/list", **list_call)
+        conn._call("projects/2", **read)
+        assert len(conn.session.calls) == 3
+        assert (memo.hits, memo.misses) == (2, 3)
+
+        # Writes clear memoized responses
+        conn._call("projects/1", method=REQUEST.METHOD.PUT, timeout=(5, 5))
+        conn._call("projects/1", **read)
+        assert len(conn.session.calls) == 5
+
+        invalidate_responses()
+        conn._call("projects/1", **read)
+        assert len(conn.session.calls) == 6
+
+    # Calls outside block are not memoized
+    conn._call("projects/1", **read)
+    conn._call("projects/1", **read)
+    assert len(conn.session.calls) == 8
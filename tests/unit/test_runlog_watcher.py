@@ -0,0 +1,196 @@
+import pytest
+
+from calm.dsl.cli import runlog_watcher
+from calm.dsl.cli.constants import RUNLOG
+from calm.dsl.cli.runlog_watcher import (
+    RunlogOutputCache,
+    RunlogWatch,
+    RunlogWatcher,
+    watch_execution,
+)
+
+from tests.helper.fake_api_helper import FakeResponse
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(runlog_watcher.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(runlog_watcher.time, "sleep", clock.sleep)
+    return clock
+
+
+def _get_poll_func(clock, states, poll_times):
+    """returns poll func serving states one after the other"""
+
+    def poll_func():
+        poll_times.append(clock.now)
+        state = states.pop(0) if len(states) > 1 else states[0]
+        return FakeResponse({"status": {"state": state}}), None
+
+    return poll_func
+
+
+def _is_complete(response):
+    state = response["status"]["state"]
+    return state in RUNLOG.TERMINAL_STATES, state
+
+
+def test_poll_interval_backs_off_while_unchanged(clock):
+    poll_times = []
+    states = ["RUNNING"] * 6 + ["SUCCESS"]
+    completed, msg = watch_execution(
+        _get_poll_func(clock, states, poll_times), _is_complete, 300, 10
+    )
+
+    assert (completed, msg) == (True, "SUCCESS")
+    intervals = [b - a for a, b in zip(poll_times, poll_times[1:])]
+    assert intervals == [1, 2, 4, 8, 10, 10]
+
+
+def test_watch_stops_after_max_wait(clock):
+    poll_times = []
+    completed, _ = watch_execution(
+        _get_poll_func(clock, ["RUNNING"], poll_times), _is_complete, 60, 10
+    )
+
+    assert not completed
+    assert poll_times[-1] <= 60
+
+
+def test_watch_many_executions(clock):
+    short_polls, long_polls = [], []
+    short_watch = RunlogWatch(
+        _get_poll_func(clock, ["RUNNING", "SUCCESS"], short_polls), _is_complete, 300
+    )
+    long_watch = RunlogWatch(
+        _get_poll_func(clock, ["RUNNING"] * 10 + ["FAILURE"], long_polls),
+        _is_complete,
+        300,
+    )
+
+    RunlogWatcher([short_watch, long_watch]).run()
+
+    assert short_watch.msg == "SUCCESS" and len(short_polls) == 2
+    assert long_watch.msg == "FAILURE" and len(long_polls) == 11
+
+
+def test_watch_raises_on_error(clock):
+    def poll_func():
+        return None, {"code": 500, "error": "poll failed"}
+
+    with pytest.raises(Exception, match="poll failed"):
+        watch_execution(poll_func, _is_complete, 60, 10)
+
+
+def test_output_cache_fetches_completed_runlogs_once():
+    fetched = []
+
+    def fetch_output(runlog_uuid):
+        fetched.append(runlog_uuid)
+        return "output of {}".format(runlog_uuid)
+
+    output_cache = RunlogOutputCache()
+    running = {"metadata": {"uuid": "1"}, "status": {"state": "RUNNING"}}
+    completed = {"metadata": {"uuid": "2"}, "status": {"state": "SUCCESS"}}
+    for _ in range(3):
+        output_cache.get_output(running, fetch_output)
+        assert output_cache.get_output(completed, fetch_output) == "output of 2"
+
+    assert fetched == ["1", "2", "1", "1"]
+
+
+def test_output_cache_fetches_missing_outputs_concurrently():
+    fetched = []
+
+    def fetch_output(runlog_uuid):
+        fetched.append(runlog_uuid)
+        return "output of {}".format(runlog_uuid)
+
+    output_cache = RunlogOutputCache()
+    runlogs = [
+        {"metadata": {"uuid": str(ind)}, "status": {"state": state}}
+        for ind, state in enumerate(["SUCCESS", "RUNNING", "FAILURE", "PENDING"])
+    ]
+    for _ in range(3):
+        outputs = output_cache.get_outputs(runlogs, fetch_output, max_workers=4)
+        assert outputs == {str(ind): "output of {}".format(ind) for ind in range(4)}
+
+    assert sorted(fetched) == sorted(["0", "2"] + ["1", "3"] * 3)
+
+
+class FakeScreen:
+    width = 120
+
+    def __init__(self):
+        self.lines = []
+
+    def clear(self):
+        self.lines = []
+
+    def print_at(self, text, *args, **kwargs):
+        self.lines.append(text)
+
+    def refresh(self):
+        pass
+
+
+def _runlog(uuid, parent_uuid, runlog_type, state, task_name=None):
+    runlog = {
+        "metadata": {"uuid": uuid, "creation_time": uuid, "last_update_time": uuid},
+        "status": {
+            "type": runlog_type,
+            "state": state,
+            "root_reference": {"uuid": "0"},
+            "parent_reference": {"uuid": parent_uuid},
+            "runbook_reference": {"name": "runbook"},
+        },
+    }
+    if task_name:
+        runlog["status"]["task_reference"] = {"uuid": task_name, "name": task_name}
+
+    return runlog
+
+
+def test_runlog_tree_fetches_outputs_of_changed_tasks(monkeypatch):
+    from calm.dsl.cli import runlog
+
+    monkeypatch.setattr(runlog, "get_api_client", lambda: None)
+    fetched = []
+
+    def output_function(runlog_uuid, task_runlog_uuid):
+        fetched.append(task_runlog_uuid)
+        output = "output of {}\n".format(task_runlog_uuid)
+        return FakeResponse({"status": {"output_list": [{"output": output}]}}), None
+
+    screen = FakeScreen()
+    is_complete = runlog.get_completion_func(screen, output_function=output_function)
+
+    def poll(task_states):
+        entities = [_runlog("1", "0", "runbook_runlog", "RUNNING")]
+        for ind, state in enumerate(task_states):
+            uuid = str(ind + 2)
+            entities.append(_runlog(uuid, "1", "task_runlog", state, "Task" + uuid))
+        return is_complete({"entities": entities}, runlog_uuid="1")
+
+    poll(["SUCCESS", "RUNNING"])
+    poll(["SUCCESS", "SUCCESS", "RUNNING"])
+    poll(["SUCCESS", "SUCCESS", "SUCCESS"])
+
+    # Output of a task is fetched on every poll till it is completed
+    assert sorted(fetched) == ["2", "3", "3", "4", "4"]
+    assert any("output of 4" in line for line in screen.lines)
+
+    # Tree is updated in place, tasks are not repeated
+    assert len([line for line in screen.lines if "Task2 (Status:" in line]) == 1
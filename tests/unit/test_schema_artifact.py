@@ -0,0 +1,29 @@
+import json
+
+from calm.dsl.tools import artifact_cache, resolve_json_refs
+from calm.dsl.builtins.models import schema
+
+
+def test_artifact_key_check(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_cache, "ARTIFACT_CACHE_DIR", str(tmp_path))
+
+    assert artifact_cache.load_artifact("test", "key1") is None
+    artifact_cache.save_artifact("test", "key1", {"a": [1, 2]})
+    assert artifact_cache.load_artifact("test", "key1") == {"a": [1, 2]}
+    assert artifact_cache.load_artifact("test", "key2") is None
+
+
+def test_compiled_schemas_match_rendered_schemas(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_cache, "ARTIFACT_CACHE_DIR", str(tmp_path))
+
+    compiled_schemas = schema._get_compiled_schemas()
+    assert (tmp_path / "schemas.pickle").exists()
+
+    schemas = schema._LazySchemaMap(compiled_schemas)
+    rendered_schemas = schema._load_all_schemas()
+    assert sorted(schemas.keys()) == sorted(rendered_schemas.keys())
+
+    for name in ["Blueprint", "Service", "Task"]:
+        assert json.dumps(schemas.get(name), sort_keys=True) == json.dumps(
+            resolve_json_refs(rendered_schemas[name]), sort_keys=True
+        )
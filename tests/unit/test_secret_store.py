@@ -0,0 +1,73 @@
+import types
+
+import pytest
+from peewee import SqliteDatabase
+
+from calm.dsl.crypto import Crypto
+from calm.dsl.crypto.crypto import DerivedKeyCache
+from calm.dsl.db.table_config import SecretTable, DataTable
+from calm.dsl.store import secrets
+from calm.dsl.store import Secret
+
+
+@pytest.fixture
+def secret_db(monkeypatch):
+    """binds secret tables to an in-memory db"""
+
+    db_handle = types.SimpleNamespace(secret_table=SecretTable, data_table=DataTable)
+    monkeypatch.setattr(secrets, "get_db_handle", lambda: db_handle)
+
+    test_db = SqliteDatabase(":memory:", check_same_thread=False)
+    with test_db.bind_ctx([SecretTable, DataTable]):
+        test_db.create_tables([SecretTable, DataTable])
+        yield db_handle
+
+    Crypto.key_cache.clear()
+
+
+def test_find_many(secret_db):
+    Secret.create("secret1", "value1")
+    Secret.create("secret2", "value2")
+    Crypto.key_cache.clear()
+
+    assert Secret.find_many(["secret1", "secret2", "secret3"]) == {
+        "secret1": "value1",
+        "secret2": "value2",
+    }
+    assert Secret.find("secret2") == "value2"
+    assert Secret.find_many([]) == {}
+
+
+def test_derived_key_is_cached(monkeypatch):
+    hash_calls = []
+
+    def scrypt_hash(password, salt, **kwargs):
+        hash_calls.append(salt)
+        return salt * 2
+
+    monkeypatch.setattr("calm.dsl.crypto.crypto.scrypt.hash", scrypt_hash)
+    Crypto.key_cache.clear()
+
+    assert Crypto.generate_key(b"salt", b"pass") == b"saltsalt"
+    assert Crypto.generate_key(b"salt", b"pass") == b"saltsalt"
+    assert len(hash_calls) == 1
+
+    # Different passphrase derives a different key
+    Crypto.generate_key(b"salt", b"other_pass")
+    assert len(hash_calls) == 2
+
+    Crypto.key_cache.clear()
+
+
+def test_derived_key_cache_bounds(monkeypatch):
+    key_cache = DerivedKeyCache(max_size=2, ttl=10)
+    for ind in range(3):
+        key_cache.set(ind, "key{}".format(ind))
+
+    # Least recently used key is evicted
+    assert len(key_cache) == 2
+    assert key_cache.get(0) is None
+    assert key_cache.get(2) == "key2"
+
+    monkeypatch.setattr("calm.dsl.crypto.crypto.time.monotonic", lambda: 10**10)
+    assert key_cache.get(2) is None
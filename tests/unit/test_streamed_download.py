@@ -0,0 +1,140 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from requests import Session
+
+from calm.dsl.api.connection import Connection, REQUEST
+
+CONTENT = bytes(range(256)) * 4096
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    supports_range = True
+    etag = '"v1"'
+    # Connection is closed after sending these many bytes of body
+    fail_after = None
+    range_headers = []
+
+    def do_GET(self):
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        self.range_headers.append((range_header, if_range))
+
+        start = 0
+        if range_header and self.supports_range and if_range == self.etag:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            self.send_response(206)
+        else:
+            self.send_response(200)
+
+        body = CONTENT[start:]
+        self.send_header("Content-Length", str(len(body)))
+        if self.etag:
+            self.send_header("ETag", self.etag)
+        self.end_headers()
+        self.wfile.write(body[: self.fail_after])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def connection():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    conn = Connection("127.0.0.1", server.server_port, scheme=REQUEST.SCHEME.HTTP)
+    conn.session = Session()
+    RangeHandler.range_headers = []
+    yield conn
+
+    RangeHandler.supports_range = True
+    RangeHandler.etag = '"v1"'
+    RangeHandler.fail_after = None
+
+    server.shutdown()
+    conn.close()
+
+
+def test_download_is_written_in_chunks(connection, tmp_path):
+    file_path = str(tmp_path / "runlog.zip")
+    progress = []
+
+    stats, err = connection.download(
+        "download",
+        file_path,
+        timeout=(5, 5),
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+    assert err is None
+    assert stats["size"] == len(CONTENT) and stats["resumed_from"] == 0
+    assert open(file_path, "rb").read() == CONTENT
+    assert not (tmp_path / "runlog.zip.part").exists()
+
+    assert len(progress) == len(CONTENT) // REQUEST.DOWNLOAD.CHUNK_SIZE
+    assert progress[-1] == (len(CONTENT), len(CONTENT))
+
+    # Range header is not persisted in session
+    assert "Range" not in connection.session.headers
+
+
+def _interrupted_download(connection, file_path, fail_after=1000):
+    RangeHandler.fail_after = fail_after
+    stats, err = connection.download("download", file_path, timeout=(5, 5))
+    RangeHandler.fail_after = None
+
+    assert stats is None and "interrupted" in err["error"]
+    return err
+
+
+@pytest.mark.parametrize("supports_range", [True, False])
+def test_partial_download_is_resumed(connection, tmp_path, supports_range):
+    file_path = str(tmp_path / "runlog.zip")
+    err = _interrupted_download(connection, file_path)
+    assert "run again to resume" in err["error"]
+    assert os.path.getsize(file_path + ".part") == 1000
+
+    RangeHandler.supports_range = supports_range
+    stats, err = connection.download("download", file_path, timeout=(5, 5))
+
+    assert err is None
+    assert RangeHandler.range_headers == [(None, None), ("bytes=1000-", '"v1"')]
+    assert stats["resumed_from"] == (1000 if supports_range else 0)
+    assert open(file_path, "rb").read() == CONTENT
+    assert os.listdir(str(tmp_path)) == ["runlog.zip"]
+
+
+def test_changed_resource_is_downloaded_again(connection, tmp_path):
+    file_path = str(tmp_path / "runlog.zip")
+    _interrupted_download(connection, file_path)
+
+    RangeHandler.etag = '"v2"'
+    stats, err = connection.download("download", file_path, timeout=(5, 5))
+
+    assert err is None
+    assert RangeHandler.range_headers[-1] == ("bytes=1000-", '"v1"')
+    assert stats["resumed_from"] == 0
+    assert open(file_path, "rb").read() == CONTENT
+
+
+def test_partial_file_without_validator_is_not_resumed(connection, tmp_path):
+    file_path = str(tmp_path / "runlog.zip")
+
+    # Partial file left by something else
+    with open(file_path + ".part", "wb") as fd:
+        fd.write(b"x" * 1000)
+
+    stats, err = connection.download("download", file_path, timeout=(5, 5))
+    assert err is None
+    assert RangeHandler.range_headers == [(None, None)]
+    assert stats["resumed_from"] == 0
+    assert open(file_path, "rb").read() == CONTENT
+
+    # Partial file of response without validator is removed on failure
+    RangeHandler.etag = None
+    err = _interrupted_download(connection, file_path)
+    assert "run again to resume" not in err["error"]
+    assert not os.path.exists(file_path + ".part")